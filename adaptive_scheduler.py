@@ -0,0 +1,88 @@
+"""
+Variance-driven allocation of a fixed call budget across scenarios.
+
+Instead of giving every scenario the same number of runs, spend each extra call
+where it shrinks uncertainty the most. For every scenario and dimension we keep
+a posterior over the score variance (sample variance from existing reports,
+shrunk toward a prior so scenarios with 0-1 runs are not ignored). Each call of
+the budget goes to the scenario with the largest expected drop in the squared
+standard error of its dimension means, where the variance used is a Thompson
+draw from that posterior, so noisy-but-unlucky scenarios still get explored.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional
+
+from evaluator import DIMENSION_KEYS
+from score_stats import ScenarioScoreStats, load_score_history, summarize_scores
+
+# Prior on the per-dimension score variance (0-10 scale) and its weight in pseudo-observations.
+PRIOR_VARIANCE = 4.0
+PRIOR_WEIGHT = 2.0
+
+
+def posterior_variance(sample_variance: Optional[float], n: int) -> tuple[float, float]:
+    """
+    (scale, degrees of freedom) of the scaled-inverse-chi-square posterior on a
+    dimension's variance after n calls with the given sample variance.
+    """
+    dof = PRIOR_WEIGHT + max(0, n - 1)
+    ss = PRIOR_WEIGHT * PRIOR_VARIANCE + (max(0, n - 1) * sample_variance if sample_variance else 0.0)
+    return ss / dof, dof
+
+
+def _draw_variance(scale: float, dof: float, rng: random.Random) -> float:
+    """Thompson draw: dof * scale / chi2(dof)."""
+    chi2 = rng.gammavariate(dof / 2.0, 2.0)
+    return dof * scale / max(chi2, 1e-9)
+
+
+def allocate_budget(
+    scenario_ids: List[str],
+    stats: Dict[str, ScenarioScoreStats],
+    budget: int,
+    dimensions: List[str] = DIMENSION_KEYS,
+    seed: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Split `budget` calls across scenario_ids. Returns scenario_id -> extra calls
+    (scenarios that get none are included with 0).
+    """
+    rng = random.Random(seed)
+    counts = {sid: (stats[sid].n if sid in stats else 0) for sid in scenario_ids}
+    extra = {sid: 0 for sid in scenario_ids}
+    if not scenario_ids:
+        return extra
+    posteriors = {
+        sid: {
+            dim: posterior_variance(
+                stats[sid].variances.get(dim) if sid in stats else None, counts[sid]
+            )
+            for dim in dimensions
+        }
+        for sid in scenario_ids
+    }
+    for _ in range(max(0, budget)):
+        best_id, best_gain = scenario_ids[0], -1.0
+        for sid in scenario_ids:
+            n = counts[sid] + extra[sid]
+            gain = 0.0
+            for scale, dof in posteriors[sid].values():
+                var = _draw_variance(scale, dof, rng)
+                # Squared standard error of the mean drops from var/n to var/(n+1); n=0 is "unknown".
+                gain += var / (n * (n + 1)) if n > 0 else var * 2
+            if gain > best_gain:
+                best_id, best_gain = sid, gain
+        extra[best_id] += 1
+    return extra
+
+
+def plan_adaptive_runs(
+    scenario_ids: List[str], budget: int, seed: Optional[int] = None
+) -> tuple[Dict[str, int], Dict[str, ScenarioScoreStats]]:
+    """Read reports/ history, then allocate the budget. Returns (extra calls, stats per scenario)."""
+    history = load_score_history()
+    stats = {sid: summarize_scores(sid, samples) for sid, samples in history.items()}
+    return allocate_budget(scenario_ids, stats, budget, seed=seed), stats
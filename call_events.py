@@ -0,0 +1,232 @@
+"""
+Call lifecycle events for the live dashboard (GET /events/stream, static/dashboard.html).
+
+Lifecycle of one call:
+
+  dialed -> ringing -> in-progress -> ended -> saved -> evaluated (or failed / eval_failed)
+
+The webhook server sees ringing / in-progress / ended (Vapi status-update and
+end-of-call-report events) and saved (writer thread). dialed, failed and
+evaluated happen in the runner, which reports them with report_call_event().
+That posts to the server's POST /events from a background thread, so a slow
+or missing server never delays a call.
+
+Server side, CallEventBus keeps the state of every call that has not finished
+(calls no runner reported are dropped once they end, since nobody will report
+their evaluation; only dialed / ringing / in-progress calls count as live),
+a ring buffer of recent events (replayed to a reconnecting client that sends
+Last-Event-ID) and one bounded queue per stream subscriber. A subscriber
+that falls too far behind is disconnected; EventSource reconnects on its own.
+Events are per process, like live transcripts.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+LIFECYCLE_EVENTS = ("dialed", "ringing", "in-progress", "ended", "saved", "evaluated", "eval_failed", "failed")
+# A call leaves the active set on these events.
+TERMINAL_EVENTS = ("evaluated", "eval_failed", "failed")
+# States that count as "in flight": the call is still on the line.
+LIVE_EVENTS = ("dialed", "ringing", "in-progress")
+# After these the call is only tracked further if a runner reported it (and will report the evaluation).
+POST_CALL_EVENTS = ("ended", "saved")
+# Extra fields a runner may attach to an event through POST /events.
+REPORTED_FIELDS = ("scenario_id", "label", "error", "scores")
+# Calls that never reach a terminal event (e.g. no runner reporting evaluations) are dropped after this.
+CALL_TTL_SEC = 2 * 60 * 60
+HISTORY_SIZE = 500
+SUBSCRIBER_QUEUE_SIZE = 1000
+# Stats frames double as keep-alives for proxies that close idle connections.
+STATS_INTERVAL_SEC = 1.0
+REPORT_TIMEOUT_SEC = 2.0
+
+_CLOSED = object()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """One server-sent-events frame."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class CallEventBus:
+    """Thread-safe fan-out of call lifecycle events to stream subscribers."""
+
+    def __init__(self, history: int = HISTORY_SIZE, ttl_sec: float = CALL_TTL_SEC) -> None:
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=max(1, history))
+        self._subscribers: List["queue.Queue[Any]"] = []
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._touched: Dict[str, float] = {}
+        self.ttl_sec = ttl_sec
+
+    def publish(
+        self, event: str, call_id: Optional[str] = None, *, from_runner: bool = False, **fields: Any
+    ) -> Dict[str, Any]:
+        """
+        Record one event, update the call's state and push it to every subscriber.
+        from_runner marks events posted by a runner (POST /events), which reports the call's evaluation.
+        """
+        fields = {k: v for k, v in fields.items() if v is not None}
+        with self._lock:
+            # The bus's own keys come last so caller fields can never override them.
+            record = {**fields, "id": self._next_id, "event": event, "call_id": call_id, "ts": _now_iso()}
+            self._next_id += 1
+            self._history.append(record)
+            if call_id:
+                self._update_call(call_id, record, from_runner)
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(record)
+            except queue.Full:
+                self._drop(q)
+        return record
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> "queue.Queue[Any]":
+        """
+        Register a subscriber queue. With last_event_id (EventSource's Last-Event-ID),
+        events after it that are still in the history are queued first.
+        """
+        q: "queue.Queue[Any]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        try:
+            after = int(last_event_id) if last_event_id else None
+        except ValueError:
+            after = None
+        with self._lock:
+            if after is not None:
+                for record in self._history:
+                    if record["id"] > after and not q.full():
+                        q.put_nowait(record)
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Any]") -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def next(self, q: "queue.Queue[Any]", timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Next event for a subscriber, or None after timeout.
+        Raises EOFError if the subscriber was dropped for falling behind.
+        """
+        try:
+            item = q.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return None
+        if item is _CLOSED:
+            raise EOFError("subscriber fell behind")
+        return item
+
+    def active_calls(self) -> List[Dict[str, Any]]:
+        """State of every call that has not reached a terminal event, oldest first."""
+        with self._lock:
+            self._prune()
+            return sorted((dict(c) for c in self._calls.values()), key=lambda c: c["first_seen"])
+
+    def live_count(self) -> int:
+        """Calls still on the line (dialed, ringing or in progress)."""
+        with self._lock:
+            self._prune()
+            return sum(1 for c in self._calls.values() if c["state"] in LIVE_EVENTS)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def _update_call(self, call_id: str, record: Dict[str, Any], from_runner: bool) -> None:
+        call = self._calls.get(call_id)
+        runner_tracked = from_runner or bool(call and call.get("runner"))
+        if record["event"] in TERMINAL_EVENTS or (record["event"] in POST_CALL_EVENTS and not runner_tracked):
+            self._calls.pop(call_id, None)
+            self._touched.pop(call_id, None)
+            return
+        if call is None:
+            call = self._calls[call_id] = {"call_id": call_id, "first_seen": record["ts"], "runner": from_runner}
+        call["runner"] = runner_tracked
+        call.update({k: v for k, v in record.items() if k not in ("id", "event", "ts", "call_id")})
+        call["state"] = record["event"]
+        call["updated"] = record["ts"]
+        self._touched[call_id] = time.monotonic()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_sec
+        for call_id in [cid for cid, t in self._touched.items() if t < cutoff]:
+            self._calls.pop(call_id, None)
+            self._touched.pop(call_id, None)
+
+    def _drop(self, q: "queue.Queue[Any]") -> None:
+        self.unsubscribe(q)
+        # Make room for the close marker so the stream loop notices and ends.
+        try:
+            while True:
+                q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(_CLOSED)
+        except queue.Full:
+            pass
+
+
+class _EventReporter:
+    """Runner side: posts events to the webhook server's POST /events from a daemon thread."""
+
+    def __init__(self, base_url: str) -> None:
+        self.url = f"{base_url.rstrip('/')}/events"
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._warned = False
+        threading.Thread(target=self._run, name="call-event-reporter", daemon=True).start()
+
+    def report(self, event: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            request = urllib.request.Request(
+                self.url,
+                data=json.dumps(event, default=str).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=REPORT_TIMEOUT_SEC) as resp:
+                    resp.read()
+            except (urllib.error.URLError, OSError) as e:
+                if not self._warned:
+                    self._warned = True
+                    print(f"  WARN: could not report call events to {self.url} ({e}); dashboard will miss them")
+
+
+_reporter: Optional[_EventReporter] = None
+
+
+def configure_reporter(base_url: Optional[str]) -> None:
+    """Send this process's report_call_event() calls to the webhook server at base_url (None = off)."""
+    global _reporter
+    _reporter = _EventReporter(base_url) if base_url else None
+
+
+def report_call_event(event: str, call_id: Optional[str], **fields: Any) -> None:
+    """Fire-and-forget: tell the dashboard about a runner-side lifecycle event."""
+    if _reporter is not None and call_id:
+        _reporter.report({"event": event, "call_id": call_id, **fields})
@@ -0,0 +1,261 @@
+"""
+Capacity planner: estimate what a planned run costs before placing any call.
+
+History comes from what earlier runs left on disk. Each transcript gives a call
+duration (started_at -> ended_at) and the webhook lag (ended_at -> webhook
+received). Each report's eval_meta gives judge time and token usage; when a
+report predates eval_meta, tokens are estimated from the transcript's size.
+For every entry of the run list we sample a past call of the same scenario,
+falling back to the same category and then to any call. We then replay the
+two-stage pipeline of main.run_all: `concurrency` dial slots, `delay` between
+dials, an optional calls/min pace, and `eval_workers` judges behind them. The
+replay is repeated many times to give a median and a pessimistic (p90)
+wall-clock time.
+
+Early stopping and provider throttling are not modelled: the estimate places
+every planned call and assumes Vapi never pushes back.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from evaluator import estimate_prompt_tokens
+from load_test import call_duration_sec, webhook_lag_sec
+from scenario_manager import ScenarioConfig
+from storage import REPORTS_DIR, TRANSCRIPTS_DIR, iter_transcripts, load_evaluation_report
+
+# Used when there is no history at all (or a field is missing from every sample).
+DEFAULT_CALL_SEC = 240.0
+DEFAULT_WEBHOOK_LAG_SEC = 6.0
+DEFAULT_SETUP_SEC = 1.5
+DEFAULT_EVAL_SEC = 25.0
+DEFAULT_PROMPT_TOKENS = 3000
+DEFAULT_COMPLETION_TOKENS = 900
+
+DEFAULT_TRIALS = 200
+
+# Transcript fields load_call_history() reads.
+HISTORY_FIELDS = ("scenario", "started_at", "ended_at", "webhook_received_at", "turns")
+
+
+@dataclass
+class CallSample:
+    """Timings and judge usage of one past call."""
+
+    scenario_id: str
+    category: Optional[str]
+    duration_sec: float
+    lag_sec: Optional[float] = None
+    eval_sec: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+@dataclass
+class CapacityEstimate:
+    """Result of plan_capacity() for one concurrency / delay setting."""
+
+    calls: int
+    concurrency: int
+    delay_sec: float
+    eval_workers: int
+    calls_per_minute: float
+    wall_sec_p50: float
+    wall_sec_p90: float
+    call_minutes: float             # expected minutes on the phone (sum of call durations)
+    prompt_tokens: int              # expected judge prompt tokens
+    completion_tokens: int          # expected judge completion tokens
+    history_calls: int              # past calls the estimate is based on
+    fallbacks: Dict[str, str] = field(default_factory=dict)  # scenario_id -> "category" / "any" / "default"
+
+
+def load_call_history(
+    transcripts_dir: Path = TRANSCRIPTS_DIR, reports_dir: Path = REPORTS_DIR
+) -> List[CallSample]:
+    """One CallSample per transcript with usable timestamps."""
+    samples: List[CallSample] = []
+    for transcript in iter_transcripts(fields=HISTORY_FIELDS, transcripts_dir=transcripts_dir):
+        duration = call_duration_sec(transcript)
+        scenario = transcript.get("scenario") or {}
+        if duration is None or not isinstance(scenario, dict) or not scenario.get("id"):
+            continue
+        sample = CallSample(
+            scenario_id=scenario["id"],
+            category=scenario.get("category"),
+            duration_sec=duration,
+            lag_sec=webhook_lag_sec(transcript),
+            prompt_tokens=estimate_prompt_tokens(transcript),
+        )
+        call_id = transcript["call_id"]
+        try:
+            meta = load_evaluation_report(reports_dir / f"{call_id}.json").get("eval_meta") or {}
+        except (OSError, ValueError, AttributeError):
+            meta = {}
+        sample.eval_sec = meta.get("eval_sec")
+        sample.prompt_tokens = meta.get("prompt_tokens") or sample.prompt_tokens
+        sample.completion_tokens = meta.get("completion_tokens")
+        samples.append(sample)
+    return samples
+
+
+def _mean_or(values: Sequence[Optional[float]], default: float) -> float:
+    known = [v for v in values if v is not None]
+    return statistics.fmean(known) if known else default
+
+
+def _pools_for(
+    run_list: Sequence[Tuple[ScenarioConfig, int]], history: List[CallSample]
+) -> Tuple[List[List[CallSample]], Dict[str, str]]:
+    """History samples to draw from for each run-list entry, plus which scenarios fell back."""
+    by_scenario: Dict[str, List[CallSample]] = {}
+    by_category: Dict[str, List[CallSample]] = {}
+    for s in history:
+        by_scenario.setdefault(s.scenario_id, []).append(s)
+        if s.category:
+            by_category.setdefault(s.category, []).append(s)
+    pools: List[List[CallSample]] = []
+    fallbacks: Dict[str, str] = {}
+    for sc, _ in run_list:
+        if sc.id in by_scenario:
+            pools.append(by_scenario[sc.id])
+        elif sc.category in by_category:
+            pools.append(by_category[sc.category])
+            fallbacks[sc.id] = "category"
+        elif history:
+            pools.append(history)
+            fallbacks[sc.id] = "any"
+        else:
+            pools.append([])
+            fallbacks[sc.id] = "default"
+    return pools, fallbacks
+
+
+def simulate_pipeline(
+    call_secs: Sequence[float],
+    eval_secs: Sequence[float],
+    concurrency: int,
+    delay_sec: float,
+    eval_workers: int,
+    calls_per_minute: float = 0.0,
+) -> float:
+    """
+    Wall-clock seconds for main.run_all on calls with these durations: the dialer
+    waits for a free slot, then `delay_sec` (not before the first dial) and the
+    calls/min spacing; each finished call queues its evaluation on the judge pool.
+    """
+    slots = [0.0] * max(1, concurrency)
+    judges = [0.0] * max(1, eval_workers)
+    dialer = 0.0
+    last_dial: Optional[float] = None
+    wall = 0.0
+    for i, (call_sec, eval_sec) in enumerate(zip(call_secs, eval_secs)):
+        t = max(dialer, heapq.heappop(slots))
+        if i > 0:
+            t += delay_sec
+        if calls_per_minute > 0 and last_dial is not None:
+            t = max(t, last_dial + 60.0 / calls_per_minute)
+        dialer = last_dial = t
+        call_end = t + call_sec
+        heapq.heappush(slots, call_end)
+        eval_end = max(call_end, heapq.heappop(judges)) + eval_sec
+        heapq.heappush(judges, eval_end)
+        wall = max(wall, eval_end)
+    return wall
+
+
+def plan_capacity(
+    run_list: Sequence[Tuple[ScenarioConfig, int]],
+    concurrency: int,
+    delay_sec: float,
+    eval_workers: int,
+    calls_per_minute: float = 0.0,
+    history: Optional[List[CallSample]] = None,
+    trials: int = DEFAULT_TRIALS,
+    seed: Optional[int] = None,
+) -> CapacityEstimate:
+    """Monte Carlo estimate of wall-clock, call minutes and judge tokens for the run list."""
+    history = load_call_history() if history is None else history
+    pools, fallbacks = _pools_for(run_list, history)
+    lag = _mean_or([s.lag_sec for s in history], DEFAULT_WEBHOOK_LAG_SEC)
+    eval_default = _mean_or([s.eval_sec for s in history], DEFAULT_EVAL_SEC)
+    completion_default = _mean_or([s.completion_tokens for s in history], DEFAULT_COMPLETION_TOKENS)
+
+    # Expected totals come from pool means; wall-clock needs the spread, so it is sampled.
+    call_minutes = sum(_mean_or([s.duration_sec for s in pool], DEFAULT_CALL_SEC) for pool in pools) / 60
+    prompt_tokens = sum(_mean_or([s.prompt_tokens for s in pool], DEFAULT_PROMPT_TOKENS) for pool in pools)
+    completion_tokens = sum(_mean_or([s.completion_tokens for s in pool], completion_default) for pool in pools)
+
+    rng = random.Random(seed)
+    walls: List[float] = []
+    for _ in range(max(1, trials)):
+        call_secs: List[float] = []
+        eval_secs: List[float] = []
+        for pool in pools:
+            s = rng.choice(pool) if pool else None
+            duration = s.duration_sec if s else DEFAULT_CALL_SEC
+            call_lag = s.lag_sec if s and s.lag_sec is not None else lag
+            call_secs.append(DEFAULT_SETUP_SEC + duration + call_lag)
+            eval_secs.append(s.eval_sec if s and s.eval_sec is not None else eval_default)
+        walls.append(simulate_pipeline(call_secs, eval_secs, concurrency, delay_sec, eval_workers, calls_per_minute))
+    walls.sort()
+    return CapacityEstimate(
+        calls=len(run_list),
+        concurrency=concurrency,
+        delay_sec=delay_sec,
+        eval_workers=eval_workers,
+        calls_per_minute=calls_per_minute,
+        wall_sec_p50=walls[len(walls) // 2],
+        wall_sec_p90=walls[min(len(walls) - 1, int(len(walls) * 0.9))],
+        call_minutes=call_minutes,
+        prompt_tokens=int(prompt_tokens),
+        completion_tokens=int(completion_tokens),
+        history_calls=len(history),
+        fallbacks=fallbacks,
+    )
+
+
+def print_capacity_plan(
+    run_list: Sequence[Tuple[ScenarioConfig, int]],
+    concurrency: int,
+    delay_sec: float,
+    eval_workers: int,
+    calls_per_minute: float = 0.0,
+    seed: Optional[int] = None,
+) -> CapacityEstimate:
+    """Estimate the chosen settings, print it, and show how other concurrency levels compare."""
+    history = load_call_history()
+    est = plan_capacity(run_list, concurrency, delay_sec, eval_workers, calls_per_minute, history, seed=seed)
+    print()
+    print(f"Capacity estimate (from {est.history_calls} past call(s)):")
+    print(f"  Wall-clock: {est.wall_sec_p50 / 60:.0f} min median, {est.wall_sec_p90 / 60:.0f} min p90")
+    print(f"  Call minutes: {est.call_minutes:.0f}")
+    print(
+        f"  Judge tokens: ~{est.prompt_tokens + est.completion_tokens:,} "
+        f"({est.prompt_tokens:,} prompt + {est.completion_tokens:,} completion)"
+    )
+    if est.fallbacks:
+        by_kind: Dict[str, int] = {}
+        for kind in est.fallbacks.values():
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+        print(
+            "  No history for "
+            + ", ".join(f"{n} scenario(s) (using {kind} averages)" for kind, n in sorted(by_kind.items()))
+        )
+    levels = sorted({1, 2, 4, 8, concurrency})
+    print(f"  Other concurrency levels (delay {delay_sec:g} s, {eval_workers} eval worker(s)):")
+    for level in levels:
+        other = est if level == concurrency else plan_capacity(
+            run_list, level, delay_sec, eval_workers, calls_per_minute, history, seed=seed
+        )
+        marker = "  <- chosen" if level == concurrency else ""
+        print(
+            f"    concurrency {level:>2}: {other.wall_sec_p50 / 60:>5.0f} min median, "
+            f"{other.wall_sec_p90 / 60:>5.0f} min p90{marker}"
+        )
+    return est
@@ -0,0 +1,66 @@
+"""
+Sequential early stopping for repeated runs of one scenario.
+
+With --runs N the runner normally places all N calls. An EarlyStopper looks at
+the judge scores collected so far for a scenario and says "stop" once either
+
+  - the confidence interval on the mean of the chosen dimension is narrower
+    than the target width, or
+  - a pass/fail threshold is settled: the whole interval lies above (pass) or
+    below (fail) it.
+
+It never stops before min_runs evaluated calls.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from score_stats import mean_confidence_interval
+
+DEFAULT_STOP_DIMENSION = "task_resolution"
+DEFAULT_STOP_CONFIDENCE = 0.9
+DEFAULT_STOP_MIN_RUNS = 3
+
+
+@dataclass
+class EarlyStopper:
+    """Stopping rule on the confidence interval of one score dimension."""
+
+    dimension: str = DEFAULT_STOP_DIMENSION
+    target_width: Optional[float] = None    # stop when high - low <= this
+    threshold: Optional[float] = None       # stop when the interval is entirely above/below this
+    confidence: float = DEFAULT_STOP_CONFIDENCE
+    min_runs: int = DEFAULT_STOP_MIN_RUNS
+
+    @property
+    def enabled(self) -> bool:
+        return self.target_width is not None or self.threshold is not None
+
+    def check(self, scores: List[float]) -> Optional[str]:
+        """Reason to stop given the scores so far, or None to keep dialing."""
+        if not self.enabled or len(scores) < max(2, self.min_runs):
+            return None
+        ci = mean_confidence_interval(scores, self.confidence)
+        if ci is None:
+            return None
+        _, low, high = ci
+        if self.target_width is not None and high - low <= self.target_width:
+            return f"CI width {high - low:.2f} <= {self.target_width:g}"
+        if self.threshold is not None and low >= self.threshold:
+            return f"pass: CI above {self.threshold:g}"
+        if self.threshold is not None and high < self.threshold:
+            return f"fail: CI below {self.threshold:g}"
+        return None
+
+    def describe(self, scores: List[float]) -> str:
+        """Achieved interval for the summary, e.g. 'task_resolution 6.2 [5.4, 7.0] (90% CI, n=5)'."""
+        ci = mean_confidence_interval(scores, self.confidence)
+        if ci is None:
+            return f"{self.dimension}: n={len(scores)}, not enough scores for an interval"
+        mean, low, high = ci
+        return (
+            f"{self.dimension} {mean:.2f} [{low:.2f}, {high:.2f}] "
+            f"({self.confidence:.0%} CI, width {high - low:.2f}, n={len(scores)})"
+        )
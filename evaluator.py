@@ -10,6 +10,7 @@ from __future__ import annotations
 import json
 import os
 import re
+import time
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
@@ -18,6 +19,9 @@ load_dotenv()
 
 EVAL_MODEL = "gpt-4o"
 
+# Rough prompt-size estimate for planning when the API did not report usage.
+CHARS_PER_TOKEN = 4
+
 DIMENSION_KEYS = [
     "task_resolution",
     "comprehension_and_relevance",
@@ -194,6 +198,20 @@ Reserve 8–10 for dimensions with no significant issues. Truncated speech, non-
 }}"""
 
 
+def estimate_prompt_tokens(transcript: Dict[str, Any]) -> int:
+    """Approximate judge prompt tokens (system + user message) for a transcript, ~4 chars per token."""
+    user_msg = _build_eval_prompt(
+        turns=transcript.get("turns") or [],
+        call_id=transcript.get("call_id") or "unknown",
+        scenario_id="",
+        scenario_category="",
+        scenario_name="",
+        goal="",
+        eval_hints=[],
+    )
+    return (len(SYSTEM_PROMPT) + len(user_msg)) // CHARS_PER_TOKEN
+
+
 def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     text = text.strip()
     if text.startswith("```"):
@@ -259,6 +277,7 @@ def evaluate_transcript(
         from openai import OpenAI
 
         client = OpenAI(api_key=api_key)
+        started = time.monotonic()
         response = client.chat.completions.create(
             model=EVAL_MODEL,
             messages=[
@@ -278,25 +297,39 @@ def evaluate_transcript(
             print("[evaluator] Failed to parse JSON from LLM response")
             return None
 
-        return _normalize(report, call_id)
+        report = _normalize(report, call_id)
+        # Timing and token usage feed the capacity planner (main.py --dry-run).
+        usage = getattr(response, "usage", None)
+        report["eval_meta"] = {
+            "model": EVAL_MODEL,
+            "eval_sec": round(time.monotonic() - started, 2),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+        return report
     except Exception as e:
         print(f"[evaluator] Error: {e}")
         return None
 
 
-def evaluate_transcript_file(transcript_path: str) -> Optional[Dict[str, Any]]:
-    """Load transcript from disk, resolve scenario config, run evaluation."""
+def evaluate_transcript_file(
+    transcript_path: str, transcript: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load transcript from disk, resolve scenario config, run evaluation.
+    Pass `transcript` when the caller already holds the file's current contents.
+    """
     from pathlib import Path
 
     from scenario_manager import get_scenario_by_id
     from storage import load_transcript
 
     path = Path(transcript_path)
-    if not path.exists():
-        print(f"[evaluator] Transcript file not found: {path}")
-        return None
-
-    transcript = load_transcript(path)
+    if transcript is None:
+        if not path.exists():
+            print(f"[evaluator] Transcript file not found: {path}")
+            return None
+        transcript = load_transcript(path)
     scenario_meta = transcript.get("scenario") or {}
     scenario_id = scenario_meta.get("id") if isinstance(scenario_meta, dict) else None
     scenario_category = scenario_meta.get("category") if isinstance(scenario_meta, dict) else ""
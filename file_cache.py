@@ -0,0 +1,100 @@
+"""
+Bounded in-process LRU cache of parsed JSON files, validated against the file on every hit.
+
+An entry is keyed by the resolved path and remembers the (inode, mtime_ns,
+size) the file had when it was read. A hit costs one stat() and no read: if
+any of the three changed, the entry is stale and the file is parsed again.
+json_codec.dump_file replaces files with an atomic rename, so every write,
+from this process or another one, gives the path a new inode and can never be
+mistaken for the cached version. Writers in this process also call
+invalidate() so the entry is dropped right away.
+
+The file is stat'ed through the same descriptor it is read from, so the
+recorded signature always belongs to the bytes that were parsed.
+
+Cached objects are shared between callers: treat them as read-only and
+copy before changing them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, Union
+
+DEFAULT_CAPACITY = 512
+
+Signature = Tuple[int, int, int]
+
+
+def _signature(st: os.stat_result) -> Signature:
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class FileCache:
+    """Thread-safe LRU of parse(file bytes) per path, at most `capacity` entries (0 = off)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = max(0, capacity)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Signature, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def load(self, path: Union[os.PathLike, str], parse: Callable[[bytes], Any]) -> Any:
+        """
+        Parsed contents of path, from the cache when the file is unchanged.
+        Raises what opening or parsing the file raises (nothing is cached then).
+        """
+        key = os.path.abspath(path)
+        if self.capacity:
+            st = os.stat(key)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] == _signature(st):
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return entry[1]
+                    self.stale += 1
+                self.misses += 1
+        with open(key, "rb") as f:
+            signature = _signature(os.fstat(f.fileno()))
+            raw = f.read()
+        value = parse(raw)
+        if self.capacity:
+            with self._lock:
+                self._entries[key] = (signature, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, path: Union[os.PathLike, str]) -> None:
+        with self._lock:
+            if self._entries.pop(os.path.abspath(path), None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
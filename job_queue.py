@@ -0,0 +1,321 @@
+"""
+Durable file-lease job queue shared by runner and evaluator processes.
+
+Dial jobs (place one scenario call) and evaluate jobs (judge one saved
+transcript) live as JSON files under jobs/<kind>/<state>/. No external service
+is involved, so workers on several hosts can share the queue by pointing
+JOB_QUEUE_DIR at a shared volume (with transcripts/ and reports/ on it too):
+
+  pending/<job_id>.json             waiting to be claimed
+  leased/<job_id>__<owner>.json     claimed; the file's mtime is the lease heartbeat
+  done/<job_id>.json                finished, with its result
+  failed/<job_id>.json              gave up after max_attempts claims
+
+Claiming is a single rename from pending/ to leased/, which is atomic on a
+POSIX filesystem, so exactly one worker wins each job. The owner touches its
+leased file every few seconds; a leased file whose mtime is older than the
+lease is moved back to pending/ by whichever worker notices, and the old
+owner finds out on its next heartbeat (LeaseLost). Each claim counts as an
+attempt, so a job that keeps crashing its worker ends up in failed/.
+
+SQLite/WAL was the other option, but WAL needs shared memory and is not safe
+on network filesystems, which is exactly where a cross-host queue lives.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from storage import PROJECT_ROOT
+
+JOB_QUEUE_DIR_ENV = "JOB_QUEUE_DIR"
+JOB_KINDS = ("dial", "evaluate")
+JOB_STATES = ("pending", "leased", "done", "failed")
+
+# A lease not renewed for this long is considered abandoned (worker crashed or lost the volume).
+# Keep it well above the clock skew between hosts sharing the queue.
+DEFAULT_LEASE_SEC = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_OWNER_SEP = "__"
+
+
+class LeaseLost(RuntimeError):
+    """The job's lease expired and it was handed back to the queue (or to another worker)."""
+
+
+@dataclass
+class Job:
+    """One queued unit of work. `path` is the job's file while it is leased."""
+
+    job_id: str
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    enqueued_at: Optional[str] = None
+    owner: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    path: Optional[Path] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "enqueued_at": self.enqueued_at,
+            "owner": self.owner,
+            "error": self.error,
+            "result": self.result,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], path: Optional[Path] = None) -> "Job":
+        return cls(
+            job_id=data["job_id"],
+            kind=data["kind"],
+            payload=data.get("payload") or {},
+            attempts=int(data.get("attempts") or 0),
+            max_attempts=int(data.get("max_attempts") or DEFAULT_MAX_ATTEMPTS),
+            enqueued_at=data.get("enqueued_at"),
+            owner=data.get("owner"),
+            error=data.get("error"),
+            result=data.get("result"),
+            path=path,
+        )
+
+
+def default_queue_dir() -> Path:
+    """$JOB_QUEUE_DIR if set, else <project>/jobs."""
+    env = os.getenv(JOB_QUEUE_DIR_ENV)
+    return Path(env) if env else PROJECT_ROOT / "jobs"
+
+
+def new_owner_id() -> str:
+    """Worker identity used in lease file names: <host>-<pid>-<random>."""
+    host = os.uname().nodename if hasattr(os, "uname") else "host"
+    return f"{host}-{os.getpid()}-{uuid.uuid4().hex[:6]}".replace(_OWNER_SEP, "_")
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write via a temp file in the same directory and rename, so readers never see half a job."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class JobQueue:
+    """File-lease queue rooted at `root` (default: default_queue_dir())."""
+
+    def __init__(self, root: Optional[Path] = None, lease_sec: float = DEFAULT_LEASE_SEC) -> None:
+        self.root = Path(root) if root is not None else default_queue_dir()
+        self.lease_sec = lease_sec
+        for kind in JOB_KINDS:
+            for state in JOB_STATES:
+                self._dir(kind, state).mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, kind: str, state: str) -> Path:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        return self.root / kind / state
+
+    def _exists(self, kind: str, job_id: str) -> bool:
+        if any((self._dir(kind, s) / f"{job_id}.json").exists() for s in ("pending", "done", "failed")):
+            return True
+        return any(self._dir(kind, "leased").glob(f"{job_id}{_OWNER_SEP}*.json"))
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> Optional[Job]:
+        """
+        Add a job. With an explicit job_id the call is idempotent: if a job with that
+        id is already in any state, nothing is written and None is returned.
+        """
+        now = datetime.now(timezone.utc)
+        job_id = job_id or f"{now.strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:6]}"
+        if _OWNER_SEP in job_id or "/" in job_id:
+            raise ValueError(f"Invalid job id '{job_id}'")
+        if self._exists(kind, job_id):
+            return None
+        job = Job(job_id=job_id, kind=kind, payload=payload, max_attempts=max_attempts, enqueued_at=now.isoformat())
+        _write_json(self._dir(kind, "pending") / f"{job_id}.json", job.to_dict())
+        return job
+
+    def claim(self, kind: str, owner: str) -> Optional[Job]:
+        """Lease the oldest pending job of this kind, or return None if there is none."""
+        self.requeue_expired(kind)
+        leased_dir = self._dir(kind, "leased")
+        for pending in sorted(self._dir(kind, "pending").glob("*.json")):
+            leased = leased_dir / f"{pending.stem}{_OWNER_SEP}{owner}.json"
+            try:
+                # Touch first so the lease starts fresh the moment the rename lands.
+                os.utime(pending)
+                os.rename(pending, leased)
+            except FileNotFoundError:
+                continue  # another worker won this one
+            try:
+                job = Job.from_dict(_read_json(leased), path=leased)
+            except (OSError, ValueError) as e:
+                os.rename(leased, self._dir(kind, "failed") / pending.name)
+                print(f"[queue] dropping unreadable job {pending.name}: {e}")
+                continue
+            job.attempts += 1
+            job.owner = owner
+            if job.attempts > job.max_attempts:
+                job.error = job.error or "lease expired too many times"
+                self._finish(job, "failed")
+                continue
+            _write_json(leased, job.to_dict())
+            return job
+        return None
+
+    def heartbeat(self, job: Job) -> None:
+        """Renew the lease. Raises LeaseLost if the job was requeued in the meantime."""
+        if job.path is None:
+            raise LeaseLost(f"Job {job.job_id} is not leased")
+        try:
+            os.utime(job.path)
+        except FileNotFoundError:
+            raise LeaseLost(f"Lease on job {job.job_id} expired")
+
+    def reclaim(self, job: Job) -> bool:
+        """
+        Lease a job again after LeaseLost, if it is still pending (no other worker has
+        claimed it yet), so its old owner can finish work it already did. Does not
+        count as an attempt. Returns False if the job is no longer pending.
+        """
+        if job.owner is None:
+            return False
+        pending = self._dir(job.kind, "pending") / f"{job.job_id}.json"
+        leased = self._dir(job.kind, "leased") / f"{job.job_id}{_OWNER_SEP}{job.owner}.json"
+        try:
+            os.utime(pending)
+            os.rename(pending, leased)
+        except FileNotFoundError:
+            return False
+        job.path = leased
+        return True
+
+    def complete(self, job: Job, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a leased job done. Raises LeaseLost if it was requeued."""
+        job.result = result
+        job.error = None
+        self._finish(job, "done")
+
+    def fail(self, job: Job, error: str, retry: bool = True, result: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Give the job back for another attempt, or move it to failed/ once attempts run out.
+        With retry=False it goes to failed/ right away (e.g. a retry would cost money).
+        """
+        job.error = error
+        if result is not None:
+            job.result = result
+        if retry and job.attempts < job.max_attempts:
+            self._finish(job, "pending")
+        else:
+            self._finish(job, "failed")
+
+    def _finish(self, job: Job, state: str) -> None:
+        if job.path is None:
+            raise LeaseLost(f"Job {job.job_id} is not leased")
+        # Renaming our leased file to a private name is the ownership check; after it neither
+        # the reaper nor a claimer can see the job until it reappears, complete, in `state`.
+        private = job.path.with_name(f".{job.path.stem}.finishing")
+        try:
+            os.rename(job.path, private)
+        except FileNotFoundError:
+            raise LeaseLost(f"Lease on job {job.job_id} expired")
+        job.path = None
+        if state == "pending":
+            job.owner = None
+        _write_json(self._dir(job.kind, state) / f"{job.job_id}.json", job.to_dict())
+        private.unlink()
+
+    def requeue_expired(self, kind: str) -> int:
+        """Move leased jobs whose heartbeat is older than the lease back to pending/. Returns how many."""
+        cutoff = time.time() - self.lease_sec
+        pending_dir = self._dir(kind, "pending")
+        moved = 0
+        for leased in self._dir(kind, "leased").glob("*.json"):
+            try:
+                if leased.stat().st_mtime >= cutoff:
+                    continue
+                job_id = leased.stem.split(_OWNER_SEP, 1)[0]
+                os.rename(leased, pending_dir / f"{job_id}.json")
+            except FileNotFoundError:
+                continue
+            moved += 1
+            print(f"[queue] {kind} job {job_id}: lease expired, requeued")
+        return moved
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        """Number of jobs per state for one kind."""
+        return {state: sum(1 for _ in self._dir(kind, state).glob("*.json")) for state in JOB_STATES}
+
+    def jobs(self, kind: str, state: str) -> List[Job]:
+        """Jobs currently in one state (for status output)."""
+        out: List[Job] = []
+        for path in sorted(self._dir(kind, state).glob("*.json")):
+            try:
+                out.append(Job.from_dict(_read_json(path)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return out
+
+
+class LeaseKeeper:
+    """
+    Heartbeats a job's lease from a daemon thread while the work runs.
+
+        with LeaseKeeper(queue, job) as keeper:
+            ...long call...
+        if keeper.lost: the job was requeued; do not complete it (unless queue.reclaim(job))
+    """
+
+    def __init__(self, queue: JobQueue, job: Job) -> None:
+        self.queue = queue
+        self.job = job
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job.job_id}", daemon=True)
+
+    def _run(self) -> None:
+        interval = max(1.0, self.queue.lease_sec / 4)
+        while not self._stop.wait(interval):
+            try:
+                self.queue.heartbeat(self.job)
+            except LeaseLost:
+                self.lost = True
+                print(f"[queue] {self.job.kind} job {self.job.job_id}: lease lost")
+                return
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,176 @@
+"""
+JSON codec for transcripts, reports and webhook payloads.
+
+Uses orjson when it is installed (several times faster for both parsing and
+serializing) and the stdlib json module otherwise. JSON_BACKEND=stdlib forces
+the fallback. Files are written compact by default. Set STORAGE_PRETTY_JSON=1
+to get indented files, or look at a file with the CLI:
+
+  python json_codec.py pretty transcripts/<call_id>.json     # print indented
+  python json_codec.py compact transcripts/*.json reports/*.json   # rewrite compact in place
+
+dump_file(..., compression="gzip" | "lzma" | "zstd") writes a compressed file
+under the same name; load_file() recognizes the compressed formats by their
+magic bytes, so readers do not need to know how a file was written. zstd needs
+the optional `zstandard` package.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import lzma
+import os
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+JSON_BACKEND_ENV = "JSON_BACKEND"
+PRETTY_ENV = "STORAGE_PRETTY_JSON"
+
+try:
+    if os.getenv(JSON_BACKEND_ENV, "auto").lower() == "stdlib":
+        raise ImportError
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "stdlib"
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ("none", "gzip", "lzma", "zstd")
+_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "lzma": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+ZSTD_LEVEL = 10
+
+
+def compress(data: bytes, method: Optional[str]) -> bytes:
+    """Compress with gzip / lzma / zstd; None or "none" returns data unchanged."""
+    if not method or method == "none":
+        return data
+    if method == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if method == "lzma":
+        return lzma.compress(data, preset=6)
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"unknown compression {method!r} (choose from {', '.join(COMPRESSIONS)})")
+
+
+def detect_compression(data: bytes) -> str:
+    """Which of COMPRESSIONS `data` is in, judged by its magic bytes."""
+    for method, magic in _MAGIC.items():
+        if data.startswith(magic):
+            return method
+    return "none"
+
+
+def decompress(data: bytes) -> bytes:
+    """Undo compress(); plain JSON passes through."""
+    method = detect_compression(data)
+    if method == "gzip":
+        return gzip.decompress(data)
+    if method == "lzma":
+        return lzma.decompress(data)
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError("file is zstd-compressed; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def pretty_by_default() -> bool:
+    return os.getenv(PRETTY_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (compact unless pretty)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option, default=str)
+    if pretty:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+    return text.encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Parse JSON from bytes or str. Raises ValueError (json.JSONDecodeError) on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load_file(path: Union[os.PathLike, str]) -> Any:
+    """Read and parse one JSON file, decompressing it first if needed."""
+    return loads(decompress(Path(path).read_bytes()))
+
+
+def dump_file(
+    path: Union[os.PathLike, str], obj: Any, pretty: Optional[bool] = None, compression: Optional[str] = None
+) -> None:
+    """
+    Serialize obj into path (compact unless pretty, or STORAGE_PRETTY_JSON, says otherwise),
+    compressed when `compression` names one of COMPRESSIONS.
+
+    The bytes go to a temp file in the same directory, are fsynced, and replace
+    `path` with an atomic rename, so readers see the old file or the new one,
+    never a partial write.
+    """
+    path = Path(path)
+    data = compress(dumps(obj, pretty=pretty_by_default() if pretty is None else pretty), compression)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description=f"Inspect or rewrite stored JSON files (backend: {BACKEND}).")
+    parser.add_argument("command", choices=["pretty", "compact"], help="pretty = print indented; compact = rewrite in place")
+    parser.add_argument("paths", nargs="+", help="JSON files")
+    args = parser.parse_args(argv)
+
+    status = 0
+    for path in args.paths:
+        try:
+            data = load_file(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        if args.command == "pretty":
+            if len(args.paths) > 1:
+                print(f"==> {path} <==")
+            sys.stdout.write(dumps(data, pretty=True).decode("utf-8") + "\n")
+        else:
+            dump_file(path, data, pretty=False, compression=detect_compression(Path(path).read_bytes()[:8]))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
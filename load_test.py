@@ -0,0 +1,286 @@
+"""
+Load-test mode: ramp concurrent calls against the clinic line and see where it degrades.
+
+A ramp profile (e.g. 1 -> 10 concurrent calls over 30 minutes in 5 steps) is split
+into load steps. The dialer keeps each step's target number of calls in flight,
+sampling scenarios from the registry, and every call is attributed to the step
+that was active when it was dialed. Per call we record setup latency (create-call
+request), call duration, ended_reason and judge scores; per step we aggregate
+them so the report shows where quality or completion rate drops as load rises.
+
+Call execution is injected by main.py (run_call / post_call), so this module
+only owns the schedule and the report.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from evaluator import DIMENSION_KEYS
+from run_ledger import RUNS_DIR
+from scenario_manager import ScenarioConfig
+from storage import load_transcript
+
+# A step is flagged as degraded when it falls this far below the first step.
+COMPLETION_DROP_THRESHOLD = 0.15   # absolute drop in completion rate
+SCORE_DROP_THRESHOLD = 1.5         # drop in mean task_resolution (0-10 scale)
+
+
+@dataclass
+class LoadStep:
+    """One plateau of the ramp: keep `concurrency` calls in flight for duration_sec."""
+
+    index: int
+    concurrency: int
+    duration_sec: float
+    calls: List[Any] = field(default_factory=list)  # main.CallResult objects dialed in this step
+
+
+def parse_ramp(spec: str) -> tuple[int, int]:
+    """Parse "1:10" (or "1-10", or "4") into (start_concurrency, end_concurrency)."""
+    parts = spec.replace("-", ":").split(":")
+    try:
+        values = [int(p) for p in parts if p.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid ramp '{spec}' (expected START:END, e.g. 1:10)")
+    if len(values) == 1:
+        values = values * 2
+    if len(values) != 2 or min(values) < 1:
+        raise ValueError(f"Invalid ramp '{spec}' (expected START:END with values >= 1)")
+    return values[0], values[1]
+
+
+def plan_steps(start: int, end: int, steps: int, total_minutes: float) -> List[LoadStep]:
+    """Evenly spaced concurrency levels from start to end, each held total_minutes / steps."""
+    steps = max(1, steps)
+    step_sec = total_minutes * 60 / steps
+    out: List[LoadStep] = []
+    for i in range(steps):
+        level = start if steps == 1 else round(start + (end - start) * i / (steps - 1))
+        out.append(LoadStep(index=i + 1, concurrency=max(1, level), duration_sec=step_sec))
+    return out
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def call_duration_sec(transcript: Dict[str, Any]) -> Optional[float]:
+    """Call duration from the transcript's started_at / ended_at, or None if missing."""
+    started = _parse_iso(transcript.get("started_at"))
+    ended = _parse_iso(transcript.get("ended_at"))
+    if started is None or ended is None:
+        return None
+    return max(0.0, (ended - started).total_seconds())
+
+
+def webhook_lag_sec(transcript: Dict[str, Any]) -> Optional[float]:
+    """Seconds from call end until the webhook delivered the transcript, or None if unknown."""
+    ended = _parse_iso(transcript.get("ended_at"))
+    received = _parse_iso(transcript.get("webhook_received_at"))
+    if ended is None or received is None:
+        return None
+    return max(0.0, (received - ended).total_seconds())
+
+
+def run_load_test(
+    steps: List[LoadStep],
+    scenarios: List[ScenarioConfig],
+    run_call: Callable[[ScenarioConfig, int], Any],
+    post_call: Callable[[Any], Any],
+    eval_workers: int,
+    seed: Optional[int] = None,
+) -> List[LoadStep]:
+    """
+    Execute the ramp. run_call(scenario, position) runs the call stage and returns a
+    CallResult; post_call(result) evaluates it. Dialing stops at the end of the last
+    step; calls still in flight (and their evaluations) are then drained.
+    """
+    rng = random.Random(seed)
+    max_concurrency = max(s.concurrency for s in steps)
+    boundaries: List[float] = []
+    t0 = time.monotonic()
+    elapsed = 0.0
+    for step in steps:
+        elapsed += step.duration_sec
+        boundaries.append(t0 + elapsed)
+
+    position = 0
+    in_flight: Dict[Future, LoadStep] = {}
+    post_futures: List[Future] = []
+    post_pool = ThreadPoolExecutor(max_workers=max(1, eval_workers), thread_name_prefix="post")
+    try:
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="load") as pool:
+            current = 0
+            print(f"[load] step 1/{len(steps)}: {steps[0].concurrency} concurrent call(s)")
+            while True:
+                now = time.monotonic()
+                while current < len(steps) and now >= boundaries[current]:
+                    current += 1
+                    if current < len(steps):
+                        print(
+                            f"[load] step {steps[current].index}/{len(steps)}: "
+                            f"{steps[current].concurrency} concurrent call(s)"
+                        )
+                if current >= len(steps):
+                    break
+                step = steps[current]
+                while len(in_flight) < step.concurrency:
+                    position += 1
+                    scenario = rng.choice(scenarios)
+                    in_flight[pool.submit(run_call, scenario, position)] = step
+                pending: Set[Future] = set(in_flight)
+                done, _ = wait(pending, timeout=max(0.0, boundaries[current] - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect(future, in_flight.pop(future), post_pool, post_call, post_futures)
+            if in_flight:
+                print(f"[load] ramp finished; waiting for {len(in_flight)} call(s) in flight...")
+            for future in list(in_flight):
+                _collect(future, in_flight.pop(future), post_pool, post_call, post_futures)
+    finally:
+        post_pool.shutdown(wait=True)
+    return steps
+
+
+def _collect(
+    future: Future,
+    step: LoadStep,
+    post_pool: ThreadPoolExecutor,
+    post_call: Callable[[Any], Any],
+    post_futures: List[Future],
+) -> None:
+    try:
+        result = future.result()
+    except Exception as e:
+        print(f"[load] ERROR in call: {e}")
+        return
+    step.calls.append(result)
+    if result.ok and result.path is not None:
+        post_futures.append(post_pool.submit(post_call, result))
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return round(statistics.fmean(values), 2) if values else None
+
+
+def summarize_step(step: LoadStep) -> Dict[str, Any]:
+    """Aggregate one step's calls into the numbers the report shows."""
+    calls = step.calls
+    completed = [r for r in calls if r.ok]
+    setup = [r.setup_sec for r in calls if r.call_id]
+    durations: List[float] = []
+    ended_reasons: Counter = Counter()
+    for r in completed:
+        try:
+            transcript = load_transcript(r.path)
+        except (OSError, ValueError):
+            continue
+        duration = call_duration_sec(transcript)
+        if duration is not None:
+            durations.append(duration)
+        ended_reasons[transcript.get("ended_reason") or "unknown"] += 1
+    scores = {
+        key: _mean([float(r.scores[key]) for r in calls if key in r.scores]) for key in DIMENSION_KEYS
+    }
+    return {
+        "step": step.index,
+        "concurrency": step.concurrency,
+        "duration_sec": step.duration_sec,
+        "calls": len(calls),
+        "started": len(setup),
+        "completed": len(completed),
+        "completion_rate": round(len(completed) / len(calls), 3) if calls else None,
+        "evaluated": sum(1 for r in calls if r.evaluated),
+        "setup_latency_sec": {
+            "mean": _mean(setup),
+            "max": round(max(setup), 2) if setup else None,
+        },
+        "call_duration_sec": {"mean": _mean(durations)},
+        "ended_reason": dict(ended_reasons),
+        "scores": scores,
+        "calls_detail": [
+            {
+                "call_id": r.call_id,
+                "scenario_id": r.scenario.id,
+                "ok": r.ok,
+                "setup_sec": round(r.setup_sec, 3),
+                "scores": r.scores,
+            }
+            for r in calls
+        ],
+    }
+
+
+def find_degradation(summaries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """First step whose completion rate or mean task_resolution fell clearly below step 1."""
+    if len(summaries) < 2:
+        return None
+    base = summaries[0]
+    base_rate = base.get("completion_rate")
+    base_score = (base.get("scores") or {}).get("task_resolution")
+    for s in summaries[1:]:
+        rate = s.get("completion_rate")
+        score = (s.get("scores") or {}).get("task_resolution")
+        reasons = []
+        if base_rate is not None and rate is not None and base_rate - rate >= COMPLETION_DROP_THRESHOLD:
+            reasons.append(f"completion rate {base_rate:.0%} -> {rate:.0%}")
+        if base_score is not None and score is not None and base_score - score >= SCORE_DROP_THRESHOLD:
+            reasons.append(f"task_resolution {base_score:.1f} -> {score:.1f}")
+        if reasons:
+            return {"step": s["step"], "concurrency": s["concurrency"], "reasons": reasons}
+    return None
+
+
+def write_load_report(run_id: str, profile: Dict[str, Any], steps: List[LoadStep]) -> Path:
+    """Summarize every step, print a table and save runs/load_<run_id>.json."""
+    summaries = [summarize_step(s) for s in steps]
+    degradation = find_degradation(summaries)
+    report = {
+        "run_id": run_id,
+        "profile": profile,
+        "steps": summaries,
+        "degradation": degradation,
+    }
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RUNS_DIR / f"load_{run_id}.json"
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print()
+    print("Load test:")
+    print("  step  conc  calls  done   setup(s)  dur(s)  task_res  conv_qual")
+    for s in summaries:
+        rate = s["completion_rate"]
+        print(
+            f"  {s['step']:>4}  {s['concurrency']:>4}  {s['calls']:>5}  "
+            f"{(f'{rate:.0%}' if rate is not None else '-'):>5}  "
+            f"{_fmt(s['setup_latency_sec']['mean']):>8}  {_fmt(s['call_duration_sec']['mean']):>6}  "
+            f"{_fmt(s['scores'].get('task_resolution')):>8}  {_fmt(s['scores'].get('conversational_quality')):>9}"
+        )
+    if degradation:
+        print(
+            f"  Degrades at step {degradation['step']} ({degradation['concurrency']} concurrent): "
+            + "; ".join(degradation["reasons"])
+        )
+    else:
+        print("  No step fell clearly below the first one.")
+    print(f"  Report: {path}")
+    return path
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
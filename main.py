@@ -1,44 +1,166 @@
 """
-Phase 4 entrypoint: run scenarios sequentially.
+Phase 4 entrypoint: run scenarios, one call at a time or several in flight.
 
-Three modes:
+Modes:
   all      — Run every (category, variant) once.
   scenario — Run all variants of one category once (e.g. --scenario scheduling).
   task     — Run one (category, variant) N times (e.g. --scenario office_info --variant 0 --runs 2).
+  adaptive — Spend a fixed call budget (--budget N) on the scenarios whose scores in reports/
+             are most uncertain (see adaptive_scheduler.py).
+  load     — Ramp concurrent calls (e.g. --ramp 1:10 --ramp-minutes 30) with scenarios sampled
+             from the registry; writes a per-step load report (see load_test.py).
 
 Wait rule: after each call, wait for transcripts/<call_id>.json up to --max-wait minutes (default 16).
+By default the wait is a long-poll on the webhook server (GET /calls/<call_id>/wait), which
+returns as soon as the transcript is saved; --wait-via files watches the directory instead.
+Concurrency: --concurrency N keeps up to N calls in flight (default 1 = sequential).
+Pipeline: once a transcript lands, recording-URL fetch and evaluation run on a separate
+pool (--eval-workers), so the next call can be dialed while the previous one is judged.
+Ledger: every real run appends state transitions to runs/<run_id>.jsonl; --resume <run_id>
+skips evaluated entries, re-evaluates failed evaluations and dials the rest.
+Rate limiting: --calls-per-minute paces dialing with an adaptive token bucket (instead of
+--delay); retryable start-call failures (429, concurrency limit, 5xx) are retried with
+jittered exponential backoff and fed back into the limiter.
+Queue: --enqueue writes the run list as dial jobs to the shared job queue instead of dialing;
+worker.py processes (possibly on other hosts) place the calls and evaluate them.
+Dry run: --dry-run prints the run list and a capacity estimate (wall-clock, call minutes,
+judge tokens) simulated from past transcripts and reports (see capacity_planner.py).
+Early stopping: --stop-ci-width / --stop-threshold stop repeating a scenario once the
+confidence interval on --stop-dimension is narrow enough or a pass/fail call is settled.
+Dashboard: with --wait-via server, dialed / evaluated / failed events are reported to the
+webhook server, whose /dashboard page shows calls in flight live (see call_events.py).
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from scenario_manager import (
     ScenarioConfig,
     build_prompt,
     get_scenario,
+    get_scenario_by_id,
     list_categories,
     list_scenarios,
 )
 from storage import (
     REPORTS_DIR,
     TRANSCRIPTS_DIR,
+    cache_stats,
+    discard_pending_update,
+    load_evaluation_report,
     load_transcript,
     patch_transcript_recording_url,
-    patch_transcript_scenario,
     save_evaluation_report,
+    scenario_metadata,
+    transcript_path,
+    update_transcript,
 )
-from evaluator import evaluate_transcript_file
-from vapi_client import get_recording_url, start_call
+from adaptive_scheduler import plan_adaptive_runs
+from call_events import configure_reporter, report_call_event
+from capacity_planner import print_capacity_plan
+from early_stopping import (
+    DEFAULT_STOP_CONFIDENCE,
+    DEFAULT_STOP_DIMENSION,
+    DEFAULT_STOP_MIN_RUNS,
+    EarlyStopper,
+)
+from evaluator import DIMENSION_KEYS, evaluate_transcript_file
+from job_queue import JobQueue
+from load_test import parse_ramp, plan_steps, run_load_test, write_load_report
+from rate_limiter import AdaptiveRateLimiter, backoff_delay
+from run_ledger import LedgerEntry, RunLedger, new_run_id
+from score_stats import report_scores
+from transcript_wait import local_webhook_url, wait_via_filesystem, wait_via_server
+from vapi_client import classify_start_error, get_recording_url, retry_after_seconds, start_call
 
 # Defaults
 DEFAULT_MAX_WAIT_MINUTES = 16
 DEFAULT_POLL_INTERVAL_SEC = 10
 DEFAULT_DELAY_BETWEEN_CALLS_SEC = 15
+DEFAULT_CONCURRENCY = 1
+DEFAULT_EVAL_WORKERS = 2
+DEFAULT_START_RETRIES = 4
+DEFAULT_RAMP = "1:10"
+DEFAULT_RAMP_STEPS = 5
+DEFAULT_RAMP_MINUTES = 30.0
+
+
+@dataclass
+class CallResult:
+    """Outcome of one entry in the run list, filled in by the call and post-call stages."""
+
+    scenario: ScenarioConfig
+    run_index: int
+    position: int                   # 1-based index in run list (for display)
+    total: int
+    ok: bool = False                # transcript landed (or dry run)
+    call_id: Optional[str] = None
+    path: Optional[Path] = None
+    evaluated: bool = False         # report saved to reports/<call_id>.json
+    resumed: bool = False           # taken over from a previous run's ledger, not dialed now
+    skipped: bool = False           # not dialed because early stopping settled the scenario
+    call_sec: float = 0.0           # dial -> transcript saved and patched
+    post_sec: float = 0.0           # recording URL fetch + evaluation
+    setup_sec: float = 0.0          # create-call request latency (successful attempt)
+    scores: Dict[str, int] = field(default_factory=dict)  # judge score per dimension
+    # Transcript contents after patching, handed to post_process() so it need not re-read the file.
+    transcript: Optional[Dict[str, Any]] = None
+
+    @property
+    def tag(self) -> str:
+        return f"[{self.position}/{self.total}]" if self.total > 0 else f"[{self.position}]"
+
+
+def _record(
+    ledger: Optional[RunLedger], result: CallResult, state: str, error: Optional[str] = None
+) -> None:
+    """Append a state transition for this entry if a run ledger is active."""
+    if ledger is None:
+        return
+    try:
+        ledger.record(
+            result.position,
+            state,
+            scenario_id=result.scenario.id,
+            run_index=result.run_index,
+            call_id=result.call_id,
+            error=error,
+        )
+    except OSError as e:
+        print(f"{result.tag}   WARN: could not write run ledger: {e}")
+
+
+class InFlightCalls:
+    """Thread-safe registry of calls that have been dialed but not finished (call_id -> label)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, str] = {}
+
+    def add(self, call_id: str, label: str) -> int:
+        """Register a dialed call. Returns the number of calls now in flight."""
+        with self._lock:
+            self._calls[call_id] = label
+            return len(self._calls)
+
+    def remove(self, call_id: str) -> int:
+        """Forget a finished call. Returns the number of calls still in flight."""
+        with self._lock:
+            self._calls.pop(call_id, None)
+            return len(self._calls)
+
+    def snapshot(self) -> Dict[str, str]:
+        """Copy of the current call_id -> label mapping."""
+        with self._lock:
+            return dict(self._calls)
 
 
 def _call_id_from_response(result: Any) -> Optional[str]:
@@ -59,17 +181,28 @@ def wait_for_transcript(
     transcripts_dir: Path,
     max_wait_minutes: float = DEFAULT_MAX_WAIT_MINUTES,
     poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+    wait_url: Optional[str] = None,
 ) -> Optional[Path]:
     """
-    Poll for transcripts/<call_id>.json until it exists or max_wait_minutes elapsed.
+    Wait for transcripts/<call_id>.json until it exists or max_wait_minutes elapsed.
+
+    If wait_url is set, long-poll the webhook server at that base URL first; when the
+    server is unreachable (or saved the file somewhere we can't see), fall back to
+    filesystem events / polling every poll_interval_sec.
     Returns the Path if file appeared, None on timeout.
     """
     path = transcripts_dir / f"{call_id}.json"
     deadline = time.monotonic() + max_wait_minutes * 60
-    while time.monotonic() < deadline:
-        if path.exists():
+    if wait_url:
+        saved = wait_via_server(call_id, wait_url, deadline)
+        if saved is False:
+            return path if path.exists() else None
+        if saved and path.exists():
             return path
-        time.sleep(poll_interval_sec)
+        if saved is None:
+            print(f"  webhook server not reachable at {wait_url}; watching {transcripts_dir} instead")
+    if wait_via_filesystem(path, deadline, poll_interval_sec):
+        return path
     return None
 
 
@@ -108,6 +241,40 @@ def build_run_list(
     return out
 
 
+def build_adaptive_run_list(
+    scenario_category: Optional[str], budget: int, seed: Optional[int] = None
+) -> List[Tuple[ScenarioConfig, int]]:
+    """
+    Allocate `budget` calls across scenarios (all, or one category) by score
+    uncertainty in reports/, and print the allocation. run_index continues after
+    the calls already on record for each scenario.
+    """
+    if budget < 1:
+        raise ValueError("--budget must be >= 1 for mode 'adaptive'")
+    scenarios = list_scenarios(scenario_category) if scenario_category else list_scenarios()
+    if not scenarios:
+        raise ValueError(f"No scenarios in category '{scenario_category}'")
+    extra, stats = plan_adaptive_runs([sc.id for sc in scenarios], budget, seed=seed)
+
+    print(f"Adaptive allocation of {budget} call(s) (history from {REPORTS_DIR}):")
+    print("  scenario                               runs  task_res (mean±sd)  +calls")
+    out: List[Tuple[ScenarioConfig, int]] = []
+    for sc in scenarios:
+        st = stats.get(sc.id)
+        n = st.n if st else 0
+        mean = st.means.get("task_resolution") if st else None
+        var = st.variances.get("task_resolution") if st else None
+        spread = (
+            f"{mean:.1f}±{var ** 0.5:.1f}" if mean is not None and var is not None
+            else (f"{mean:.1f}±?" if mean is not None else "-")
+        )
+        print(f"  {sc.id:<38} {n:>4}  {spread:>18}  {extra[sc.id]:>6}")
+        for k in range(extra[sc.id]):
+            out.append((sc, n + k + 1))
+    print()
+    return out
+
+
 def run_one(
     scenario: ScenarioConfig,
     run_index: int,
@@ -116,91 +283,565 @@ def run_one(
     max_wait_minutes: float,
     poll_interval_sec: float,
     dry_run: bool,
-) -> Tuple[bool, Optional[str], Optional[Path]]:
+    in_flight: Optional[InFlightCalls] = None,
+    wait_url: Optional[str] = None,
+    ledger: Optional[RunLedger] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    start_retries: int = DEFAULT_START_RETRIES,
+) -> CallResult:
     """
-    Start one call, wait for transcript, patch scenario metadata.
+    Call stage: start one call, wait for transcript, patch scenario metadata.
     position = 1-based index in run list (for display). run_index = for scenario metadata (e.g. run 2 of 3).
-    Returns (success, call_id, transcript_path).
+    in_flight = optional registry; the call is tracked by call_id from dial until this returns.
+    wait_url = webhook server base URL to long-poll for the transcript (None = watch files).
+    ledger = optional run ledger; dialed / transcript / failed transitions are appended to it.
+    limiter = optional rate limiter; a slot is held from call creation until the call ends.
+    start_retries = retries for retryable start-call failures (jittered exponential backoff).
+    Recording URL and evaluation are left to post_process().
     """
+    result = CallResult(scenario=scenario, run_index=run_index, position=position, total=total)
+    started = time.monotonic()
+    try:
+        _call_stage(
+            result,
+            max_wait_minutes,
+            poll_interval_sec,
+            dry_run,
+            in_flight,
+            wait_url,
+            ledger,
+            limiter,
+            start_retries,
+        )
+    finally:
+        result.call_sec = time.monotonic() - started
+    return result
+
+
+def _call_stage(
+    result: CallResult,
+    max_wait_minutes: float,
+    poll_interval_sec: float,
+    dry_run: bool,
+    in_flight: Optional[InFlightCalls],
+    wait_url: Optional[str],
+    ledger: Optional[RunLedger],
+    limiter: Optional[AdaptiveRateLimiter],
+    start_retries: int,
+) -> None:
+    """Body of run_one(): fills in `result` as the call progresses."""
+    scenario, run_index, tag = result.scenario, result.run_index, result.tag
     prompt = build_prompt(scenario)
     first_message = scenario.first_message
     label = f"{scenario.category} variant {scenario.variant}" + (
-        f" run {run_index}" if total > 1 else ""
+        f" run {run_index}" if result.total > 1 else ""
     )
-    print(f"[{position}/{total}] {label} — {scenario.name}")
+    print(f"{tag} {label} — {scenario.name}")
 
     if dry_run:
-        print("  (dry-run, skipping)")
-        return True, None, None
+        print(f"{tag}   (dry-run, skipping)")
+        result.ok = True
+        return
 
     try:
-        result = start_call(
-            system_prompt=prompt,
-            first_message=first_message,
+        response, result.setup_sec = _start_call_with_retries(
+            tag, prompt, first_message, limiter, start_retries
         )
     except Exception as e:
-        print(f"  FAILED to start call: {e}")
-        return False, None, None
+        print(f"{tag}   FAILED to start call: {e}")
+        _record(ledger, result, "failed", error=f"start: {e}")
+        return
 
-    call_id = _call_id_from_response(result)
-    if not call_id:
-        print("  FAILED: no call_id in response")
-        return False, None, None
+    try:
+        call_id = _call_id_from_response(response)
+        if not call_id:
+            print(f"{tag}   FAILED: no call_id in response")
+            _record(ledger, result, "failed", error="start: no call_id")
+            return
+        result.call_id = call_id
+        _record(ledger, result, "dialed")
+        # Parked until the webhook saves the transcript, which then gets written once, already tagged.
+        _patch_scenario(result, pending=True)
+        report_call_event("dialed", call_id, scenario_id=scenario.id, label=label)
+        _wait_and_patch(result, label, max_wait_minutes, poll_interval_sec, in_flight, wait_url, ledger)
+    finally:
+        if limiter is not None:
+            limiter.release()
 
-    print(f"  call_id={call_id}, waiting up to {max_wait_minutes:.0f} min for transcript...")
-    path = wait_for_transcript(
-        call_id,
-        TRANSCRIPTS_DIR,
-        max_wait_minutes=max_wait_minutes,
-        poll_interval_sec=poll_interval_sec,
-    )
 
-    if path is None:
-        print(f"  TIMEOUT — no transcript after {max_wait_minutes:.0f} min")
-        return False, call_id, None
+def _start_call_with_retries(
+    tag: str,
+    prompt: str,
+    first_message: str,
+    limiter: Optional[AdaptiveRateLimiter],
+    start_retries: int,
+) -> Tuple[Any, float]:
+    """
+    Create the call, retrying retryable failures (see vapi_client.classify_start_error)
+    with jittered exponential backoff. On success the limiter slot stays held; on
+    failure it is released and the last error is raised.
+    Returns (response, latency of the successful create request in seconds).
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = start_call(
+                system_prompt=prompt,
+                first_message=first_message,
+            )
+        except Exception as e:
+            if limiter is not None:
+                limiter.release()
+            kind = classify_start_error(e)
+            if kind is None or attempt >= start_retries:
+                raise
+            retry_after = retry_after_seconds(e)
+            if limiter is not None and kind in ("rate_limit", "concurrency"):
+                limiter.on_throttled(retry_after=retry_after, concurrency=kind == "concurrency")
+            delay = backoff_delay(attempt, retry_after=retry_after)
+            attempt += 1
+            print(f"{tag}   start failed ({kind}), retry {attempt}/{start_retries} in {delay:.1f} s: {e}")
+            time.sleep(delay)
+            continue
+        if limiter is not None:
+            limiter.on_success()
+        return response, time.monotonic() - started
 
-    print(f"  transcript saved: {path.name}")
+
+def _wait_and_patch(
+    result: CallResult,
+    label: str,
+    max_wait_minutes: float,
+    poll_interval_sec: float,
+    in_flight: Optional[InFlightCalls],
+    wait_url: Optional[str],
+    ledger: Optional[RunLedger],
+) -> None:
+    """Wait for a dialed call's transcript, then patch scenario metadata into it."""
+    tag, call_id = result.tag, result.call_id
+    in_flight_note = ""
+    if in_flight is not None:
+        in_flight_note = f" ({in_flight.add(call_id, label)} in flight)"
     try:
-        patch_transcript_scenario(
-            path,
-            scenario_id=scenario.id,
-            category=scenario.category,
-            name=scenario.name,
-            run_index=run_index,
+        print(
+            f"{tag}   call_id={call_id}, waiting up to {max_wait_minutes:.0f} min for transcript...{in_flight_note}"
         )
+        path = wait_for_transcript(
+            call_id,
+            TRANSCRIPTS_DIR,
+            max_wait_minutes=max_wait_minutes,
+            poll_interval_sec=poll_interval_sec,
+            wait_url=wait_url,
+        )
+    finally:
+        if in_flight is not None:
+            in_flight.remove(call_id)
+
+    if path is None:
+        print(f"{tag}   TIMEOUT — no transcript after {max_wait_minutes:.0f} min")
+        _record(ledger, result, "failed", error="timeout")
+        report_call_event("failed", call_id, error="timeout")
+        try:
+            discard_pending_update(call_id)
+        except OSError:
+            pass
+        return
+
+    print(f"{tag}   transcript saved: {path.name}")
+    result.ok = True
+    result.path = path
+    try:
+        result.transcript = load_transcript(path)
+    except (OSError, ValueError) as e:
+        print(f"{tag}   WARN: could not read transcript: {e}")
+    if result.transcript is None or result.transcript.get("scenario") != _scenario_block(result):
+        # Saved by something that did not merge the parked patch; tag it now.
+        _patch_scenario(result)
+    _record(ledger, result, "transcript")
+
+
+def _scenario_block(result: CallResult) -> Dict[str, Any]:
+    scenario = result.scenario
+    return scenario_metadata(scenario.id, scenario.category, scenario.name, result.run_index)
+
+
+def _patch_scenario(result: CallResult, pending: bool = False) -> None:
+    """Write scenario metadata into the transcript so the evaluator can find goal/hints."""
+    try:
+        updated = update_transcript(result.call_id, pending=pending, scenario=_scenario_block(result))
     except Exception as e:
-        print(f"  WARN: could not patch scenario metadata: {e}")
+        print(f"{result.tag}   WARN: could not patch scenario metadata: {e}")
+        return
+    if updated is not None:
+        result.transcript = updated
+
+
+def post_process(result: CallResult, ledger: Optional[RunLedger] = None) -> CallResult:
+    """
+    Post-call stage: fetch the recording URL if the webhook lacked it, then run the
+    LLM judge and save reports/<call_id>.json. Safe to run on a background worker.
+    Appends evaluated / eval_failed to the ledger when one is given.
+    """
+    if not result.ok or result.path is None or not result.call_id:
+        return result
+    tag, path, call_id = result.tag, result.path, result.call_id
+    started = time.monotonic()
     # If webhook did not include recording URL, fetch from Vapi API (per docs: GET call returns artifact.recording)
+    # The call stage hands over what it last wrote; resumed / queued entries read the file once.
+    data, result.transcript = result.transcript, None
     try:
-        data = load_transcript(path)
-        if not (data.get("artifact") or {}).get("recording_url") and call_id:
+        if data is None:
+            data = load_transcript(path)
+        if not (data.get("artifact") or {}).get("recording_url"):
             recording_url = get_recording_url(call_id)
             if recording_url:
-                patch_transcript_recording_url(path, recording_url)
-                print(f"  recording_url set from API")
+                data = patch_transcript_recording_url(path, recording_url) or data
+                print(f"{tag}   recording_url set from API")
     except Exception as e:
-        print(f"  WARN: could not fetch recording URL: {e}")
+        print(f"{tag}   WARN: could not fetch recording URL: {e}")
     # Run evaluation (LLM judge) and save report to reports/<call_id>.json
     try:
-        report = evaluate_transcript_file(str(path))
-        if report and call_id:
+        report = evaluate_transcript_file(str(path), transcript=data)
+        if report:
             save_evaluation_report(call_id, report)
-            print(f"  evaluation saved: {REPORTS_DIR / f'{call_id}.json'}")
+            result.evaluated = True
+            result.scores = {
+                key: val.get("score")
+                for key, val in (report.get("scores") or {}).items()
+                if isinstance(val, dict) and isinstance(val.get("score"), (int, float))
+            }
+            print(f"{tag}   evaluation saved: {REPORTS_DIR / f'{call_id}.json'}")
     except Exception as e:
-        print(f"  WARN: could not run evaluation: {e}")
-    return True, call_id, path
+        print(f"{tag}   WARN: could not run evaluation: {e}")
+    _record(ledger, result, "evaluated" if result.evaluated else "eval_failed")
+    report_call_event("evaluated" if result.evaluated else "eval_failed", call_id, scores=result.scores or None)
+    result.post_sec = time.monotonic() - started
+    return result
+
+
+def _resume_result(
+    entry: LedgerEntry, scenario: ScenarioConfig, run_index: int, position: int, total: int
+) -> Optional[CallResult]:
+    """
+    Build the CallResult for a ledger entry that does not need a new call, or None
+    if it has to be dialed again. A dialed entry whose transcript has landed since
+    the crash counts as having its transcript.
+    """
+    if entry.state == "skipped":
+        return CallResult(scenario, run_index, position, total, resumed=True, skipped=True)
+    if entry.state not in ("dialed", "transcript", "evaluated", "eval_failed") or not entry.call_id:
+        return None
+    path = transcript_path(entry.call_id)
+    if not path.exists():
+        return None
+    result = CallResult(
+        scenario=scenario,
+        run_index=run_index,
+        position=position,
+        total=total,
+        ok=True,
+        call_id=entry.call_id,
+        path=path,
+        evaluated=entry.state == "evaluated",
+        resumed=True,
+    )
+    if result.evaluated:
+        # Early stopping needs the scores of calls judged before the interruption.
+        try:
+            report = load_evaluation_report(REPORTS_DIR / f"{entry.call_id}.json")
+            result.scores = {k: int(v) for k, v in report_scores(report).items()}
+        except (OSError, ValueError):
+            pass
+    return result
+
+
+def _scores_for(results: List[CallResult], scenario_id: str, dimension: str) -> List[float]:
+    """Judge scores on one dimension for the evaluated calls of a scenario."""
+    return [
+        float(r.scores[dimension])
+        for r in results
+        if r.scenario.id == scenario_id and r.evaluated and dimension in r.scores
+    ]
+
+
+@dataclass
+class RunStats:
+    """Wall-clock and per-stage totals for one runner invocation."""
+
+    wall_sec: float = 0.0
+    delay_sec: float = 0.0      # time the dialer spent in --delay sleeps
+    call_sec: float = 0.0       # sum over calls of the call stage
+    post_sec: float = 0.0       # sum over calls of the post-call stage
+    early_stops: Dict[str, str] = field(default_factory=dict)  # scenario id -> why it stopped early
+
+    @property
+    def serial_sec(self) -> float:
+        """What the same work would take with every stage run back-to-back."""
+        return self.delay_sec + self.call_sec + self.post_sec
+
+    @property
+    def overlap_saved_sec(self) -> float:
+        return max(0.0, self.serial_sec - self.wall_sec)
+
+
+def run_all(
+    run_list: List[Tuple[ScenarioConfig, int]],
+    concurrency: int,
+    delay_sec: float,
+    max_wait_minutes: float,
+    poll_interval_sec: float,
+    dry_run: bool,
+    wait_url: Optional[str] = None,
+    eval_workers: int = DEFAULT_EVAL_WORKERS,
+    ledger: Optional[RunLedger] = None,
+    resume_entries: Optional[Dict[int, LedgerEntry]] = None,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    start_retries: int = DEFAULT_START_RETRIES,
+    stopper: Optional[EarlyStopper] = None,
+) -> Tuple[List[CallResult], RunStats]:
+    """
+    Run every entry of the run list as a two-stage pipeline.
+
+    Call stage: at most `concurrency` calls in flight. A new call is dialed as soon
+    as a slot frees up (i.e. the previous transcript landed), after waiting delay_sec,
+    so concurrency=1 is the classic sequential dialer.
+    Post-call stage: recording fetch + evaluation on `eval_workers` background threads.
+    ledger: transitions for every entry are appended to it (queued first, unless resuming).
+    resume_entries: ledger state per position from a previous run; evaluated entries are
+    skipped, entries with a transcript go straight to the post-call stage.
+    limiter / start_retries: passed to run_one() for paced, retried call creation.
+    stopper: before each dial, wait for queued evaluations and skip the entry if the
+    scenario's scores already satisfy the early-stopping rule.
+    Returns once both stages have drained; results are in run-list order.
+    """
+    total = len(run_list)
+    workers = max(1, concurrency)
+    slots = threading.Semaphore(workers)
+    in_flight = InFlightCalls()
+    stats = RunStats()
+    call_futures: List[Optional[Future]] = []
+    post_futures: List[Future] = []
+    post_lock = threading.Lock()
+    finished: List[CallResult] = []
+    wall_start = time.monotonic()
+
+    post_pool = ThreadPoolExecutor(max_workers=max(1, eval_workers), thread_name_prefix="post")
+    resumed: Dict[int, CallResult] = {}
+    for i, (scenario, run_index) in enumerate(run_list):
+        position = i + 1
+        entry = (resume_entries or {}).get(position)
+        prior = _resume_result(entry, scenario, run_index, position, total) if entry else None
+        if prior is not None:
+            resumed[position] = prior
+        elif ledger is not None and not dry_run:
+            _record(ledger, CallResult(scenario, run_index, position, total), "queued")
+
+    def _call_then_queue(scenario: ScenarioConfig, run_index: int, position: int) -> CallResult:
+        try:
+            result = run_one(
+                scenario,
+                run_index,
+                position,
+                total,
+                max_wait_minutes=max_wait_minutes,
+                poll_interval_sec=poll_interval_sec,
+                dry_run=dry_run,
+                in_flight=in_flight,
+                wait_url=wait_url,
+                ledger=ledger,
+                limiter=limiter,
+                start_retries=start_retries,
+            )
+            with post_lock:
+                finished.append(result)
+                if result.ok and result.path is not None:
+                    post_futures.append(post_pool.submit(post_process, result, ledger))
+            return result
+        finally:
+            # Free the dial slot as soon as the transcript is in; evaluation runs behind us.
+            slots.release()
+
+    def _early_stop_reason(scenario_id: str) -> Optional[str]:
+        if scenario_id in stats.early_stops:
+            return stats.early_stops[scenario_id]
+        # Decide on every score we can have: let queued evaluations finish first.
+        with post_lock:
+            pending = list(post_futures)
+        for future in pending:
+            future.exception()
+        with post_lock:
+            done = finished + list(resumed.values())
+        reason = stopper.check(_scores_for(done, scenario_id, stopper.dimension))
+        if reason:
+            stats.early_stops[scenario_id] = reason
+        return reason
+
+    try:
+        for position, prior in resumed.items():
+            if prior.skipped:
+                print(f"{prior.tag} {prior.scenario.id} — skipped by early stopping in the previous run")
+                continue
+            if prior.evaluated or dry_run:
+                print(f"{prior.tag} {prior.scenario.id} — already evaluated ({prior.call_id}), skipping")
+                continue
+            print(f"{prior.tag} {prior.scenario.id} — transcript on disk ({prior.call_id}), re-evaluating")
+            _patch_scenario(prior)
+            with post_lock:
+                post_futures.append(post_pool.submit(post_process, prior, ledger))
+
+        dialed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="call") as call_pool:
+            for i, (scenario, run_index) in enumerate(run_list):
+                if i + 1 in resumed:
+                    call_futures.append(None)
+                    continue
+                slots.acquire()
+                if stopper is not None and stopper.enabled and not dry_run:
+                    reason = _early_stop_reason(scenario.id)
+                    if reason:
+                        slots.release()
+                        skipped = CallResult(scenario, run_index, i + 1, total, skipped=True)
+                        print(f"{skipped.tag} {scenario.id} run {run_index} — skipped ({reason})")
+                        _record(ledger, skipped, "skipped", error=reason)
+                        call_futures.append(None)
+                        resumed[i + 1] = skipped
+                        continue
+                dialed += 1
+                if not dry_run and delay_sec > 0 and dialed > 1:
+                    print(f"  waiting {delay_sec:.0f} s before next call...")
+                    time.sleep(delay_sec)
+                    stats.delay_sec += delay_sec
+                # i + 1 is 1-based for display (e.g. "Run 3/15")
+                call_futures.append(call_pool.submit(_call_then_queue, scenario, run_index, i + 1))
+        if post_futures:
+            print(f"  all calls done; waiting for {len(post_futures)} post-call job(s) to finish...")
+    finally:
+        post_pool.shutdown(wait=True)
+    stats.wall_sec = time.monotonic() - wall_start
+
+    results: List[CallResult] = []
+    for i, ((scenario, run_index), future) in enumerate(zip(run_list, call_futures)):
+        if future is None:
+            results.append(resumed[i + 1])
+            continue
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"  ERROR in {scenario.id}: {e}")
+            results.append(CallResult(scenario=scenario, run_index=run_index, position=i + 1, total=total))
+    for future in post_futures:
+        # post_process mutates the CallResult in place; surface unexpected crashes only.
+        exc = future.exception()
+        if exc is not None:
+            print(f"  ERROR in post-call stage: {exc}")
+    stats.call_sec = sum(r.call_sec for r in results)
+    stats.post_sec = sum(r.post_sec for r in results)
+    return results, stats
+
+
+def run_load_mode(args: argparse.Namespace) -> int:
+    """--mode load: ramp concurrency per --ramp / --ramp-steps / --ramp-minutes and report per step."""
+    try:
+        start, end = parse_ramp(args.ramp)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    scenarios = list_scenarios(args.scenario) if args.scenario else list_scenarios()
+    if not scenarios:
+        print(f"Error: no scenarios to sample (category '{args.scenario}')", file=sys.stderr)
+        return 1
+    steps = plan_steps(start, end, args.ramp_steps, args.ramp_minutes)
+    print(
+        f"Load test: {start} -> {end} concurrent call(s) over {args.ramp_minutes:g} min "
+        f"in {len(steps)} step(s), sampling {len(scenarios)} scenario(s)"
+    )
+    for step in steps:
+        print(f"  step {step.index}: {step.concurrency} concurrent for {step.duration_sec / 60:.1f} min")
+    if args.dry_run:
+        print("DRY RUN — no calls will be made")
+        return 0
+
+    run_id = new_run_id()
+    limiter = AdaptiveRateLimiter(
+        calls_per_minute=args.calls_per_minute, max_concurrent=max(s.concurrency for s in steps)
+    )
+    in_flight = InFlightCalls()
+    wait_url = local_webhook_url() if args.wait_via == "server" else None
+    # run_index counts each scenario's own calls (1, 2, ...), like the other modes; position is global.
+    run_counts: Dict[str, int] = {}
+    run_counts_lock = threading.Lock()
+
+    def _run_call(scenario: ScenarioConfig, position: int) -> CallResult:
+        with run_counts_lock:
+            run_index = run_counts[scenario.id] = run_counts.get(scenario.id, 0) + 1
+        return run_one(
+            scenario,
+            run_index,
+            position,
+            0,
+            max_wait_minutes=args.max_wait,
+            poll_interval_sec=args.poll_interval,
+            dry_run=False,
+            in_flight=in_flight,
+            wait_url=wait_url,
+            limiter=limiter,
+            start_retries=args.start_retries,
+        )
+
+    run_load_test(
+        steps,
+        scenarios,
+        run_call=_run_call,
+        post_call=post_process,
+        eval_workers=args.eval_workers,
+        seed=args.seed,
+    )
+    profile = {
+        "ramp": [start, end],
+        "steps": len(steps),
+        "minutes": args.ramp_minutes,
+        "category": args.scenario,
+        "seed": args.seed,
+        "dialing": limiter.describe(),
+    }
+    write_load_report(run_id, profile, steps)
+    return 0
+
+
+def enqueue_run_list(run_list: List[Tuple[ScenarioConfig, int]], dry_run: bool) -> int:
+    """--enqueue: one dial job per run-list entry, ids <run_id>-<position> so re-enqueueing is a no-op."""
+    run_id = new_run_id()
+    total = len(run_list)
+    if dry_run:
+        for i, (sc, run_index) in enumerate(run_list):
+            print(f"[{i + 1}/{total}] would enqueue {sc.id} run {run_index}")
+        return 0
+    queue = JobQueue()
+    added = 0
+    for i, (sc, run_index) in enumerate(run_list):
+        payload = {"run_id": run_id, "scenario_id": sc.id, "run_index": run_index, "position": i + 1, "total": total}
+        if queue.enqueue("dial", payload, job_id=f"{run_id}-{i + 1:04d}") is not None:
+            added += 1
+    print(f"Enqueued {added} dial job(s) for run {run_id} in {queue.root}")
+    print("Start workers with: python worker.py dial / python worker.py evaluate")
+    return 0
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
-        description="Run scenario calls sequentially (Phase 4).",
+        description="Run scenario calls (Phase 4).",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     parser.add_argument(
         "--mode",
-        choices=["all", "scenario", "task"],
+        choices=["all", "scenario", "task", "adaptive", "load"],
         default="all",
-        help="all = every (category,variant) once; scenario = all variants of one category; task = one (category,variant) N times",
+        help="all = every (category,variant) once; scenario = all variants of one category; "
+        "task = one (category,variant) N times; adaptive = --budget calls where scores are most uncertain; "
+        "load = ramp concurrent calls (see --ramp)",
     )
     parser.add_argument(
         "--scenario",
@@ -223,7 +864,7 @@ def main() -> int:
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Print run list and skip actual calls",
+        help="Print run list and a wall-clock / call-minute / token estimate; skip actual calls",
     )
     parser.add_argument(
         "--delay",
@@ -232,6 +873,35 @@ def main() -> int:
         metavar="SEC",
         help="Seconds to wait between calls (0 to disable)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        metavar="N",
+        help="Max calls in flight at once (1 = sequential)",
+    )
+    parser.add_argument(
+        "--calls-per-minute",
+        type=float,
+        default=0.0,
+        metavar="N",
+        help="Pace call creation with an adaptive token bucket at up to N calls/min "
+        "(replaces --delay; 0 = off, use --delay)",
+    )
+    parser.add_argument(
+        "--start-retries",
+        type=int,
+        default=DEFAULT_START_RETRIES,
+        metavar="N",
+        help="Retries for rate-limit / concurrency / 5xx errors when starting a call",
+    )
+    parser.add_argument(
+        "--eval-workers",
+        type=int,
+        default=DEFAULT_EVAL_WORKERS,
+        metavar="N",
+        help="Background workers for post-call work (recording URL fetch + evaluation)",
+    )
     parser.add_argument(
         "--max-wait",
         type=float,
@@ -244,59 +914,267 @@ def main() -> int:
         type=float,
         default=DEFAULT_POLL_INTERVAL_SEC,
         metavar="SEC",
-        help="Poll interval when waiting for transcript",
+        help="Poll interval when waiting for transcript (files fallback without watchdog)",
+    )
+    parser.add_argument(
+        "--wait-via",
+        choices=["server", "files"],
+        default="server",
+        help="server = long-poll the webhook server's /calls/<call_id>/wait (falls back to files); "
+        "files = watch transcripts/ directly",
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Mode 'adaptive': total calls to place, allocated where scores are most uncertain",
+    )
+    parser.add_argument(
+        "--stop-ci-width",
+        type=float,
+        metavar="W",
+        help="Early stopping: stop repeating a scenario once the CI on --stop-dimension is at most W wide",
+    )
+    parser.add_argument(
+        "--stop-threshold",
+        type=float,
+        metavar="T",
+        help="Early stopping: stop once the CI on --stop-dimension is entirely above (pass) or below (fail) T",
+    )
+    parser.add_argument(
+        "--stop-dimension",
+        choices=DIMENSION_KEYS,
+        default=DEFAULT_STOP_DIMENSION,
+        help="Early stopping: score dimension the interval is computed on",
+    )
+    parser.add_argument(
+        "--stop-confidence",
+        type=float,
+        default=DEFAULT_STOP_CONFIDENCE,
+        metavar="P",
+        help="Early stopping: confidence level of the interval",
+    )
+    parser.add_argument(
+        "--stop-min-runs",
+        type=int,
+        default=DEFAULT_STOP_MIN_RUNS,
+        metavar="N",
+        help="Early stopping: never stop before N evaluated calls",
+    )
+    parser.add_argument(
+        "--ramp",
+        default=DEFAULT_RAMP,
+        metavar="START:END",
+        help="Mode 'load': concurrency ramp, e.g. 1:10",
+    )
+    parser.add_argument(
+        "--ramp-steps",
+        type=int,
+        default=DEFAULT_RAMP_STEPS,
+        metavar="N",
+        help="Mode 'load': number of load steps in the ramp",
+    )
+    parser.add_argument(
+        "--ramp-minutes",
+        type=float,
+        default=DEFAULT_RAMP_MINUTES,
+        metavar="MIN",
+        help="Mode 'load': total ramp duration (split evenly across steps)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        metavar="N",
+        help="Random seed for scenario sampling (mode 'load') or Thompson draws (mode 'adaptive')",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from runs/<RUN_ID>.jsonl (mode/scenario/variant/runs come from the ledger)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Write the run list as dial jobs to the shared job queue for worker.py instead of dialing",
     )
     args = parser.parse_args()
 
+    if args.enqueue and (args.mode == "load" or args.resume):
+        print("Error: --enqueue cannot be combined with --mode load or --resume", file=sys.stderr)
+        return 1
+    if args.wait_via == "server" and not args.dry_run and not args.enqueue:
+        configure_reporter(local_webhook_url())
+    if args.mode == "load":
+        return run_load_mode(args)
+
+    ledger: Optional[RunLedger] = None
+    resume_entries: Optional[Dict[int, LedgerEntry]] = None
+    if args.resume:
+        try:
+            ledger = RunLedger.open(args.resume)
+            header = ledger.header()
+            resume_entries = ledger.entries()
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        args.mode = header.get("mode", args.mode)
+        args.scenario = header.get("scenario")
+        args.variant = header.get("variant")
+        args.runs = header.get("runs", args.runs)
+
     try:
-        run_list = build_run_list(
-            args.mode,
-            args.scenario,
-            args.variant,
-            args.runs,
-        )
-    except ValueError as e:
+        if args.resume and header.get("plan") is not None:
+            run_list = []
+            for scenario_id, run_index in header["plan"]:
+                sc = get_scenario_by_id(scenario_id)
+                if sc is None:
+                    raise ValueError(f"Scenario '{scenario_id}' from run ledger no longer exists")
+                run_list.append((sc, run_index))
+        elif args.mode == "adaptive":
+            run_list = build_adaptive_run_list(args.scenario, args.budget, seed=args.seed)
+        else:
+            run_list = build_run_list(
+                args.mode,
+                args.scenario,
+                args.variant,
+                args.runs,
+            )
+    except (ValueError, KeyError, IndexError) as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
+    if resume_entries:
+        for position, entry in resume_entries.items():
+            if position > len(run_list) or (
+                entry.scenario_id and run_list[position - 1][0].id != entry.scenario_id
+            ):
+                print(
+                    f"Error: run ledger {args.resume} does not match the current scenario registry "
+                    f"(entry {position}: {entry.scenario_id})",
+                    file=sys.stderr,
+                )
+                return 1
+
     if not run_list:
         print("No runs to execute.")
         return 0
 
+    if args.enqueue:
+        return enqueue_run_list(run_list, args.dry_run)
+
+    if args.concurrency < 1 or args.eval_workers < 1:
+        print("Error: --concurrency and --eval-workers must be >= 1", file=sys.stderr)
+        return 1
+
+    limiter = AdaptiveRateLimiter(calls_per_minute=args.calls_per_minute, max_concurrent=args.concurrency)
+    stopper = EarlyStopper(
+        dimension=args.stop_dimension,
+        target_width=args.stop_ci_width,
+        threshold=args.stop_threshold,
+        confidence=args.stop_confidence,
+        min_runs=args.stop_min_runs,
+    )
+    if not 0 < stopper.confidence < 1:
+        print("Error: --stop-confidence must be between 0 and 1", file=sys.stderr)
+        return 1
+    delay = 0.0 if args.calls_per_minute > 0 else args.delay
+
     total = len(run_list)
-    print(f"Phase 4: {total} run(s), mode={args.mode}")
+    print(f"Phase 4: {total} run(s), mode={args.mode}, concurrency={args.concurrency}")
+    if args.calls_per_minute > 0:
+        print(f"Rate limit: up to {args.calls_per_minute:g} calls/min (adaptive; --delay ignored)")
+    if stopper.enabled:
+        print(
+            f"Early stopping on {stopper.dimension} ({stopper.confidence:.0%} CI, min {stopper.min_runs} runs): "
+            + ", ".join(
+                part
+                for part in (
+                    f"width <= {stopper.target_width:g}" if stopper.target_width is not None else "",
+                    f"threshold {stopper.threshold:g}" if stopper.threshold is not None else "",
+                )
+                if part
+            )
+        )
     if args.dry_run:
         print("DRY RUN — no calls will be made")
+    elif ledger is None:
+        header = {"mode": args.mode, "scenario": args.scenario, "variant": args.variant, "runs": args.runs}
+        if args.mode == "adaptive":
+            # The allocation depends on history and randomness; store it so --resume replays it.
+            header["plan"] = [[sc.id, run_index] for sc, run_index in run_list]
+        ledger = RunLedger.create(header)
+    if ledger is not None:
+        print(f"Run id: {ledger.run_id} (ledger: {ledger.path})")
     print()
 
-    succeeded = 0
-    failed = 0
-    for i, (scenario, run_index) in enumerate(run_list):
-        position = i + 1  # 1-based for display (e.g. "Run 3/15")
-        ok, call_id, path = run_one(
-            scenario,
-            run_index,
-            position,
-            total,
-            max_wait_minutes=args.max_wait,
-            poll_interval_sec=args.poll_interval,
-            dry_run=args.dry_run,
-        )
-        if ok:
-            succeeded += 1
-        else:
-            failed += 1
-
-        if not args.dry_run and args.delay > 0 and i < total - 1:
-            print(f"  waiting {args.delay:.0f} s before next call...")
-            time.sleep(args.delay)
+    results, stats = run_all(
+        run_list,
+        concurrency=args.concurrency,
+        delay_sec=delay,
+        max_wait_minutes=args.max_wait,
+        poll_interval_sec=args.poll_interval,
+        dry_run=args.dry_run,
+        wait_url=local_webhook_url() if args.wait_via == "server" else None,
+        eval_workers=args.eval_workers,
+        ledger=ledger,
+        resume_entries=resume_entries,
+        limiter=limiter,
+        start_retries=args.start_retries,
+        stopper=stopper,
+    )
+    succeeded = sum(1 for r in results if r.ok)
+    skipped = sum(1 for r in results if r.skipped)
+    failed = total - succeeded - skipped
+    evaluated = sum(1 for r in results if r.evaluated)
 
     print()
     print("Summary:")
-    print(f"  Started: {total}")
+    print(f"  Started: {total - skipped}")
     print(f"  Succeeded: {succeeded}")
     print(f"  Failed/timeout: {failed}")
+    if not args.dry_run:
+        # Only calls dialed in this invocation took wall-clock time; resumed and skipped entries did not.
+        dialed = sum(1 for r in results if not r.resumed and not r.skipped)
+        calls_per_hour = dialed * 3600 / stats.wall_sec if stats.wall_sec > 0 else 0.0
+        resumed = sum(1 for r in results if r.resumed)
+        print(f"  Evaluated: {evaluated}")
+        if resumed:
+            print(f"  Resumed from ledger (not re-dialed): {resumed}")
+        print(f"  Wall-clock: {stats.wall_sec / 60:.1f} min ({calls_per_hour:.1f} calls/hour)")
+        print(
+            f"  Stage time: calls {stats.call_sec / 60:.1f} min, post-call {stats.post_sec / 60:.1f} min, "
+            f"delays {stats.delay_sec / 60:.1f} min"
+        )
+        print(
+            f"  Overlap saved: {stats.overlap_saved_sec / 60:.1f} min "
+            f"(back-to-back would take {stats.serial_sec / 60:.1f} min)"
+        )
+        print(f"  Dialing: {limiter.describe()}")
+        cache = cache_stats()
+        if cache["hits"] or cache["misses"]:
+            print(f"  File cache: {cache['hits']} hit(s), {cache['misses']} miss(es), {cache['evictions']} eviction(s)")
+    if stopper.enabled and not args.dry_run:
+        for scenario_id in dict.fromkeys(sc.id for sc, _ in run_list):
+            planned = sum(1 for sc, _ in run_list if sc.id == scenario_id)
+            saved = sum(1 for r in results if r.skipped and r.scenario.id == scenario_id)
+            interval = stopper.describe(_scores_for(results, scenario_id, stopper.dimension))
+            reason = stats.early_stops.get(scenario_id)
+            print(f"  {scenario_id}: {interval}")
+            if reason:
+                print(f"    stopped early ({reason}); saved {saved} of {planned} call(s)")
     print(f"  Transcripts: {TRANSCRIPTS_DIR}")
+    if ledger is not None and (failed or evaluated < total - skipped):
+        print(f"  Resume with: python main.py --resume {ledger.run_id}")
+    if args.dry_run:
+        print_capacity_plan(
+            run_list,
+            concurrency=args.concurrency,
+            delay_sec=delay,
+            eval_workers=args.eval_workers,
+            calls_per_minute=args.calls_per_minute,
+            seed=args.seed,
+        )
     return 0 if failed == 0 else 1
 
 
@@ -0,0 +1,368 @@
+"""
+Append-only manifest of transcripts and reports, so lookups don't scan transcripts/.
+
+storage.py appends one JSON line to transcripts/.manifest.jsonl on every
+transcript save and patch (call id, scenario id / category / run_index,
+timestamps, ended_reason) and on every report save (report presence).
+Replaying the file gives the latest metadata per call; Manifest keeps that
+replay in memory with indexes by scenario, category and start time, and on
+each query reads only the lines appended since the previous one. Finding
+"all runs of scenario X" or "calls from last night" then costs O(matches)
+instead of opening every transcript.
+
+The file is derived data. A manifest that does not start with the header
+line written by rebuild() (e.g. it was created by an append before any
+rebuild) is rebuilt from the directories on first read, and it can be
+rebuilt by hand at any time:
+
+  python manifest.py rebuild
+  python manifest.py find --scenario office_info_hours_location
+  python manifest.py find --category scheduling --since 2026-02-17 --until 2026-02-18
+  python manifest.py find --ended-reason silence-timed-out --no-report
+
+Each line is a single O_APPEND write, so appends from several webhook worker
+processes and the runner do not interleave. Transcripts deleted by hand stay
+listed until the next rebuild; lines appended by other processes while a
+rebuild runs are lost, so rebuild while no calls are being saved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import copy
+import json
+import os
+import sys
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import json_codec
+from storage import REPORTS_DIR, TRANSCRIPTS_DIR, is_bench_call
+
+MANIFEST_PATH = TRANSCRIPTS_DIR / ".manifest.jsonl"
+MANIFEST_VERSION = 1
+
+TRANSCRIPT_FIELDS = ("scenario_id", "category", "run_index", "started_at", "ended_at", "webhook_received_at",
+                     "ended_reason")
+
+
+@dataclass
+class ManifestEntry:
+    """Latest known metadata of one call."""
+
+    call_id: str
+    scenario_id: Optional[str] = None
+    category: Optional[str] = None
+    run_index: Optional[int] = None
+    started_at: Optional[str] = None
+    ended_at: Optional[str] = None
+    webhook_received_at: Optional[str] = None
+    ended_reason: Optional[str] = None
+    has_transcript: bool = False
+    has_report: bool = False
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def parse_time(value: Any) -> Optional[float]:
+    """Epoch seconds for an ISO-8601 timestamp or date ("Z" suffix allowed; naive means UTC)."""
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def transcript_record(transcript: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Manifest line for a transcript dict (None without a call id)."""
+    call_id = transcript.get("call_id")
+    if not call_id:
+        return None
+    scenario = transcript.get("scenario") if isinstance(transcript.get("scenario"), dict) else {}
+    return {
+        "type": "transcript",
+        "call_id": str(call_id),
+        "scenario_id": scenario.get("id"),
+        "category": scenario.get("category"),
+        "run_index": scenario.get("run_index"),
+        "started_at": transcript.get("started_at"),
+        "ended_at": transcript.get("ended_at"),
+        "webhook_received_at": transcript.get("webhook_received_at"),
+        "ended_reason": transcript.get("ended_reason"),
+    }
+
+
+def report_record(call_id: str) -> Dict[str, Any]:
+    return {"type": "report", "call_id": str(call_id)}
+
+
+def append(record: Dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    """Append one record as a single write (atomic with O_APPEND across processes)."""
+    record.setdefault("ts", _now_iso())
+    line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def rebuild(
+    path: Path = MANIFEST_PATH, transcripts_dir: Path = TRANSCRIPTS_DIR, reports_dir: Path = REPORTS_DIR
+) -> Dict[str, int]:
+    """Regenerate the manifest from transcripts/ and reports/ (written to a temp file, then renamed)."""
+    from storage import load_transcript
+
+    counts = {"transcripts": 0, "reports": 0, "errors": 0}
+    lines = [{"type": "header", "version": MANIFEST_VERSION, "ts": _now_iso()}]
+    for transcript_file in sorted(transcripts_dir.glob("*.json")):
+        if is_bench_call(transcript_file.stem):
+            continue
+        try:
+            record = transcript_record(load_transcript(transcript_file))
+        except (OSError, ValueError, AttributeError):
+            record = None
+        if record is None:
+            counts["errors"] += 1
+            continue
+        lines.append(record)
+        counts["transcripts"] += 1
+    for report_file in sorted(reports_dir.glob("*.json")):
+        if is_bench_call(report_file.stem):
+            continue
+        lines.append(report_record(report_file.stem))
+        counts["reports"] += 1
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            for record in lines:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return counts
+
+
+class Manifest:
+    """In-memory replay of the manifest file with scenario, category and start-time indexes."""
+
+    def __init__(self, path: Path = MANIFEST_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._entries: Dict[str, ManifestEntry] = {}
+        self._by_scenario: Dict[str, Set[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._started: List[Tuple[float, str]] = []  # sorted (started_at epoch, call_id)
+        self._started_key: Dict[str, float] = {}
+
+    def refresh(self) -> None:
+        """Apply lines appended since the last read; start over if the file was replaced."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        if self._inode is None and not self._has_header():
+            rebuild(self.path)
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                self._reset()
+                self._inode = st.st_ino
+            if st.st_size == self._offset:
+                return
+            f.seek(self._offset)
+            chunk = f.read()
+        # Only whole lines: an append in flight is picked up next time.
+        end = chunk.rfind(b"\n") + 1
+        lines = chunk[:end].splitlines()
+        # A large catch-up (e.g. the first read) sorts the start-time index once instead of per line.
+        bulk = len(lines) > 64
+        for line in lines:
+            try:
+                record = json_codec.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                self._apply(record, bulk)
+        if bulk:
+            self._started = sorted((started, call_id) for call_id, started in self._started_key.items())
+        self._offset += end
+
+    def _has_header(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                first = json.loads(f.readline() or b"null")
+        except (OSError, ValueError):
+            return False
+        return isinstance(first, dict) and first.get("type") == "header"
+
+    def _apply(self, record: Dict[str, Any], bulk: bool = False) -> None:
+        kind, call_id = record.get("type"), record.get("call_id")
+        if kind not in ("transcript", "report") or not call_id:
+            return
+        entry = self._entries.get(call_id)
+        if entry is None:
+            entry = self._entries[call_id] = ManifestEntry(call_id=call_id)
+        if kind == "report":
+            entry.has_report = True
+            return
+        self._unindex(entry, bulk)
+        for name in TRANSCRIPT_FIELDS:
+            setattr(entry, name, record.get(name))
+        entry.has_transcript = True
+        if entry.scenario_id:
+            self._by_scenario.setdefault(entry.scenario_id, set()).add(call_id)
+        if entry.category:
+            self._by_category.setdefault(entry.category, set()).add(call_id)
+        started = parse_time(entry.started_at)
+        if started is not None:
+            if not bulk:
+                bisect.insort(self._started, (started, call_id))
+            self._started_key[call_id] = started
+
+    def _unindex(self, entry: ManifestEntry, bulk: bool = False) -> None:
+        if entry.scenario_id:
+            self._by_scenario.get(entry.scenario_id, set()).discard(entry.call_id)
+        if entry.category:
+            self._by_category.get(entry.category, set()).discard(entry.call_id)
+        started = self._started_key.pop(entry.call_id, None)
+        if started is not None and not bulk:
+            i = bisect.bisect_left(self._started, (started, entry.call_id))
+            if i < len(self._started) and self._started[i] == (started, entry.call_id):
+                del self._started[i]
+
+    def get(self, call_id: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            self._refresh()
+            return self._entries.get(call_id)
+
+    def find(
+        self,
+        scenario_id: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        ended_reason: Optional[str] = None,
+        has_report: Optional[bool] = None,
+    ) -> List[ManifestEntry]:
+        """
+        Calls with a transcript matching every given filter, oldest first.
+        since / until (datetime or ISO string) bound started_at: since <= started_at < until.
+        Work is proportional to the smallest indexed candidate set, not to the corpus.
+        """
+        lo, hi = parse_time(since), parse_time(until)
+        with self._lock:
+            self._refresh()
+            candidates: List[Iterable[str]] = []
+            if scenario_id is not None:
+                candidates.append(self._by_scenario.get(scenario_id, ()))
+            if category is not None:
+                candidates.append(self._by_category.get(category, ()))
+            if lo is not None or hi is not None:
+                start = bisect.bisect_left(self._started, (lo,)) if lo is not None else 0
+                stop = bisect.bisect_left(self._started, (hi,)) if hi is not None else len(self._started)
+                candidates.append([call_id for _, call_id in self._started[start:stop]])
+            if candidates:
+                ids: Iterable[str] = min(candidates, key=len)
+            else:
+                ids = list(self._entries)
+            out = []
+            for call_id in ids:
+                entry = self._entries[call_id]
+                if not entry.has_transcript:
+                    continue
+                if scenario_id is not None and entry.scenario_id != scenario_id:
+                    continue
+                if category is not None and entry.category != category:
+                    continue
+                if lo is not None or hi is not None:
+                    started = self._started_key.get(call_id)
+                    if started is None or (lo is not None and started < lo) or (hi is not None and started >= hi):
+                        continue
+                if ended_reason is not None and entry.ended_reason != ended_reason:
+                    continue
+                if has_report is not None and entry.has_report != has_report:
+                    continue
+                out.append(copy.copy(entry))
+            out.sort(key=lambda e: (self._started_key.get(e.call_id, float("inf")), e.call_id))
+        return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return sum(1 for e in self._entries.values() if e.has_transcript)
+
+
+_manifest: Optional[Manifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> Manifest:
+    """The process-wide Manifest for MANIFEST_PATH."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = Manifest()
+        return _manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manifest of transcripts and reports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Regenerate the manifest from transcripts/ and reports/")
+    p_find = sub.add_parser("find", help="List calls matching filters")
+    p_find.add_argument("--scenario", default=None)
+    p_find.add_argument("--category", default=None)
+    p_find.add_argument("--since", default=None, help="started_at >= this ISO date/time (UTC)")
+    p_find.add_argument("--until", default=None, help="started_at < this ISO date/time (UTC)")
+    p_find.add_argument("--ended-reason", default=None)
+    report = p_find.add_mutually_exclusive_group()
+    report.add_argument("--with-report", dest="has_report", action="store_const", const=True, default=None)
+    report.add_argument("--no-report", dest="has_report", action="store_const", const=False)
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        counts = rebuild()
+        print(f"Rebuilt {MANIFEST_PATH}: {counts['transcripts']} transcript(s), {counts['reports']} report(s)"
+              + (f" ({counts['errors']} unreadable)" if counts["errors"] else ""))
+        return 0
+    entries = get_manifest().find(
+        scenario_id=args.scenario,
+        category=args.category,
+        since=args.since,
+        until=args.until,
+        ended_reason=args.ended_reason,
+        has_report=args.has_report,
+    )
+    for e in entries:
+        print(f"  {e.call_id}  {e.started_at or '-':24}  {e.scenario_id or '-'} #{e.run_index or '-'}  "
+              f"{e.ended_reason or '-'}  {'report' if e.has_report else 'no report'}")
+    print(f"{len(entries)} call(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
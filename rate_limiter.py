@@ -0,0 +1,140 @@
+"""
+Adaptive rate limiting for Vapi call creation.
+
+AdaptiveRateLimiter is a token bucket (calls per minute) plus a cap on calls
+that are live at the provider. It adapts to what Vapi tells us: a rate-limit
+error halves the rate and pauses dialing (honouring Retry-After), a concurrency
+error lowers the cap to the number of calls that were live at the time, and
+successful starts slowly raise both back to the configured values (AIMD).
+
+backoff_delay() gives the jittered exponential wait between start-call retries.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Optional
+
+# Multiplicative decrease on a rate-limit error; the rate never drops below max_rate * MIN_RATE_FRACTION.
+RATE_DECREASE_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.125
+# Additive increase per successful start, as a fraction of the configured rate.
+RATE_INCREASE_FRACTION = 0.1
+# Successful starts needed before the concurrency cap is raised by one again.
+CAP_RECOVERY_SUCCESSES = 5
+
+DEFAULT_BACKOFF_BASE_SEC = 2.0
+DEFAULT_BACKOFF_MAX_SEC = 120.0
+
+
+def backoff_delay(
+    attempt: int,
+    base_sec: float = DEFAULT_BACKOFF_BASE_SEC,
+    max_sec: float = DEFAULT_BACKOFF_MAX_SEC,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Full-jitter exponential backoff for retry number `attempt` (0-based).
+
+    Returns a random delay in [0, min(max_sec, base_sec * 2**attempt)], but never
+    less than the server's Retry-After when one was given.
+    """
+    ceiling = min(max_sec, base_sec * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket + live-call cap that adapts to provider feedback.
+
+    calls_per_minute = 0 disables the token bucket; max_concurrent = 0 disables the
+    cap. Call acquire() before creating a call and release() once the call is over
+    (or its creation failed).
+    """
+
+    def __init__(self, calls_per_minute: float = 0.0, max_concurrent: int = 0, burst: int = 1) -> None:
+        self._cond = threading.Condition()
+        self.max_rate = max(0.0, calls_per_minute)
+        self.rate = self.max_rate
+        self.max_concurrent = max(0, max_concurrent)
+        self.concurrent_cap = self.max_concurrent
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._active = 0
+        self._successes_since_cap_drop = 0
+        self.throttle_events = 0
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self.rate / 60.0)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """Block until a call may be created, then count it as live."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                    continue
+                if self.concurrent_cap and self._active >= self.concurrent_cap:
+                    self._cond.wait()
+                    continue
+                if self.rate > 0 and self._tokens < 1:
+                    self._cond.wait((1 - self._tokens) * 60.0 / self.rate)
+                    continue
+                if self.rate > 0:
+                    self._tokens -= 1
+                self._active += 1
+                return
+
+    def release(self) -> None:
+        """A live call ended (or its creation failed); free its slot."""
+        with self._cond:
+            self._active = max(0, self._active - 1)
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        """A call was created: creep the rate and the cap back toward their configured values."""
+        with self._cond:
+            if self.max_rate > 0 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_INCREASE_FRACTION)
+            if self.max_concurrent and self.concurrent_cap < self.max_concurrent:
+                self._successes_since_cap_drop += 1
+                if self._successes_since_cap_drop >= CAP_RECOVERY_SUCCESSES:
+                    self.concurrent_cap += 1
+                    self._successes_since_cap_drop = 0
+            self._cond.notify_all()
+
+    def on_throttled(self, retry_after: Optional[float] = None, concurrency: bool = False) -> None:
+        """
+        Provider pushed back. Pause dialing for retry_after seconds (if given), halve
+        the rate, and on a concurrency error lower the cap to the calls live right now.
+        """
+        with self._cond:
+            self.throttle_events += 1
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if self.max_rate > 0:
+                self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate * RATE_DECREASE_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+            if concurrency:
+                self.concurrent_cap = max(1, self._active)
+                self._successes_since_cap_drop = 0
+            self._cond.notify_all()
+
+    def describe(self) -> str:
+        """One-line state for the run summary."""
+        with self._cond:
+            rate = f"{self.rate:.1f}/{self.max_rate:.1f} calls/min" if self.max_rate else "no rate limit"
+            cap = f"cap {self.concurrent_cap}/{self.max_concurrent}" if self.max_concurrent else "no cap"
+            return f"{rate}, {cap}, throttled {self.throttle_events}x"
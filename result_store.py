@@ -0,0 +1,481 @@
+"""
+Optional SQLite result store: calls, turns, reports, scores and issues in indexed tables.
+
+Enable it with RESULT_DB=<path> (e.g. results.sqlite3). storage.py then
+mirrors every transcript save / patch and every report save into the
+database, inside the same per-file lock as the JSON write. The JSON files
+stay the primary record: the webhook long-poll, dedup and evaluator work
+on them. The database is what analyses query:
+
+  python result_store.py import                          # backfill from transcripts/ + reports/
+  python result_store.py scores --dimension task_resolution --days 30
+  python result_store.py issues --severity major --days 7
+  python result_store.py export out/                     # JSON files back out of the database
+
+Tables are normalized (calls, turns, reports, scores, issues) and indexed by
+scenario id, category, run date, dimension and severity, so a per-scenario
+mean over tens of thousands of calls is an index scan rather than a JSON
+parse per file. The database runs in WAL mode, so the webhook server
+processes and the runner can write to it concurrently.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+RESULT_DB_ENV = "RESULT_DB"
+DEFAULT_DB_NAME = "results.sqlite3"
+# Seconds a writer waits for another process's transaction before giving up.
+BUSY_TIMEOUT_SEC = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    call_id             TEXT PRIMARY KEY,
+    scenario_id         TEXT,
+    category            TEXT,
+    scenario_name       TEXT,
+    run_index           INTEGER,
+    run_date            TEXT,
+    started_at          TEXT,
+    ended_at            TEXT,
+    ended_reason        TEXT,
+    recording_url       TEXT,
+    webhook_received_at TEXT,
+    turn_count          INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS calls_scenario ON calls (scenario_id, run_date, call_id);
+CREATE INDEX IF NOT EXISTS calls_category ON calls (category, run_date, call_id);
+CREATE INDEX IF NOT EXISTS calls_run_date ON calls (run_date, scenario_id, call_id);
+
+-- Full JSON documents for export, kept out of the queried tables so scans stay narrow.
+CREATE TABLE IF NOT EXISTS documents (
+    call_id TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    doc     TEXT NOT NULL,
+    UNIQUE (call_id, kind)
+);
+
+CREATE TABLE IF NOT EXISTS turns (
+    call_id    TEXT NOT NULL,
+    turn_index INTEGER NOT NULL,
+    speaker    TEXT,
+    role       TEXT,
+    text       TEXT,
+    PRIMARY KEY (call_id, turn_index)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reports (
+    call_id     TEXT PRIMARY KEY,
+    scenario_id TEXT,
+    summary     TEXT,
+    model       TEXT,
+    eval_sec    REAL
+) WITHOUT ROWID;
+
+-- scenario_id / category / run_date are copied from calls so score aggregates are one index scan.
+CREATE TABLE IF NOT EXISTS scores (
+    call_id     TEXT NOT NULL,
+    dimension   TEXT NOT NULL,
+    score       REAL,
+    reason      TEXT,
+    scenario_id TEXT,
+    category    TEXT,
+    run_date    TEXT,
+    PRIMARY KEY (call_id, dimension)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_dimension ON scores (dimension, run_date, scenario_id, score);
+CREATE INDEX IF NOT EXISTS scores_category ON scores (dimension, category, run_date, scenario_id, score);
+
+CREATE TABLE IF NOT EXISTS issues (
+    call_id     TEXT NOT NULL,
+    issue_index INTEGER NOT NULL,
+    type        TEXT,
+    severity    TEXT,
+    description TEXT,
+    turn_number INTEGER,
+    quote       TEXT,
+    PRIMARY KEY (call_id, issue_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS issues_severity ON issues (severity, type);
+"""
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _run_date(transcript: Dict[str, Any]) -> Optional[str]:
+    """YYYY-MM-DD (UTC) of the call, from started_at or the webhook arrival time."""
+    for key in ("started_at", "webhook_received_at", "ended_at"):
+        value = transcript.get(key)
+        if isinstance(value, str) and len(value) >= 10:
+            return value[:10]
+    return None
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultStore:
+    """SQLite mirror of transcripts and reports (one connection per thread)."""
+
+    def __init__(self, path: os.PathLike[str] | str) -> None:
+        self.path = Path(path)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SEC)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record_transcript(self, transcript: Dict[str, Any]) -> None:
+        """Insert or replace one call and its turns."""
+        call_id = transcript.get("call_id")
+        if not call_id:
+            return
+        scenario = transcript.get("scenario") if isinstance(transcript.get("scenario"), dict) else {}
+        artifact = transcript.get("artifact") if isinstance(transcript.get("artifact"), dict) else {}
+        turns = [t for t in transcript.get("turns") or [] if isinstance(t, dict)]
+        # Turns live in their own table; the doc keeps everything else for export.
+        doc = {k: v for k, v in transcript.items() if k != "turns"}
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO calls (call_id, scenario_id, category, scenario_name, run_index, run_date,
+                                   started_at, ended_at, ended_reason, recording_url, webhook_received_at,
+                                   turn_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (call_id) DO UPDATE SET
+                    scenario_id = COALESCE(excluded.scenario_id, calls.scenario_id),
+                    category = COALESCE(excluded.category, calls.category),
+                    scenario_name = COALESCE(excluded.scenario_name, calls.scenario_name),
+                    run_index = COALESCE(excluded.run_index, calls.run_index),
+                    run_date = COALESCE(excluded.run_date, calls.run_date),
+                    started_at = excluded.started_at,
+                    ended_at = excluded.ended_at,
+                    ended_reason = excluded.ended_reason,
+                    recording_url = excluded.recording_url,
+                    webhook_received_at = excluded.webhook_received_at,
+                    turn_count = excluded.turn_count
+                """,
+                (
+                    str(call_id),
+                    scenario.get("id"),
+                    scenario.get("category"),
+                    scenario.get("name"),
+                    _int_or_none(scenario.get("run_index")),
+                    _run_date(transcript),
+                    transcript.get("started_at"),
+                    transcript.get("ended_at"),
+                    transcript.get("ended_reason"),
+                    artifact.get("recording_url"),
+                    transcript.get("webhook_received_at"),
+                    len(turns),
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (call_id, kind, doc) VALUES (?, 'transcript', ?)",
+                (str(call_id), _dumps(doc)),
+            )
+            conn.execute(
+                "UPDATE scores SET (scenario_id, category, run_date) = "
+                "(SELECT scenario_id, category, run_date FROM calls WHERE calls.call_id = scores.call_id) "
+                "WHERE call_id = ?",
+                (str(call_id),),
+            )
+            conn.execute("DELETE FROM turns WHERE call_id = ?", (str(call_id),))
+            conn.executemany(
+                "INSERT INTO turns (call_id, turn_index, speaker, role, text) VALUES (?, ?, ?, ?, ?)",
+                [(str(call_id), i, t.get("speaker"), t.get("role"), t.get("text")) for i, t in enumerate(turns)],
+            )
+
+    def record_report(self, call_id: str, report: Dict[str, Any]) -> None:
+        """Insert or replace one evaluation report with its scores and issues."""
+        scenario = report.get("scenario") if isinstance(report.get("scenario"), dict) else {}
+        scenario_id = scenario.get("id") if scenario.get("id") not in (None, "unknown") else None
+        meta = report.get("eval_meta") if isinstance(report.get("eval_meta"), dict) else {}
+        scores = []
+        for dimension, value in (report.get("scores") or {}).items():
+            score = value.get("score") if isinstance(value, dict) else value
+            if isinstance(score, bool) or not isinstance(score, (int, float)):
+                score = None
+            reason = value.get("reason") if isinstance(value, dict) else None
+            scores.append((call_id, dimension, score, reason, call_id))
+        issues = [
+            (
+                call_id,
+                i,
+                issue.get("type"),
+                issue.get("severity"),
+                issue.get("description"),
+                _int_or_none(issue.get("turn_number")),
+                issue.get("quote"),
+            )
+            for i, issue in enumerate(report.get("issues") or [])
+            if isinstance(issue, dict)
+        ]
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (call_id, scenario_id, summary, model, eval_sec) VALUES (?, ?, ?, ?, ?)",
+                (call_id, scenario_id, report.get("summary"), meta.get("model"), meta.get("eval_sec")),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (call_id, kind, doc) VALUES (?, 'report', ?)",
+                (call_id, _dumps(report)),
+            )
+            # A report can land before (or without) the transcript row; make sure the call exists.
+            conn.execute(
+                "INSERT INTO calls (call_id, scenario_id, category, scenario_name) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (call_id) DO UPDATE SET scenario_id = COALESCE(calls.scenario_id, excluded.scenario_id)",
+                (call_id, scenario_id, scenario.get("category"), scenario.get("name")),
+            )
+            conn.execute("DELETE FROM scores WHERE call_id = ?", (call_id,))
+            conn.executemany(
+                "INSERT INTO scores (call_id, dimension, score, reason, scenario_id, category, run_date) "
+                "SELECT ?, ?, ?, ?, scenario_id, category, run_date FROM calls WHERE call_id = ?",
+                scores,
+            )
+            conn.execute("DELETE FROM issues WHERE call_id = ?", (call_id,))
+            conn.executemany(
+                "INSERT INTO issues (call_id, issue_index, type, severity, description, turn_number, quote) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                issues,
+            )
+
+    def mean_scores(
+        self,
+        dimension: str,
+        since: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Per scenario: number of calls, mean / min / max score on one dimension (run_date >= since)."""
+        where, params = ["dimension = ?", "score IS NOT NULL"], [dimension]
+        if since:
+            where.append("run_date >= ?")
+            params.append(since)
+        if category:
+            where.append("category = ?")
+            params.append(category)
+        rows = self._conn().execute(
+            f"""
+            SELECT scenario_id, COUNT(*) AS n, AVG(score) AS mean, MIN(score) AS min, MAX(score) AS max
+            FROM scores
+            WHERE {' AND '.join(where)}
+            GROUP BY scenario_id
+            ORDER BY scenario_id
+            """,
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def issue_counts(self, severity: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Issue counts by scenario, severity and type."""
+        where, params = ["1 = 1"], []
+        if severity:
+            where.append("i.severity = ?")
+            params.append(severity)
+        if since:
+            where.append("c.run_date >= ?")
+            params.append(since)
+        rows = self._conn().execute(
+            f"""
+            SELECT c.scenario_id AS scenario_id, i.severity AS severity, i.type AS type, COUNT(*) AS n
+            FROM issues i JOIN calls c ON c.call_id = i.call_id
+            WHERE {' AND '.join(where)}
+            GROUP BY c.scenario_id, i.severity, i.type
+            ORDER BY n DESC
+            """,
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def score_history(self) -> Dict[str, List[Dict[str, float]]]:
+        """scenario_id -> list of {dimension: score}, the shape score_stats.load_score_history() returns."""
+        by_call: Dict[str, Dict[str, float]] = {}
+        scenario_of: Dict[str, str] = {}
+        cursor = self._conn().cursor()
+        cursor.row_factory = None  # plain tuples: this can be hundreds of thousands of rows
+        rows = cursor.execute(
+            """
+            SELECT s.call_id, COALESCE(r.scenario_id, s.scenario_id), s.dimension, s.score
+            FROM scores s JOIN reports r ON r.call_id = s.call_id
+            WHERE s.score IS NOT NULL
+            """
+        )
+        for call_id, scenario_id, dimension, score in rows:
+            if not scenario_id:
+                continue
+            scenario_of[call_id] = scenario_id
+            by_call.setdefault(call_id, {})[dimension] = float(score)
+        history: Dict[str, List[Dict[str, float]]] = {}
+        for call_id in sorted(by_call):
+            history.setdefault(scenario_of[call_id], []).append(by_call[call_id])
+        return history
+
+    def iter_transcripts(self) -> Iterator[Dict[str, Any]]:
+        """Transcripts rebuilt from the calls and turns tables (for export)."""
+        conn = self._conn()
+        for row in conn.execute("SELECT call_id, doc FROM documents WHERE kind = 'transcript' ORDER BY call_id"):
+            doc = json.loads(row["doc"])
+            doc["turns"] = [
+                {"speaker": t["speaker"], "role": t["role"], "text": t["text"]}
+                for t in conn.execute(
+                    "SELECT speaker, role, text FROM turns WHERE call_id = ? ORDER BY turn_index", (row["call_id"],)
+                )
+            ]
+            yield doc
+
+    def iter_reports(self) -> Iterator[Dict[str, Any]]:
+        for row in self._conn().execute("SELECT doc FROM documents WHERE kind = 'report' ORDER BY call_id"):
+            yield json.loads(row["doc"])
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._conn()
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("calls", "turns", "reports", "scores", "issues")
+        }
+
+    def has_reports(self) -> bool:
+        """Whether any report has been recorded (False for a new or not yet imported database)."""
+        return self._conn().execute("SELECT 1 FROM reports LIMIT 1").fetchone() is not None
+
+    def optimize(self) -> None:
+        """Refresh the query planner's statistics (after a bulk import)."""
+        self._conn().execute("PRAGMA optimize")
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def default_db_path() -> Optional[Path]:
+    """Path from RESULT_DB, or None when the store is disabled."""
+    value = os.getenv(RESULT_DB_ENV, "").strip()
+    return Path(value) if value else None
+
+
+def get_store() -> Optional[ResultStore]:
+    """The process-wide store when RESULT_DB is set, else None."""
+    global _store
+    path = default_db_path()
+    if path is None:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != path:
+            _store = ResultStore(path)
+        return _store
+
+
+def _since(days: Optional[float]) -> Optional[str]:
+    if days is None:
+        return None
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def import_json(store: ResultStore, transcripts_dir: Path, reports_dir: Path) -> Dict[str, int]:
+    """Load every transcript and report JSON file into the store."""
+    import json_codec
+    from storage import is_bench_call, load_transcript
+
+    loaded = {"transcripts": 0, "reports": 0, "errors": 0}
+    for path in sorted(transcripts_dir.glob("*.json")):
+        if is_bench_call(path.stem):
+            continue
+        try:
+            store.record_transcript(load_transcript(path))
+            loaded["transcripts"] += 1
+        except (OSError, ValueError, AttributeError, sqlite3.Error) as e:
+            print(f"  skip {path.name}: {e}")
+            loaded["errors"] += 1
+    for path in sorted(reports_dir.glob("*.json")):
+        if is_bench_call(path.stem):
+            continue
+        try:
+            report = json_codec.load_file(path)
+            store.record_report(str(report.get("call_id") or path.stem), report)
+            loaded["reports"] += 1
+        except (OSError, ValueError, AttributeError, sqlite3.Error) as e:
+            print(f"  skip {path.name}: {e}")
+            loaded["errors"] += 1
+    store.optimize()
+    return loaded
+
+
+def export_json(store: ResultStore, out_dir: Path) -> Dict[str, int]:
+    """Write transcripts/ and reports/ JSON files under out_dir from the store."""
+    import json_codec
+
+    written = {"transcripts": 0, "reports": 0}
+    for sub, docs in (("transcripts", store.iter_transcripts()), ("reports", store.iter_reports())):
+        target = out_dir / sub
+        target.mkdir(parents=True, exist_ok=True)
+        for doc in docs:
+            json_codec.dump_file(target / f"{str(doc.get('call_id')).replace('/', '_')}.json", doc)
+            written[sub] += 1
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from storage import PROJECT_ROOT, REPORTS_DIR, TRANSCRIPTS_DIR
+
+    parser = argparse.ArgumentParser(description="SQLite result store: import, query and export results.")
+    parser.add_argument(
+        "--db", type=Path, default=None, help=f"Database file (default: ${RESULT_DB_ENV} or {DEFAULT_DB_NAME})"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("import", help="Load transcripts/ and reports/ into the database")
+    p_scores = sub.add_parser("scores", help="Mean score per scenario on one dimension")
+    p_scores.add_argument("--dimension", default="task_resolution")
+    p_scores.add_argument("--days", type=float, default=None, help="Only calls from the last N days")
+    p_scores.add_argument("--category", default=None)
+    p_issues = sub.add_parser("issues", help="Issue counts by scenario, severity and type")
+    p_issues.add_argument("--severity", default=None)
+    p_issues.add_argument("--days", type=float, default=None)
+    p_export = sub.add_parser("export", help="Write JSON files from the database")
+    p_export.add_argument("out_dir", type=Path)
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.db or default_db_path() or PROJECT_ROOT / DEFAULT_DB_NAME)
+    if args.command == "import":
+        loaded = import_json(store, TRANSCRIPTS_DIR, REPORTS_DIR)
+        print(f"Imported {loaded['transcripts']} transcript(s), {loaded['reports']} report(s) into {store.path}"
+              + (f" ({loaded['errors']} skipped)" if loaded["errors"] else ""))
+        print("  " + ", ".join(f"{table}: {n}" for table, n in store.counts().items()))
+    elif args.command == "scores":
+        rows = store.mean_scores(args.dimension, since=_since(args.days), category=args.category)
+        print(f"{args.dimension}" + (f", last {args.days:g} days" if args.days is not None else ""))
+        for row in rows:
+            print(f"  {row['scenario_id'] or '(none)'}: mean {row['mean']:.2f} (n={row['n']}, "
+                  f"min {row['min']:g}, max {row['max']:g})")
+    elif args.command == "issues":
+        for row in store.issue_counts(severity=args.severity, since=_since(args.days)):
+            print(f"  {row['n']:5d}  {row['severity'] or '-'}  {row['type'] or '-'}  {row['scenario_id'] or '(none)'}")
+    else:
+        written = export_json(store, args.out_dir)
+        print(f"Exported {written['transcripts']} transcript(s), {written['reports']} report(s) to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Append-only run ledger so an interrupted suite can be resumed.
+
+Every non-dry invocation of main.py gets a run id and a file runs/<run_id>.jsonl.
+The first line is a header with the arguments that built the run list; every
+following line is one state transition for one entry (by 1-based position):
+
+  queued -> dialed -> transcript -> evaluated
+        |         \\-> failed        \\-> eval_failed
+        \\-> skipped (early stopping decided the call was not needed)
+
+Replaying the file gives the latest state per entry. `--resume <run_id>` uses
+that to skip evaluated and skipped entries, re-evaluate the ones whose
+transcript landed but whose evaluation failed (or never ran), and dial
+everything else again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from storage import PROJECT_ROOT
+
+RUNS_DIR = PROJECT_ROOT / "runs"
+
+LEDGER_STATES = ("queued", "dialed", "transcript", "evaluated", "failed", "eval_failed", "skipped")
+
+
+@dataclass
+class LedgerEntry:
+    """Latest known state of one entry of the run list."""
+
+    position: int
+    scenario_id: Optional[str] = None
+    run_index: int = 1
+    state: str = "queued"
+    call_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def new_run_id() -> str:
+    """Sortable, filename-safe run id, e.g. 20261017T101500Z-3f9a1c (random suffix: runs started in the same second)."""
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid.uuid4().hex[:6]}"
+
+
+class RunLedger:
+    """Thread-safe writer/reader for runs/<run_id>.jsonl."""
+
+    def __init__(self, run_id: str, path: Path) -> None:
+        self.run_id = run_id
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, header: Dict[str, Any], run_id: Optional[str] = None) -> "RunLedger":
+        """Start a new ledger with the given header (mode, scenario, variant, runs, ...)."""
+        RUNS_DIR.mkdir(parents=True, exist_ok=True)
+        for _ in range(5):
+            ledger_id = run_id or new_run_id()
+            path = RUNS_DIR / f"{ledger_id}.jsonl"
+            try:
+                # Exclusive create: two runners can never share a ledger.
+                path.open("x", encoding="utf-8").close()
+            except FileExistsError:
+                if run_id:
+                    raise FileExistsError(f"Run ledger already exists: {path}")
+                continue
+            ledger = cls(ledger_id, path)
+            ledger._append({"type": "header", "run_id": ledger_id, **header})
+            return ledger
+        raise FileExistsError(f"Could not pick an unused run id in {RUNS_DIR}")
+
+    @classmethod
+    def open(cls, run_id: str) -> "RunLedger":
+        """Open an existing ledger for resume. Raises FileNotFoundError if missing."""
+        path = RUNS_DIR / f"{run_id}.jsonl"
+        if not path.exists():
+            raise FileNotFoundError(f"No run ledger for run id '{run_id}' ({path})")
+        return cls(run_id, path)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        record.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                # The point of the ledger is to survive crashes; make each transition durable.
+                os.fsync(f.fileno())
+
+    def record(
+        self,
+        position: int,
+        state: str,
+        scenario_id: Optional[str] = None,
+        run_index: Optional[int] = None,
+        call_id: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Append one state transition for the entry at `position`."""
+        if state not in LEDGER_STATES:
+            raise ValueError(f"Unknown ledger state '{state}'")
+        record: Dict[str, Any] = {"type": "state", "position": position, "state": state}
+        if scenario_id is not None:
+            record["scenario_id"] = scenario_id
+        if run_index is not None:
+            record["run_index"] = run_index
+        if call_id is not None:
+            record["call_id"] = call_id
+        if error is not None:
+            record["error"] = error
+        self._append(record)
+
+    def _records(self):
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn last line; everything before it is still valid.
+                    continue
+
+    def header(self) -> Dict[str, Any]:
+        """The header line written by create()."""
+        for rec in self._records():
+            if rec.get("type") == "header":
+                return rec
+        raise ValueError(f"Run ledger {self.path} has no header")
+
+    def entries(self) -> Dict[int, LedgerEntry]:
+        """Replay the ledger: latest state per position (call_id sticks once known)."""
+        out: Dict[int, LedgerEntry] = {}
+        for rec in self._records():
+            if rec.get("type") != "state":
+                continue
+            position = int(rec["position"])
+            entry = out.get(position) or LedgerEntry(position=position)
+            entry.state = rec.get("state", entry.state)
+            entry.scenario_id = rec.get("scenario_id", entry.scenario_id)
+            entry.run_index = rec.get("run_index", entry.run_index)
+            entry.call_id = rec.get("call_id") or entry.call_id
+            entry.error = rec.get("error")
+            out[position] = entry
+        return out
@@ -0,0 +1,355 @@
+"""
+Columnar archive of judge scores for fast cross-run analytics.
+
+Every save_evaluation_report() appends one fixed-width record to
+reports/.scores/tail.rec: call id, scenario index, run date (days since
+1970-01-01, UTC) and one int8 per dimension in DIMENSION_KEYS order (-1 when
+the judge gave no number). Appending needs only the standard library. When
+the tail reaches SHARD_ROWS records it is sealed into a columnar shard
+directory of NumPy .npy files (call_id / scenario / run_date / scores).
+Sealing, and reading the archive, need numpy.
+
+load_archive() memory-maps the shards and the tail, so the scores of 100k
+reports cost a handful of file opens instead of 100k JSON parses:
+
+  python score_archive.py rebuild     # (re)create from reports/*.json
+  python score_archive.py compact     # merge all shards + tail into one shard
+  python score_archive.py stats       # mean score per scenario and dimension
+
+Scenario ids are mapped to small integers through scenarios.txt (line number =
+index). Re-evaluating a call appends a new record; load_archive() keeps the
+latest record per call id.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import struct
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from evaluator import DIMENSION_KEYS
+from storage import REPORTS_DIR, file_lock
+
+ARCHIVE_DIR = REPORTS_DIR / ".scores"
+SCORE_ARCHIVE_ENV = "SCORE_ARCHIVE"
+# Records per sealed shard.
+SHARD_ROWS = 65_536
+CALL_ID_BYTES = 64
+MISSING_SCORE = -1
+FORMAT_VERSION = 1
+
+# call_id, scenario index, run date, one int8 per dimension; little-endian, unpadded.
+_RECORD = struct.Struct(f"<{CALL_ID_BYTES}shi{len(DIMENSION_KEYS)}b")
+_EPOCH = date(1970, 1, 1)
+_COLUMNS = ("call_id", "scenario", "run_date", "scores")
+
+
+def enabled() -> bool:
+    return os.getenv(SCORE_ARCHIVE_ENV, "1").strip().lower() not in ("0", "false", "no")
+
+
+def _record_dtype():
+    import numpy as np
+
+    return np.dtype(
+        [
+            ("call_id", f"S{CALL_ID_BYTES}"),
+            ("scenario", "<i2"),
+            ("run_date", "<i4"),
+            ("scores", "i1", (len(DIMENSION_KEYS),)),
+        ]
+    )
+
+
+def _score_byte(value: Any) -> int:
+    score = value.get("score") if isinstance(value, dict) else value
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        return MISSING_SCORE
+    return max(-128, min(127, int(round(score))))
+
+
+class _Layout:
+    """Paths inside one archive directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.tail = root / "tail.rec"
+        self.scenarios = root / "scenarios.txt"
+        self.meta = root / "meta.json"
+
+    def shards(self) -> List[Path]:
+        return sorted(p for p in self.root.glob("shard-*") if p.is_dir())
+
+    def check_meta(self) -> None:
+        """Create meta.json on first use; refuse an archive written with other dimensions."""
+        meta = {"version": FORMAT_VERSION, "dimensions": DIMENSION_KEYS, "call_id_bytes": CALL_ID_BYTES}
+        if not self.meta.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            self.meta.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+            return
+        existing = json.loads(self.meta.read_text(encoding="utf-8"))
+        if existing != meta:
+            raise ValueError(
+                f"score archive {self.root} was written for {existing.get('dimensions')}; "
+                "run `python score_archive.py rebuild`"
+            )
+
+    def read_scenarios(self) -> List[str]:
+        try:
+            return self.scenarios.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+
+    def scenario_index(self, scenario_id: str) -> int:
+        """Index of scenario_id, appending it to scenarios.txt if new (caller holds the lock)."""
+        known = self.read_scenarios()
+        if scenario_id in known:
+            return known.index(scenario_id)
+        with self.scenarios.open("a", encoding="utf-8") as f:
+            f.write(scenario_id + "\n")
+        return len(known)
+
+
+def _pack(layout: _Layout, call_id: str, report: Dict[str, Any], run_date: Optional[date]) -> bytes:
+    scenario = report.get("scenario") if isinstance(report.get("scenario"), dict) else {}
+    scores = report.get("scores") or {}
+    day = run_date or datetime.now(timezone.utc).date()
+    return _RECORD.pack(
+        call_id.encode("utf-8")[:CALL_ID_BYTES],
+        layout.scenario_index(str(scenario.get("id") or "unknown")),
+        (day - _EPOCH).days,
+        *(_score_byte(scores.get(key)) for key in DIMENSION_KEYS),
+    )
+
+
+def append_report(
+    call_id: str, report: Dict[str, Any], run_date: Optional[date] = None, root: Path = ARCHIVE_DIR
+) -> None:
+    """Append one report's scores (run_date defaults to today, UTC). Seals a shard when the tail is full."""
+    layout = _Layout(root)
+    with file_lock(layout.tail):
+        layout.check_meta()
+        record = _pack(layout, call_id, report, run_date)
+        with layout.tail.open("ab") as f:
+            size = f.tell()
+            if size % _RECORD.size:
+                # A torn record from a crashed writer: drop it before appending.
+                f.truncate(size - size % _RECORD.size)
+                f.seek(0, os.SEEK_END)
+            f.write(record)
+            rows = f.tell() // _RECORD.size
+        if rows >= SHARD_ROWS:
+            try:
+                _seal_tail(layout)
+            except ImportError:
+                pass  # without numpy the tail keeps growing; still readable once numpy is there
+
+
+def _write_shard(layout: _Layout, columns: Dict[str, Any]) -> Path:
+    """Write columns as a new shard-NNNNNN directory (tmp dir + rename, so readers never see half of it)."""
+    import numpy as np
+
+    existing = [int(p.name.split("-")[1]) for p in layout.shards()]
+    final = layout.root / f"shard-{(max(existing) + 1 if existing else 1):06d}"
+    tmp = layout.root / f".{final.name}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name in _COLUMNS:
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(columns[name]))
+    os.replace(tmp, final)
+    return final
+
+
+def _read_tail(layout: _Layout):
+    import numpy as np
+
+    try:
+        size = layout.tail.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    rows = size // _RECORD.size
+    if rows == 0:
+        return np.zeros(0, dtype=_record_dtype())
+    return np.memmap(layout.tail, dtype=_record_dtype(), mode="r", shape=(rows,))
+
+
+def _seal_tail(layout: _Layout) -> None:
+    """Move the tail's records into a new columnar shard (caller holds the lock)."""
+    tail = _read_tail(layout)
+    if len(tail) == 0:
+        return
+    _write_shard(layout, {name: tail[name] for name in _COLUMNS})
+    del tail
+    # A crash before this truncate leaves the rows twice; load_archive() keeps one per call id.
+    with layout.tail.open("r+b") as f:
+        f.truncate(0)
+
+
+@dataclass
+class ScoreArchive:
+    """Column arrays for every archived report (memory-mapped when read from a single shard)."""
+
+    call_ids: Any      # (n,) bytes
+    scenario: Any      # (n,) int16 index into scenarios
+    run_date: Any      # (n,) datetime64[D]
+    scores: Any        # (n, len(dimensions)) int8, -1 = missing
+    scenarios: List[str]
+    dimensions: List[str]
+
+    def __len__(self) -> int:
+        return len(self.call_ids)
+
+    def column(self, dimension: str):
+        """One dimension's scores as float64 with NaN for missing."""
+        import numpy as np
+
+        col = self.scores[:, self.dimensions.index(dimension)].astype(np.float64)
+        col[col < 0] = np.nan
+        return col
+
+    def mean_by_scenario(self, dimension: str, since: Optional[date] = None) -> Dict[str, Dict[str, float]]:
+        """scenario_id -> {"n", "mean"} for one dimension (optionally only run_date >= since)."""
+        import numpy as np
+
+        values = self.column(dimension)
+        keep = ~np.isnan(values)
+        if since is not None:
+            keep &= self.run_date >= np.datetime64(since, "D")
+        idx = self.scenario[keep].astype(np.int64)
+        vals = values[keep]
+        counts = np.bincount(idx, minlength=len(self.scenarios))
+        sums = np.bincount(idx, weights=vals, minlength=len(self.scenarios))
+        return {
+            self.scenarios[i]: {"n": int(counts[i]), "mean": float(sums[i] / counts[i])}
+            for i in range(len(self.scenarios))
+            if counts[i]
+        }
+
+
+def load_archive(root: Path = ARCHIVE_DIR, dedupe: bool = True) -> ScoreArchive:
+    """
+    Memory-map every shard and the tail. With dedupe, only the latest record per
+    call id is kept (that makes a copy; a single compacted shard without
+    re-evaluations stays memory-mapped).
+    """
+    import numpy as np
+
+    layout = _Layout(root)
+    if layout.meta.exists():
+        layout.check_meta()
+    parts: Dict[str, List[Any]] = {name: [] for name in _COLUMNS}
+    for shard in layout.shards():
+        for name in _COLUMNS:
+            parts[name].append(np.load(shard / f"{name}.npy", mmap_mode="r"))
+    tail = _read_tail(layout)
+    if len(tail):
+        for name in _COLUMNS:
+            parts[name].append(tail[name])
+    dtype = _record_dtype()
+    columns = {}
+    for name in _COLUMNS:
+        if len(parts[name]) == 1:
+            columns[name] = parts[name][0]
+        elif parts[name]:
+            columns[name] = np.concatenate(parts[name])
+        else:
+            columns[name] = np.zeros((0,) + dtype[name].shape, dtype=dtype[name].base)
+    if dedupe and len(columns["call_id"]):
+        # np.unique keeps the first occurrence; look from the end so the newest record wins.
+        reversed_ids = columns["call_id"][::-1]
+        _, first = np.unique(reversed_ids, return_index=True)
+        if len(first) != len(reversed_ids):
+            keep = np.sort(len(reversed_ids) - 1 - first)
+            columns = {name: columns[name][keep] for name in _COLUMNS}
+    return ScoreArchive(
+        call_ids=columns["call_id"],
+        scenario=columns["scenario"],
+        run_date=columns["run_date"].astype("datetime64[D]"),
+        scores=columns["scores"],
+        scenarios=layout.read_scenarios(),
+        dimensions=list(DIMENSION_KEYS),
+    )
+
+
+def compact(root: Path = ARCHIVE_DIR) -> int:
+    """Merge all shards and the tail into one deduplicated shard. Returns its row count."""
+    layout = _Layout(root)
+    with file_lock(layout.tail):
+        old = layout.shards()
+        archive = load_archive(root)
+        columns = {
+            "call_id": archive.call_ids,
+            "scenario": archive.scenario,
+            "run_date": archive.run_date.astype("<i4"),  # back to days since the epoch
+            "scores": archive.scores,
+        }
+        new = _write_shard(layout, columns) if len(archive) else None
+        for shard in old:
+            shutil.rmtree(shard)
+        with layout.tail.open("ab") as f:
+            f.truncate(0)
+        return len(archive) if new else 0
+
+
+def rebuild(reports_dir: Path = REPORTS_DIR, root: Path = ARCHIVE_DIR) -> int:
+    """Recreate the archive from reports/*.json. Run dates come from the report file's mtime."""
+    import json_codec
+
+    shutil.rmtree(root, ignore_errors=True)
+    layout = _Layout(root)
+    count = 0
+    with file_lock(layout.tail):
+        layout.check_meta()
+        with layout.tail.open("ab") as f:
+            for path in sorted(reports_dir.glob("*.json"), key=lambda p: p.stat().st_mtime):
+                try:
+                    report = json_codec.load_file(path)
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(report, dict):
+                    continue
+                day = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).date()
+                f.write(_pack(layout, str(report.get("call_id") or path.stem), report, day))
+                count += 1
+    compact(root)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Columnar score archive for reports/.")
+    parser.add_argument("command", choices=["rebuild", "compact", "stats"])
+    parser.add_argument("--days", type=float, default=None, help="stats: only reports from the last N days")
+    args = parser.parse_args(argv)
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Error: the score archive needs numpy (pip install numpy)", file=sys.stderr)
+        return 1
+
+    if args.command == "rebuild":
+        print(f"Archived {rebuild()} report(s) into {ARCHIVE_DIR}")
+    elif args.command == "compact":
+        print(f"Compacted {compact()} row(s) into one shard")
+    else:
+        from datetime import timedelta
+
+        archive = load_archive()
+        since = datetime.now(timezone.utc).date() - timedelta(days=args.days) if args.days is not None else None
+        print(f"{len(archive)} report(s), {len(archive.scenarios)} scenario(s)")
+        for dimension in archive.dimensions:
+            print(f"{dimension}:")
+            for scenario_id, row in sorted(archive.mean_by_scenario(dimension, since).items()):
+                print(f"  {scenario_id}: {row['mean']:.2f} (n={row['n']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
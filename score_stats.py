@@ -0,0 +1,174 @@
+"""
+Score history and summary statistics over saved evaluation reports.
+
+Reads reports/*.json, groups the judge's per-dimension scores by scenario id
+(falling back to the transcript's scenario block when the report lacks one)
+and summarizes them per scenario and dimension. Used by the adaptive
+scheduler to decide where more calls buy the most certainty, and by early
+stopping to put a confidence interval on a scenario's mean score.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from evaluator import DIMENSION_KEYS
+from result_store import get_store
+from storage import REPORTS_DIR, TRANSCRIPTS_DIR, load_evaluation_report, load_transcript
+
+
+@dataclass
+class ScenarioScoreStats:
+    """Per-dimension sample statistics for one scenario."""
+
+    scenario_id: str
+    n: int = 0
+    means: Dict[str, float] = field(default_factory=dict)
+    variances: Dict[str, Optional[float]] = field(default_factory=dict)  # None when n < 2
+
+
+def _scenario_id_for_report(report: Dict, call_id: Optional[str]) -> Optional[str]:
+    scenario = report.get("scenario")
+    scenario_id = scenario.get("id") if isinstance(scenario, dict) else None
+    if scenario_id and scenario_id != "unknown":
+        return scenario_id
+    if not call_id:
+        return None
+    path = TRANSCRIPTS_DIR / f"{call_id}.json"
+    try:
+        transcript_scenario = load_transcript(path).get("scenario") or {}
+    except (OSError, ValueError):
+        return None
+    return transcript_scenario.get("id") if isinstance(transcript_scenario, dict) else None
+
+
+def report_scores(report: Dict) -> Dict[str, float]:
+    """Numeric score per dimension from a report (dimensions without a number are left out)."""
+    out: Dict[str, float] = {}
+    for key, val in (report.get("scores") or {}).items():
+        score = val.get("score") if isinstance(val, dict) else val
+        if isinstance(score, (int, float)) and not isinstance(score, bool):
+            out[key] = float(score)
+    return out
+
+
+_warned_empty_store = False
+
+
+def _warn_empty_store(path: Path) -> None:
+    global _warned_empty_store
+    if not _warned_empty_store:
+        _warned_empty_store = True
+        print(f"  WARN: result store {path} has no reports; reading reports/ instead "
+              f"(run `python result_store.py import` to backfill it)")
+
+
+def load_score_history(reports_dir: Path = REPORTS_DIR) -> Dict[str, List[Dict[str, float]]]:
+    """
+    scenario_id -> list of {dimension: score}, one entry per evaluated call.
+    Read from the SQLite result store when RESULT_DB is set and it holds reports,
+    else from reports/*.json.
+    """
+    store = get_store() if reports_dir == REPORTS_DIR else None
+    if store is not None:
+        if store.has_reports():
+            return store.score_history()
+        _warn_empty_store(store.path)
+    history: Dict[str, List[Dict[str, float]]] = {}
+    for path in sorted(reports_dir.glob("*.json")):
+        try:
+            report = load_evaluation_report(path)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(report, dict):
+            continue
+        scenario_id = _scenario_id_for_report(report, report.get("call_id") or path.stem)
+        scores = report_scores(report)
+        if scenario_id and scores:
+            history.setdefault(scenario_id, []).append(scores)
+    return history
+
+
+def summarize_scores(
+    scenario_id: str, samples: List[Dict[str, float]], dimensions: List[str] = DIMENSION_KEYS
+) -> ScenarioScoreStats:
+    """Mean and sample variance per dimension for one scenario's calls."""
+    stats = ScenarioScoreStats(scenario_id=scenario_id, n=len(samples))
+    for dim in dimensions:
+        values = [s[dim] for s in samples if dim in s]
+        if values:
+            stats.means[dim] = statistics.fmean(values)
+        stats.variances[dim] = statistics.variance(values) if len(values) >= 2 else None
+    return stats
+
+
+# Below this df the Cornish-Fisher series is refined with Newton steps on the exact CDF.
+_T_REFINE_BELOW_DF = 10
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """Exact CDF of Student's t for integer df (Abramowitz & Stegun 26.7.3/26.7.4)."""
+    theta = math.atan(t / math.sqrt(df))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if df % 2:
+        series, term = 0.0, math.cos(theta)
+        for k in range(1, df - 1, 2):
+            if k > 1:
+                term *= cos2 * (k - 1) / k
+            series += term
+        a = 2 / math.pi * (theta + sin * series)
+    else:
+        series, term = 1.0, 1.0
+        for k in range(2, df - 1, 2):
+            term *= cos2 * (k - 1) / k
+            series += term
+        a = sin * series
+    return 0.5 + a / 2
+
+
+def _t_pdf(t: float, df: int) -> float:
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    return math.exp(log_norm - (df + 1) / 2 * math.log1p(t * t / df))
+
+
+def t_quantile(p: float, df: int) -> float:
+    """
+    Quantile of Student's t distribution (no scipy). Closed forms for df = 1 and 2;
+    otherwise a Cornish-Fisher expansion around the normal quantile, refined by
+    Newton steps on the exact CDF for df < 10. Within 0.03% of exact for
+    0.0005 <= p <= 0.9995 at any df.
+    """
+    if df < 1:
+        raise ValueError("df must be >= 1")
+    if df == 1:
+        # Cauchy: exact closed form.
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    t = z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+    if df < _T_REFINE_BELOW_DF:
+        for _ in range(8):
+            step = (_t_cdf(t, df) - p) / _t_pdf(t, df)
+            t -= step
+            if abs(step) <= 1e-12 * max(1.0, abs(t)):
+                break
+    return t
+
+
+def mean_confidence_interval(values: List[float], confidence: float = 0.9) -> Optional[Tuple[float, float, float]]:
+    """(mean, low, high) two-sided t interval for the mean, or None with fewer than 2 values."""
+    if len(values) < 2:
+        return None
+    mean = statistics.fmean(values)
+    sem = (statistics.variance(values) / len(values)) ** 0.5
+    half = t_quantile(0.5 + confidence / 2, len(values) - 1) * sem
+    return mean, mean - half, mean + half
@@ -3,20 +3,187 @@ Save structured transcripts and evaluation reports to local JSON files.
 
 Phase 3.3: implement helpers to write normalized transcript dicts into the
 `transcripts/` directory with a clear naming convention.
+
+Serialization goes through json_codec (orjson when installed, compact on
+disk; `python json_codec.py pretty <file>` for reading by hand).
+
+Every write is a temp file + fsync + atomic rename (json_codec.dump_file), so
+a reader never sees half a file. Read-modify-write helpers hold a per-file
+lock (a striped thread lock plus an flock on the matching one of 64 stripe
+files in transcripts/.locks/) so a webhook server with several worker
+processes and a patching runner don't lose each other's updates.
+
+update_transcript(call_id, **fields) applies any set of metadata patches in
+one load + write and returns the result, so callers never re-read what they
+just wrote. With pending=True a patch for a transcript that does not exist yet
+is parked in transcripts/.pending/ and merged in by save_transcript() when the
+webhook delivers the file.
+
+With RESULT_DB set, every transcript and report write is mirrored into the
+SQLite result store (result_store.py) under the same lock; the JSON files
+stay the primary record. Report scores are also appended to the columnar
+score archive (score_archive.py) unless SCORE_ARCHIVE=0. Every save and
+patch also appends a line to the manifest (manifest.py), which answers
+"which calls match" without opening the transcripts.
+
+Transcripts can be stored compressed (STORAGE_COMPRESSION=gzip|lzma|zstd) and
+with artifact.raw_transcript stored by reference to the turns it duplicates
+(STORAGE_RAW_TRANSCRIPT=ref; only when the text rebuilds exactly). The file
+name stays <call_id>.json and load_transcript() undoes both, so callers do
+not notice. Convert existing files, and see the size and load-time effect:
+
+  python storage.py migrate --compression gzip --raw-transcript ref
+
+iter_transcripts() / iter_reports() stream the corpus one document at a time,
+with filters pushed down to the manifest (only matching files are opened),
+optional projection to a few top-level fields and optional parsing in a
+process pool.
+
+load_transcript() and load_evaluation_report() go through a bounded LRU
+(file_cache.py, STORAGE_CACHE_SIZE entries) that re-validates every hit
+against the file's inode, mtime and size, and the writers here invalidate
+what they replace. The returned dicts are shared: do not mutate them.
 """
 
 from __future__ import annotations
 
-import json
+import argparse
 import os
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
+import json_codec
+from file_cache import DEFAULT_CAPACITY, FileCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread locks only (single process)
+    fcntl = None
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 TRANSCRIPTS_DIR = PROJECT_ROOT / "transcripts"
 REPORTS_DIR = PROJECT_ROOT / "reports"
+LOCKS_DIR = TRANSCRIPTS_DIR / ".locks"
+PENDING_DIR = TRANSCRIPTS_DIR / ".pending"
+
+COMPRESSION_ENV = "STORAGE_COMPRESSION"
+RAW_TRANSCRIPT_ENV = "STORAGE_RAW_TRANSCRIPT"
+CACHE_SIZE_ENV = "STORAGE_CACHE_SIZE"
+# Call ids webhook_bench.py gives its synthetic deliveries; kept out of the result store,
+# score archive and manifest so benchmarks never show up in analytics.
+BENCH_CALL_PREFIX = "bench-"
+# How Vapi labels each turn role in artifact.transcript ("AI: ...\nUser: ...").
+RAW_TRANSCRIPT_LABELS = {"bot": "AI", "user": "User"}
+
+# Striped in-process locks (flock alone does not order threads sharing a lock file reliably).
+_THREAD_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _cache_capacity() -> int:
+    try:
+        return int(os.getenv(CACHE_SIZE_ENV, str(DEFAULT_CAPACITY)))
+    except ValueError:
+        return DEFAULT_CAPACITY
+
+
+_cache = FileCache(_cache_capacity())
+
+
+@contextmanager
+def file_lock(path: os.PathLike[str] | str) -> Iterator[None]:
+    """Exclusive lock for one data file, across threads and processes on this host."""
+    p = Path(path)
+    stripe = zlib.crc32(f"{p.parent.name}-{p.name}".encode("utf-8")) % len(_THREAD_LOCKS)
+    with _THREAD_LOCKS[stripe]:
+        if fcntl is None:
+            yield
+            return
+        LOCKS_DIR.mkdir(parents=True, exist_ok=True)
+        # A fixed set of lock files, one per stripe, so .locks/ does not grow with the data.
+        with (LOCKS_DIR / f"stripe-{stripe:02d}.lock").open("a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def is_bench_call(call_id: Any) -> bool:
+    return isinstance(call_id, str) and call_id.startswith(BENCH_CALL_PREFIX)
+
+
+def _mirror_transcript(transcript: Dict[str, Any]) -> None:
+    """Copy a transcript into the SQLite result store when RESULT_DB is set."""
+    import result_store
+
+    if is_bench_call(transcript.get("call_id")):
+        return
+    try:
+        store = result_store.get_store()
+        if store is not None:
+            store.record_transcript(transcript)
+    except Exception as e:
+        # The JSON file is already written; `python result_store.py import` can catch up.
+        print(f"[storage] WARN: result store not updated for call_id={transcript.get('call_id')}: {e}")
+
+
+def _mirror_report(call_id: str, report: Dict[str, Any]) -> None:
+    """Copy an evaluation report into the SQLite result store when RESULT_DB is set."""
+    import result_store
+
+    if is_bench_call(call_id):
+        return
+    try:
+        store = result_store.get_store()
+        if store is not None:
+            store.record_report(call_id, report)
+    except Exception as e:
+        print(f"[storage] WARN: result store not updated for report {call_id}: {e}")
+
+
+def _archive_scores(call_id: str, report: Dict[str, Any]) -> None:
+    """Append the report's scores to the columnar score archive (score_archive.py)."""
+    import score_archive
+
+    if not score_archive.enabled() or is_bench_call(call_id):
+        return
+    try:
+        score_archive.append_report(call_id, report)
+    except Exception as e:
+        # `python score_archive.py rebuild` recreates the archive from reports/.
+        print(f"[storage] WARN: score archive not updated for report {call_id}: {e}")
+
+
+def _index_record(record: Optional[Dict[str, Any]]) -> None:
+    """Append a transcript / report line to the manifest (manifest.py)."""
+    import manifest
+
+    if record is None or is_bench_call(record.get("call_id")):
+        return
+    try:
+        manifest.append(record)
+    except OSError as e:
+        # `python manifest.py rebuild` regenerates it from the files.
+        print(f"[storage] WARN: manifest not updated for call_id={record.get('call_id')}: {e}")
+
+
+def _index_transcript(transcript: Dict[str, Any]) -> None:
+    import manifest
+
+    _index_record(manifest.transcript_record(transcript))
+
+
+def _index_report(call_id: str) -> None:
+    import manifest
+
+    _index_record(manifest.report_record(call_id))
 
 
 def _ensure_transcripts_dir() -> None:
@@ -40,19 +207,104 @@ def _default_filename_for_transcript(transcript: Dict[str, Any]) -> str:
     return f"call_{ts}.json"
 
 
+def transcript_path(call_id: str) -> Path:
+    """Path where the transcript for call_id is (or will be) saved."""
+    return TRANSCRIPTS_DIR / _default_filename_for_transcript({"call_id": call_id})
+
+
+def transcript_compression() -> str:
+    """Compression for newly written transcripts (STORAGE_COMPRESSION, default none)."""
+    method = os.getenv(COMPRESSION_ENV, "none").strip().lower() or "none"
+    return method if method in json_codec.COMPRESSIONS else "none"
+
+
+def raw_transcript_by_ref() -> bool:
+    return os.getenv(RAW_TRANSCRIPT_ENV, "inline").strip().lower() == "ref"
+
+
+def _raw_from_turns(turns: Any) -> Optional[str]:
+    """Rebuild Vapi's raw transcript text from turns, or None if a role has no known label."""
+    lines = []
+    for turn in turns or []:
+        label = RAW_TRANSCRIPT_LABELS.get(turn.get("role")) if isinstance(turn, dict) else None
+        if label is None:
+            return None
+        lines.append(f"{label}: {turn.get('text') or ''}")
+    return "\n".join(lines)
+
+
+def _encode_transcript(transcript: Dict[str, Any], by_ref: bool) -> Dict[str, Any]:
+    """On-disk form: raw_transcript replaced by a reference when the turns rebuild it exactly."""
+    artifact = transcript.get("artifact")
+    raw = artifact.get("raw_transcript") if isinstance(artifact, dict) else None
+    if not by_ref or not isinstance(raw, str):
+        return transcript
+    rebuilt = _raw_from_turns(transcript.get("turns"))
+    if rebuilt is None or not raw.startswith(rebuilt) or raw[len(rebuilt):].strip():
+        return transcript
+    artifact = {k: v for k, v in artifact.items() if k != "raw_transcript"}
+    artifact["raw_transcript_ref"] = {"from": "turns", "tail": raw[len(rebuilt):]}
+    return {**transcript, "artifact": artifact}
+
+
+def _decode_transcript(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of _encode_transcript()."""
+    artifact = data.get("artifact") if isinstance(data, dict) else None
+    if not isinstance(artifact, dict) or "raw_transcript_ref" not in artifact:
+        return data
+    ref = artifact.pop("raw_transcript_ref") or {}
+    artifact["raw_transcript"] = (_raw_from_turns(data.get("turns")) or "") + (ref.get("tail") or "")
+    return data
+
+
+def _parse_json(raw: bytes) -> Any:
+    return json_codec.loads(json_codec.decompress(raw))
+
+
+def _parse_transcript(raw: bytes) -> Dict[str, Any]:
+    return _decode_transcript(_parse_json(raw))
+
+
+def _read_transcript(path: os.PathLike[str] | str) -> Dict[str, Any]:
+    """Uncached load_transcript(): a private copy the caller may modify."""
+    return _parse_transcript(Path(path).read_bytes())
+
+
+def _write_transcript(path: Path, transcript: Dict[str, Any]) -> None:
+    json_codec.dump_file(
+        path, _encode_transcript(transcript, raw_transcript_by_ref()), compression=transcript_compression()
+    )
+    _cache.invalidate(path)
+
+
 def save_transcript(transcript: Dict[str, Any]) -> Path:
     """
     Save a normalized transcript dict to `transcripts/` as JSON.
 
+    Patches parked by update_transcript(..., pending=True) for this call are
+    merged in (and removed) under the same lock. When the file already exists
+    (a later, more complete report for the same call), metadata patched onto it
+    that the new report lacks is kept: see _keep_patched_metadata().
     Returns the full Path to the written file.
     """
     _ensure_transcripts_dir()
     filename = _default_filename_for_transcript(transcript)
     path = TRANSCRIPTS_DIR / filename
 
-    # Write JSON with UTF-8 and pretty-print for easier manual inspection.
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(transcript, f, ensure_ascii=False, indent=2)
+    with file_lock(path):
+        pending_path = PENDING_DIR / filename
+        pending = _load_pending(pending_path)
+        if pending:
+            transcript = _merge_fields(dict(transcript), pending)
+        try:
+            transcript = _keep_patched_metadata(transcript, _read_transcript(path))
+        except (OSError, ValueError):
+            pass  # no earlier file, or an unreadable one that this save replaces
+        _write_transcript(path, transcript)
+        if pending:
+            pending_path.unlink()
+        _mirror_transcript(transcript)
+        _index_transcript(transcript)
 
     print(f"[storage] Saved transcript to {path}")
     return path
@@ -61,10 +313,95 @@ def save_transcript(transcript: Dict[str, Any]) -> Path:
 def load_transcript(path: os.PathLike[str] | str) -> Dict[str, Any]:
     """
     Convenience helper to load a transcript JSON back into a dict.
+    Compressed files and by-reference raw transcripts are expanded.
+
+    Served from the in-process cache while the file is unchanged; the dict is
+    shared with other callers, so copy it before modifying it.
     """
-    p = Path(path)
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _cache.load(path, _parse_transcript)
+
+
+def _merge_fields(data: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Set fields on data; dict values are merged one level deep into an existing dict."""
+    for key, value in fields.items():
+        current = data.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            data[key] = {**current, **value}
+        else:
+            data[key] = value
+    return data
+
+
+def _keep_patched_metadata(transcript: Dict[str, Any], existing: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Carry the scenario block and recording URL of an existing transcript over
+    to a re-saved one that has none. The pending patch that brought them was
+    consumed by the first save, so the second save would otherwise drop them.
+    """
+    transcript = dict(transcript)
+    old_scenario = existing.get("scenario")
+    new_scenario = transcript.get("scenario")
+    if isinstance(old_scenario, dict) and old_scenario.get("id") and not (
+        isinstance(new_scenario, dict) and new_scenario.get("id")
+    ):
+        transcript["scenario"] = old_scenario
+    old_artifact = existing.get("artifact")
+    new_artifact = transcript.get("artifact")
+    if isinstance(old_artifact, dict) and old_artifact.get("recording_url"):
+        if not isinstance(new_artifact, dict):
+            transcript["artifact"] = {"recording_url": old_artifact["recording_url"]}
+        elif not new_artifact.get("recording_url"):
+            transcript["artifact"] = {**new_artifact, "recording_url": old_artifact["recording_url"]}
+    return transcript
+
+
+def _load_pending(pending_path: Path) -> Dict[str, Any]:
+    try:
+        return json_codec.load_file(pending_path)
+    except FileNotFoundError:
+        return {}
+
+
+def _update_transcript_file(p: Path, fields: Dict[str, Any], pending: bool = False) -> Optional[Dict[str, Any]]:
+    with file_lock(p):
+        if not p.exists():
+            if pending:
+                PENDING_DIR.mkdir(parents=True, exist_ok=True)
+                pending_path = PENDING_DIR / p.name
+                json_codec.dump_file(pending_path, _merge_fields(_load_pending(pending_path), fields))
+            return None
+        data = _merge_fields(_read_transcript(p), fields)
+        _write_transcript(p, data)
+        _mirror_transcript(data)
+        _index_transcript(data)
+        return data
+
+
+def update_transcript(call_id: str, pending: bool = False, **fields: Any) -> Optional[Dict[str, Any]]:
+    """
+    Apply metadata patches to transcripts/<call_id>.json in one read-modify-write.
+
+    Each keyword sets a top-level key; dict values are merged into an existing
+    dict (e.g. artifact={"recording_url": url} keeps raw_transcript). Returns the
+    updated transcript, or None if the file does not exist yet. With pending=True
+    the patch is then kept and applied when save_transcript() writes the file.
+    """
+    return _update_transcript_file(transcript_path(call_id), fields, pending=pending)
+
+
+def discard_pending_update(call_id: str) -> None:
+    """Drop a parked patch for a call whose transcript never arrived."""
+    path = transcript_path(call_id)
+    with file_lock(path):
+        try:
+            (PENDING_DIR / path.name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def scenario_metadata(scenario_id: str, category: str, name: str, run_index: int) -> Dict[str, Any]:
+    """The `scenario` block the runner attaches to a transcript."""
+    return {"id": scenario_id, "category": category, "name": name, "run_index": run_index}
 
 
 def patch_transcript_scenario(
@@ -73,24 +410,14 @@ def patch_transcript_scenario(
     category: str,
     name: str,
     run_index: int,
-) -> None:
+) -> Optional[Dict[str, Any]]:
     """
     Patch an existing transcript JSON with scenario metadata.
-    Used by the Phase 4 runner after the webhook has saved the file.
+    Returns the updated transcript, or None if the file does not exist.
     """
-    p = Path(path)
-    if not p.exists():
-        return
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    data["scenario"] = {
-        "id": scenario_id,
-        "category": category,
-        "name": name,
-        "run_index": run_index,
-    }
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    return _update_transcript_file(
+        Path(path), {"scenario": scenario_metadata(scenario_id, category, name, run_index)}
+    )
 
 
 def _ensure_reports_dir() -> None:
@@ -105,33 +432,233 @@ def save_evaluation_report(call_id: str, report: Dict[str, Any]) -> Path:
     """
     _ensure_reports_dir()
     path = REPORTS_DIR / f"{call_id}.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    with file_lock(path):
+        json_codec.dump_file(path, report)
+        _cache.invalidate(path)
+        _mirror_report(call_id, report)
+        _index_report(call_id)
+    _archive_scores(call_id, report)
     return path
 
 
 def load_evaluation_report(path: os.PathLike[str] | str) -> Dict[str, Any]:
-    """Load an evaluation report JSON into a dict."""
-    p = Path(path)
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load an evaluation report JSON into a dict (cached like load_transcript; do not modify it)."""
+    return _cache.load(path, _parse_json)
 
 
-def patch_transcript_recording_url(path: os.PathLike[str] | str, recording_url: str) -> None:
-    """Set artifact.recording_url in an existing transcript JSON file."""
-    p = Path(path)
-    if not p.exists() or not recording_url:
-        return
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    artifact = data.get("artifact")
-    if artifact is None:
-        data["artifact"] = {"raw_transcript": None, "recording_url": recording_url}
+def cache_stats() -> Dict[str, Any]:
+    """Hit / miss / eviction counts of the transcript and report cache in this process."""
+    return _cache.stats()
+
+
+def patch_transcript_recording_url(path: os.PathLike[str] | str, recording_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Set artifact.recording_url in an existing transcript JSON file.
+    Returns the updated transcript, or None if nothing was written.
+    """
+    if not recording_url:
+        return None
+    return _update_transcript_file(Path(path), {"artifact": {"recording_url": recording_url}})
+
+
+def _project(doc: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return doc
+    return {key: doc.get(key) for key in ("call_id", *fields)}
+
+
+def _load_document(kind: str, path: Path, fields: Optional[Sequence[str]]) -> Optional[Dict[str, Any]]:
+    """One projected transcript / report, or None if it is gone or unreadable."""
+    try:
+        doc = _parse_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[storage] WARN: skipping {path}: {e}")
+        return None
+    if not isinstance(doc, dict):
+        return None
+    # Rebuilding a by-reference raw transcript is only worth it when artifact is wanted.
+    if kind == "transcript" and (fields is None or "artifact" in fields):
+        doc = _decode_transcript(doc)
+    doc.setdefault("call_id", path.stem)
+    return _project(doc, fields)
+
+
+def _load_batch(kind: str, paths: List[Path], fields: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """Process-pool task: parse and project a batch of files."""
+    return [doc for doc in (_load_document(kind, path, fields) for path in paths) if doc is not None]
+
+
+def _corpus_paths(directory: Path, call_ids: Optional[List[str]]) -> Iterator[Path]:
+    if call_ids is None:
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".json") and name[0] != ".")
+        except FileNotFoundError:
+            return
+        for name in names:
+            yield directory / name
     else:
-        if not isinstance(artifact, dict):
-            data["artifact"] = {"raw_transcript": None, "recording_url": recording_url}
-        else:
-            artifact["recording_url"] = recording_url
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        for call_id in call_ids:
+            yield directory / _default_filename_for_transcript({"call_id": call_id})
+
+
+def _matching_call_ids(**filters: Any) -> Optional[List[str]]:
+    """Call ids the manifest matches for the given filters, or None when there are none (scan everything)."""
+    filters = {key: value for key, value in filters.items() if value is not None}
+    if not filters:
+        return None
+    import manifest
+
+    return [entry.call_id for entry in manifest.get_manifest().find(**filters)]
+
+
+def _iter_documents(
+    kind: str, paths: Iterable[Path], fields: Optional[Sequence[str]], workers: int, batch_size: int
+) -> Iterator[Dict[str, Any]]:
+    if workers <= 1:
+        for path in paths:
+            doc = _load_document(kind, path, fields)
+            if doc is not None:
+                yield doc
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    # At most two batches per worker in flight, so memory stays bounded however large the corpus.
+    window: "deque[Any]" = deque()
+    try:
+        batch: List[Path] = []
+        for path in paths:
+            batch.append(path)
+            if len(batch) >= batch_size:
+                window.append(pool.submit(_load_batch, kind, batch, fields))
+                batch = []
+                if len(window) >= 2 * workers:
+                    yield from window.popleft().result()
+        if batch:
+            window.append(pool.submit(_load_batch, kind, batch, fields))
+        while window:
+            yield from window.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_transcripts(
+    category: Optional[str] = None,
+    scenario_id: Optional[str] = None,
+    since: Any = None,
+    until: Any = None,
+    ended_reason: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    workers: int = 0,
+    batch_size: int = 32,
+    transcripts_dir: Path = TRANSCRIPTS_DIR,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream transcripts one at a time.
+
+    Filters (since <= started_at < until; datetimes or ISO strings) are
+    answered by the manifest of transcripts/ (manifest.py), so only matching
+    files are opened; with no
+    filter every file is read, in name order. fields projects each transcript
+    to those top-level keys plus call_id (e.g. fields=["turns"]). workers > 1
+    parses in a process pool of that size, keeping at most 2 * workers *
+    batch_size documents in flight. Each yielded dict is the caller's own.
+    """
+    call_ids = _matching_call_ids(
+        category=category, scenario_id=scenario_id, since=since, until=until, ended_reason=ended_reason
+    )
+    return _iter_documents("transcript", _corpus_paths(transcripts_dir, call_ids), fields, workers, batch_size)
+
+
+def iter_reports(
+    category: Optional[str] = None,
+    scenario_id: Optional[str] = None,
+    since: Any = None,
+    until: Any = None,
+    ended_reason: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    workers: int = 0,
+    batch_size: int = 32,
+    reports_dir: Path = REPORTS_DIR,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream evaluation reports one at a time, like iter_transcripts(). Filters
+    apply to the call's transcript metadata in the manifest; calls without a
+    report are skipped. call_id is always set (from the file name if missing).
+    """
+    call_ids = _matching_call_ids(
+        category=category, scenario_id=scenario_id, since=since, until=until, ended_reason=ended_reason
+    )
+    return _iter_documents("report", _corpus_paths(reports_dir, call_ids), fields, workers, batch_size)
+
+
+def migrate_transcripts(
+    compression: str, by_ref: bool, transcripts_dir: Path = TRANSCRIPTS_DIR, dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Rewrite every transcript in the given format. Returns total bytes and
+    mean load time (load_transcript) before and after.
+    """
+    paths = sorted(transcripts_dir.glob("*.json"))
+    stats: Dict[str, Any] = {"files": len(paths), "bytes_before": 0, "bytes_after": 0, "errors": 0}
+    load_before = load_after = 0.0
+    for path in paths:
+        with file_lock(path):
+            try:
+                stats["bytes_before"] += path.stat().st_size
+                started = time.perf_counter()
+                data = _read_transcript(path)
+                load_before += time.perf_counter() - started
+                encoded = json_codec.compress(
+                    json_codec.dumps(_encode_transcript(data, by_ref), pretty=json_codec.pretty_by_default()),
+                    compression,
+                )
+                stats["bytes_after"] += len(encoded)
+                if dry_run:
+                    continue
+                json_codec.dump_file(path, _encode_transcript(data, by_ref), compression=compression)
+                _cache.invalidate(path)
+                started = time.perf_counter()
+                if _read_transcript(path) != data:
+                    raise ValueError("round trip changed the transcript")
+                load_after += time.perf_counter() - started
+            except (OSError, ValueError) as e:
+                print(f"  {path.name}: {e}")
+                stats["errors"] += 1
+    if paths:
+        stats["load_ms_before"] = round(load_before / len(paths) * 1000, 3)
+        if not dry_run:
+            stats["load_ms_after"] = round(load_after / len(paths) * 1000, 3)
+    return stats
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Storage maintenance for transcripts/.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_migrate = sub.add_parser("migrate", help="Rewrite transcripts with another compression / raw transcript mode")
+    p_migrate.add_argument("--compression", choices=json_codec.COMPRESSIONS, default=transcript_compression())
+    p_migrate.add_argument(
+        "--raw-transcript", choices=["inline", "ref"], default="ref" if raw_transcript_by_ref() else "inline"
+    )
+    p_migrate.add_argument("--dry-run", action="store_true", help="Only report the size change")
+    args = parser.parse_args(argv)
+
+    stats = migrate_transcripts(args.compression, args.raw_transcript == "ref", dry_run=args.dry_run)
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    saved = f" ({1 - after / before:.0%} smaller)" if before else ""
+    print(f"{'Would rewrite' if args.dry_run else 'Rewrote'} {stats['files']} transcript(s): "
+          f"{before:,} -> {after:,} bytes{saved}")
+    if "load_ms_before" in stats:
+        after_ms = f" -> {stats['load_ms_after']} ms" if "load_ms_after" in stats else ""
+        print(f"  load_transcript: {stats['load_ms_before']} ms{after_ms} per file")
+    if not args.dry_run and (args.compression != transcript_compression()
+                             or (args.raw_transcript == "ref") != raw_transcript_by_ref()):
+        print(f"  New transcripts follow {COMPRESSION_ENV} / {RAW_TRANSCRIPT_ENV}; set them to match.")
+    return 1 if stats["errors"] else 0
+
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Wait for a call's transcript without polling the disk on a fixed interval.
+
+The webhook server exposes GET /calls/<call_id>/wait, a long-poll that returns
+as soon as `save_transcript` has written transcripts/<call_id>.json. The runner
+uses that by default. If the server is not reachable we fall back to watching
+the transcripts directory for filesystem events (inotify etc. via the optional
+`watchdog` package), and to plain polling if watchdog is not installed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+# One long-poll request never blocks longer than this (keeps proxies and sockets happy).
+LONG_POLL_CHUNK_SEC = 60.0
+
+# Env override for where the runner reaches the webhook server (it runs next to it).
+WEBHOOK_LOCAL_URL_ENV = "WEBHOOK_LOCAL_URL"
+
+
+def local_webhook_url() -> str:
+    """Base URL of the local webhook server, e.g. http://127.0.0.1:8765."""
+    url = os.getenv(WEBHOOK_LOCAL_URL_ENV)
+    if url and url.strip():
+        return url.strip().rstrip("/")
+    port = os.getenv("WEBHOOK_PORT", "8765")
+    return f"http://127.0.0.1:{port}"
+
+
+def wait_via_server(call_id: str, base_url: str, deadline: float) -> Optional[bool]:
+    """
+    Long-poll the webhook server until the transcript is saved or the deadline passes.
+
+    Returns True when the server reports the transcript saved, False on timeout,
+    and None if the server could not be reached (caller should fall back).
+    """
+    quoted = urllib.parse.quote(call_id, safe="")
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        chunk = min(LONG_POLL_CHUNK_SEC, remaining)
+        url = f"{base_url}/calls/{quoted}/wait?timeout={chunk:.1f}"
+        try:
+            # Socket timeout a little above the server-side wait so we see its answer.
+            with urllib.request.urlopen(url, timeout=chunk + 10) as resp:
+                body = json.loads(resp.read().decode("utf-8") or "{}")
+        except urllib.error.HTTPError as e:
+            if e.code == 408:
+                continue
+            return None
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+        if body.get("status") == "saved":
+            return True
+
+
+def wait_via_filesystem(path: Path, deadline: float, poll_interval_sec: float) -> bool:
+    """
+    Wait for `path` to appear, woken by filesystem events when watchdog is installed.
+
+    Without watchdog this polls path.exists() every poll_interval_sec.
+    Returns True if the file exists before the deadline.
+    """
+    if path.exists():
+        return True
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        while time.monotonic() < deadline:
+            if path.exists():
+                return True
+            time.sleep(max(0.0, min(poll_interval_sec, deadline - time.monotonic())))
+        return path.exists()
+
+    appeared = threading.Event()
+    target = str(path)
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event) -> None:  # type: ignore[no-untyped-def]
+            if event.event_type == "deleted":
+                return
+            if target in (event.src_path, getattr(event, "dest_path", None)):
+                appeared.set()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    observer = Observer()
+    observer.schedule(_Handler(), str(path.parent), recursive=False)
+    observer.start()
+    try:
+        # Re-check after the watch is armed: the file may have landed in between.
+        if path.exists():
+            return True
+        appeared.wait(timeout=max(0.0, deadline - time.monotonic()))
+        return path.exists()
+    finally:
+        observer.stop()
+        observer.join(timeout=5)
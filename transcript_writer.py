@@ -0,0 +1,151 @@
+"""
+Write-behind persistence for transcripts received by the webhook server.
+
+The webhook handler only validates and normalizes the payload, then hands
+the transcript to TranscriptWriter.submit() and returns 200. A single writer
+thread takes transcripts off a bounded queue in batches and saves them with
+storage.save_transcript. Several transcripts for the same call in one batch
+are coalesced, and the last one wins. After each save the writer calls
+`on_saved(call_id, path)`, which the server uses to wake long-poll waiters
+and confirm the delivery marker, `on_save_failed(call_id)` when a save
+raises, and `on_save_timing(seconds, ok)` after every attempt (server metrics).
+
+When the queue is full the transcript is written on the caller's thread
+instead, so backpressure slows the webhook response down but never drops
+a transcript. stats() exposes queue depth and counters.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from storage import save_transcript
+
+WRITE_QUEUE_SIZE_ENV = "WEBHOOK_WRITE_QUEUE_SIZE"
+DEFAULT_WRITE_QUEUE_SIZE = 1000
+# Most transcripts one writer pass takes off the queue.
+MAX_BATCH = 50
+
+_STOP = object()
+
+
+class TranscriptWriter:
+    """Bounded queue + background writer thread for transcripts."""
+
+    def __init__(
+        self,
+        on_saved: Optional[Callable[[str, Path], None]] = None,
+        max_queue: Optional[int] = None,
+        on_save_timing: Optional[Callable[[float, bool], None]] = None,
+        on_save_failed: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if max_queue is None:
+            try:
+                max_queue = int(os.getenv(WRITE_QUEUE_SIZE_ENV, DEFAULT_WRITE_QUEUE_SIZE))
+            except ValueError:
+                max_queue = DEFAULT_WRITE_QUEUE_SIZE
+        self.max_queue = max(1, max_queue)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._on_saved = on_saved
+        self._on_save_timing = on_save_timing
+        self._on_save_failed = on_save_failed
+        self._lock = threading.Lock()
+        self._counters = {"written": 0, "batches": 0, "coalesced": 0, "sync_writes": 0, "errors": 0}
+        self._max_depth = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "TranscriptWriter":
+        """Start the writer thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, transcript: Dict[str, Any]) -> bool:
+        """
+        Queue a transcript for saving. Returns True if queued, False if the queue was
+        full and the transcript was saved synchronously instead.
+        """
+        try:
+            self._queue.put_nowait(transcript)
+        except queue.Full:
+            with self._lock:
+                self._counters["sync_writes"] += 1
+            self._save([transcript])
+            return False
+        with self._lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush everything queued so far, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth (now and peak), capacity, and write counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_max_depth": self._max_depth,
+                "queue_capacity": self.max_queue,
+                **self._counters,
+            }
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            self._save([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _save(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        # Coalesce repeated deliveries for one call: only the latest needs to hit the disk.
+        latest: Dict[Any, Dict[str, Any]] = {}
+        for i, transcript in enumerate(batch):
+            latest[transcript.get("call_id") or ("anonymous", i)] = transcript
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["coalesced"] += len(batch) - len(latest)
+        for transcript in latest.values():
+            call_id = transcript.get("call_id")
+            started = time.perf_counter()
+            try:
+                path = save_transcript(transcript)
+            except Exception as e:
+                self._report_timing(time.perf_counter() - started, False)
+                with self._lock:
+                    self._counters["errors"] += 1
+                print(f"[webhook] ERROR writing transcript for call_id={call_id}: {e}")
+                if call_id and self._on_save_failed is not None:
+                    self._on_save_failed(call_id)
+                continue
+            self._report_timing(time.perf_counter() - started, True)
+            with self._lock:
+                self._counters["written"] += 1
+            print(f"[webhook] SAVED call_id={call_id} -> {path}")
+            if call_id and self._on_saved is not None:
+                self._on_saved(call_id, path)
+
+    def _report_timing(self, seconds: float, ok: bool) -> None:
+        if self._on_save_timing is not None:
+            try:
+                self._on_save_timing(seconds, ok)
+            except Exception:
+                pass
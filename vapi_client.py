@@ -207,6 +207,43 @@ def start_call(
     return call
 
 
+# HTTP statuses on create-call that mean "try again later" (no call was placed).
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+
+def classify_start_error(exc: Exception) -> Optional[str]:
+    """
+    Classify a start_call() failure for the runner's retry logic.
+
+    Returns "rate_limit" (HTTP 429), "concurrency" (account concurrency limit hit),
+    "unavailable" (502/503/504 or connection refused), or None if the error is not
+    retryable (bad config, bad request, or a timeout where the call may exist).
+    """
+    if isinstance(exc, ValueError):
+        return None
+    status = getattr(exc, "status_code", None)
+    text = f"{getattr(exc, 'body', '')} {exc}".lower()
+    if "concurrency" in text:
+        return "concurrency"
+    if status == 429 or "rate limit" in text or "too many requests" in text:
+        return "rate_limit"
+    if status in RETRYABLE_STATUS_CODES:
+        return "unavailable"
+    if type(exc).__name__ in ("ConnectError", "ConnectionError", "ConnectionRefusedError"):
+        return "unavailable"
+    return None
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Retry-After (seconds) from the error's response headers, if the SDK exposes them."""
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
 def _serialize_call(call) -> dict:
     """Convert SDK call response to a JSON-serializable dict."""
     if hasattr(call, "model_dump"):
@@ -0,0 +1,322 @@
+"""
+Replay end-of-call webhooks against a local webhook server and measure ingestion.
+
+Payloads come from captured deliveries (start the server with
+WEBHOOK_CAPTURE_DIR=captures/ to record them) or are synthesized from saved
+transcripts. `--scale-messages K` repeats artifact.messages K times to mimic
+longer calls. Each replayed payload gets a fresh `bench-...` call id so dedup
+does not swallow it. Sends are paced at --qps, with at most --concurrency POSTs
+in flight; a slot is freed as soon as the POST is acknowledged, and the wait
+for the save runs separately. For each delivery we measure:
+
+  ack latency   scheduled send -> 200 received
+  save latency  scheduled send -> transcript on disk (via GET /calls/<id>/wait)
+
+Latencies start at the time the delivery was due (t0 + i / qps), not when it
+was actually sent, so a server that falls behind and holds up later sends is
+charged for the delay instead of hiding it (no coordinated omission).
+
+The report gives p50/p95/p99 of both plus error and save-timeout rates, and
+it is saved to runs/bench_<run_id>.json. Transcripts and dedup markers written
+for bench-* calls are removed afterwards unless --keep is given.
+
+  python webhook_bench.py --from-transcripts --qps 20 --concurrency 8 --requests 200
+  python webhook_bench.py --captures captures/ --scale-messages 4 --qps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import math
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import json_codec
+from run_ledger import RUNS_DIR, new_run_id
+from storage import BENCH_CALL_PREFIX, TRANSCRIPTS_DIR, load_transcript
+from transcript_wait import local_webhook_url, wait_via_server
+from webhook_dedup import marker_path
+
+DEFAULT_SAVE_TIMEOUT_SEC = 30.0
+
+
+@dataclass
+class Delivery:
+    """Outcome of one replayed webhook."""
+
+    call_id: str
+    ack_sec: Optional[float] = None
+    save_sec: Optional[float] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+
+def payload_from_transcript(transcript: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a Vapi end-of-call-report payload from one of our normalized transcripts."""
+    artifact = transcript.get("artifact") or {}
+    return {
+        "message": {
+            "type": "end-of-call-report",
+            "endedReason": transcript.get("ended_reason"),
+            "call": {
+                "id": transcript.get("call_id"),
+                "startedAt": transcript.get("started_at"),
+                "endedAt": transcript.get("ended_at"),
+            },
+            "artifact": {
+                "transcript": artifact.get("raw_transcript"),
+                "recordingUrl": artifact.get("recording_url"),
+                "messages": [
+                    {"role": t.get("role") or "user", "message": t.get("text") or ""}
+                    for t in transcript.get("turns") or []
+                ],
+            },
+        }
+    }
+
+
+def load_payloads(captures: Optional[Path], from_transcripts: bool) -> List[Dict[str, Any]]:
+    """End-of-call payloads to replay, from a capture directory and/or saved transcripts."""
+    payloads: List[Dict[str, Any]] = []
+    if captures is not None:
+        for path in sorted(captures.glob("*.json")):
+            try:
+                payload = json_codec.load_file(path)
+            except (OSError, ValueError):
+                continue
+            if isinstance(payload, dict) and (payload.get("message") or {}).get("type") == "end-of-call-report":
+                payloads.append(payload)
+    if from_transcripts:
+        for path in sorted(TRANSCRIPTS_DIR.glob("*.json")):
+            if path.name.startswith(BENCH_CALL_PREFIX):
+                continue
+            try:
+                payloads.append(payload_from_transcript(load_transcript(path)))
+            except (OSError, ValueError, AttributeError):
+                continue
+    return payloads
+
+
+def prepare(payload: Dict[str, Any], call_id: str, scale_messages: int) -> bytes:
+    """Copy of the payload with a fresh call id and artifact.messages repeated scale_messages times."""
+    payload = copy.deepcopy(payload)
+    message = payload.setdefault("message", {})
+    message.setdefault("call", {})["id"] = call_id
+    artifact = message.setdefault("artifact", {})
+    if scale_messages > 1:
+        artifact["messages"] = list(artifact.get("messages") or []) * scale_messages
+        if isinstance(artifact.get("transcript"), str):
+            artifact["transcript"] = "\n".join([artifact["transcript"]] * scale_messages)
+    return json_codec.dumps(payload)
+
+
+# Upper bound on concurrent GET /calls/<id>/wait long-polls (they mostly sleep).
+MAX_SAVE_WAITERS = 256
+
+
+def _post(base_url: str, call_id: str, body: bytes, scheduled: float, timeout: float) -> Delivery:
+    """POST one delivery; ack_sec is measured from its scheduled send time."""
+    result = Delivery(call_id=call_id)
+    request = urllib.request.Request(
+        f"{base_url}/webhook/vapi", data=body, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            resp.read()
+            result.status = resp.status
+    except urllib.error.HTTPError as e:
+        result.status, result.error = e.code, f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError) as e:
+        result.error = str(e)
+    result.ack_sec = time.monotonic() - scheduled
+    return result
+
+
+def _await_save(result: Delivery, base_url: str, scheduled: float, save_timeout: float) -> Delivery:
+    """Wait for an acknowledged delivery's transcript; save_sec is measured from its scheduled send time."""
+    saved = wait_via_server(result.call_id, base_url, time.monotonic() + save_timeout)
+    if saved:
+        result.save_sec = time.monotonic() - scheduled
+    else:
+        result.error = "save timeout" if saved is False else "wait endpoint unreachable"
+    return result
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (p in 0-100) of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(deliveries: List[Delivery], elapsed_sec: float) -> Dict[str, Any]:
+    acks = [d.ack_sec for d in deliveries if d.ack_sec is not None and d.status == 200]
+    saves = [d.save_sec for d in deliveries if d.save_sec is not None]
+    total = len(deliveries)
+    ack_errors = sum(1 for d in deliveries if d.status != 200)
+    save_errors = sum(1 for d in deliveries if d.status == 200 and d.save_sec is None)
+
+    def _dist(values: List[float]) -> Dict[str, Optional[float]]:
+        return {f"p{p}": (round(v * 1000, 1) if v is not None else None) for p, v in
+                ((p, percentile(values, p)) for p in (50, 95, 99))}
+
+    return {
+        "requests": total,
+        "elapsed_sec": round(elapsed_sec, 2),
+        "achieved_qps": round(total / elapsed_sec, 2) if elapsed_sec > 0 else None,
+        "ack_ms": _dist(acks),
+        "save_ms": _dist(saves),
+        "ack_error_rate": round(ack_errors / total, 4) if total else None,
+        "save_error_rate": round(save_errors / total, 4) if total else None,
+        "errors": sorted({d.error for d in deliveries if d.error}),
+    }
+
+
+def cleanup(call_ids: List[str]) -> None:
+    """Remove the transcripts and dedup markers the benchmark produced."""
+    for call_id in call_ids:
+        for path in (TRANSCRIPTS_DIR / f"{call_id}.json", marker_path(call_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def run_bench(
+    payloads: List[Dict[str, Any]],
+    base_url: str,
+    requests: int,
+    qps: float,
+    concurrency: int,
+    scale_messages: int,
+    save_timeout: float,
+) -> List[Delivery]:
+    """
+    Send `requests` deliveries (cycling through payloads) paced at qps, with at most
+    `concurrency` POSTs in flight; saves are awaited off the sending slots.
+    """
+    run_tag = f"{BENCH_CALL_PREFIX}{new_run_id()}"
+    bodies = [
+        (f"{run_tag}-{i + 1:05d}", prepare(payloads[i % len(payloads)], f"{run_tag}-{i + 1:05d}", scale_messages))
+        for i in range(requests)
+    ]
+    slots = threading.Semaphore(max(1, concurrency))
+    deliveries: List[Delivery] = []
+    lock = threading.Lock()
+
+    def _one(call_id: str, body: bytes, scheduled: float) -> None:
+        try:
+            d = _post(base_url, call_id, body, scheduled, save_timeout)
+        finally:
+            slots.release()
+        if d.error:
+            _done(d)
+        else:
+            waiters.submit(lambda: _done(_await_save(d, base_url, scheduled, save_timeout)))
+
+    def _done(d: Delivery) -> None:
+        with lock:
+            deliveries.append(d)
+
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(requests, MAX_SAVE_WAITERS))) as waiters, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as senders:
+        for i, (call_id, body) in enumerate(bodies):
+            if qps > 0:
+                # Open-loop pacing: request i is due at t0 + i / qps, however slow earlier ones were.
+                scheduled = t0 + i / qps
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            slots.acquire()
+            if qps <= 0:
+                scheduled = time.monotonic()  # closed loop: no schedule to fall behind
+            senders.submit(_one, call_id, body, scheduled)
+    return deliveries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay end-of-call webhooks against a local webhook server and report ingestion latency.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--url", default=None, help="Webhook server base URL (default: local webhook URL)")
+    parser.add_argument("--captures", type=Path, help="Directory of captured payloads (WEBHOOK_CAPTURE_DIR)")
+    parser.add_argument("--from-transcripts", action="store_true", help="Synthesize payloads from transcripts/")
+    parser.add_argument("--requests", type=int, default=100, metavar="N", help="Deliveries to send")
+    parser.add_argument("--qps", type=float, default=10.0, help="Target deliveries per second (0 = as fast as possible)")
+    parser.add_argument("--concurrency", type=int, default=8, metavar="N", help="Max deliveries in flight")
+    parser.add_argument("--scale-messages", type=int, default=1, metavar="K", help="Repeat artifact.messages K times")
+    parser.add_argument("--save-timeout", type=float, default=DEFAULT_SAVE_TIMEOUT_SEC, metavar="SEC")
+    parser.add_argument("--keep", action="store_true", help="Keep the bench-* transcripts the run produced")
+    args = parser.parse_args()
+
+    if args.captures is None and not args.from_transcripts:
+        print("Error: give --captures DIR and/or --from-transcripts", file=sys.stderr)
+        return 1
+    payloads = load_payloads(args.captures, args.from_transcripts)
+    if not payloads:
+        print("Error: no end-of-call payloads found to replay", file=sys.stderr)
+        return 1
+    base_url = (args.url or local_webhook_url()).rstrip("/")
+    print(
+        f"[bench] {args.requests} deliveries from {len(payloads)} payload(s) -> {base_url} "
+        f"at {args.qps:g} qps, concurrency {args.concurrency}, messages x{args.scale_messages}"
+    )
+
+    started = time.monotonic()
+    deliveries = run_bench(
+        payloads, base_url, args.requests, args.qps, args.concurrency, args.scale_messages, args.save_timeout
+    )
+    summary = summarize(deliveries, time.monotonic() - started)
+    if not args.keep:
+        cleanup([d.call_id for d in deliveries])
+
+    run_id = new_run_id()
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RUNS_DIR / f"bench_{run_id}.json"
+    report = {
+        "run_id": run_id,
+        "url": base_url,
+        "settings": {
+            "requests": args.requests,
+            "qps": args.qps,
+            "concurrency": args.concurrency,
+            "scale_messages": args.scale_messages,
+            "payloads": len(payloads),
+        },
+        **summary,
+    }
+    json_codec.dump_file(path, report, pretty=True)
+
+    print()
+    print("Webhook ingestion:")
+    print(f"  Sent: {summary['requests']} in {summary['elapsed_sec']:.1f} s ({summary['achieved_qps']} qps)")
+    for label, key in (("Ack", "ack_ms"), ("Save", "save_ms")):
+        dist = summary[key]
+        print(
+            f"  {label} latency (ms): p50 {_fmt(dist['p50'])}  p95 {_fmt(dist['p95'])}  p99 {_fmt(dist['p99'])}"
+        )
+    print(f"  Ack errors: {summary['ack_error_rate']:.1%}  Save errors/timeouts: {summary['save_error_rate']:.1%}")
+    for error in summary["errors"][:5]:
+        print(f"    {error}")
+    print(f"  Report: {path}")
+    return 0 if not summary["errors"] else 1
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Idempotency for end-of-call webhook deliveries.
+
+Vapi retries a webhook when it does not see a timely 2xx, so the same
+end-of-call report can arrive more than once. Rewriting the transcript on a
+retry could race with the runner's update_transcript() and drop the
+scenario metadata. DeliveryDeduper decides, per call id, whether a delivery
+should be persisted:
+
+  - same payload digest as the delivery we accepted -> duplicate, no-op
+  - different payload, but we already accepted a complete report -> ignored
+    (the first complete report wins)
+  - the accepted report was incomplete (no turns) and this one is complete
+    -> accepted, replacing it
+
+Decisions are remembered in a bounded LRU and in a small marker file per call
+under transcripts/.delivered/, so retries are still recognized after a
+server restart and by the other worker processes of the server. The marker
+is only written by confirm(), once the writer has saved the transcript; an
+accepted delivery whose save fails is released again, so Vapi's next retry
+is accepted instead of being treated as a duplicate of a transcript that
+never reached the disk.
+
+Call ids come from an unauthenticated webhook: valid_call_id() rejects ids
+that could name a path, and marker files are named after sha256(call_id).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import json_codec
+from storage import TRANSCRIPTS_DIR, file_lock
+
+DEFAULT_LRU_SIZE = 10_000
+MARKERS_DIR = TRANSCRIPTS_DIR / ".delivered"
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+SUPERSEDED = "superseded"
+
+
+def payload_digest(payload: Dict[str, Any]) -> str:
+    """Stable SHA-256 of the payload (key order does not matter)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def valid_call_id(call_id: Any) -> bool:
+    """True for a non-empty string that cannot escape a directory when used in a file name."""
+    return (
+        isinstance(call_id, str)
+        and bool(call_id)
+        and ".." not in call_id
+        and not any(ch in call_id for ch in ("/", "\\", "\x00"))
+    )
+
+
+def marker_path(call_id: str, markers_dir: Path = MARKERS_DIR) -> Path:
+    """Delivery marker file for call_id, named by hash so the id never becomes part of a path."""
+    return markers_dir / f"{hashlib.sha256(call_id.encode('utf-8')).hexdigest()}.json"
+
+
+def is_complete(transcript: Dict[str, Any]) -> bool:
+    """A report counts as complete once it carries conversation content."""
+    return bool(transcript.get("turns") or (transcript.get("artifact") or {}).get("raw_transcript"))
+
+
+class DeliveryDeduper:
+    """Thread-safe first-complete-report-wins filter keyed on call id + payload digest."""
+
+    def __init__(self, max_entries: int = DEFAULT_LRU_SIZE, markers_dir: Path = MARKERS_DIR) -> None:
+        self._lock = threading.Lock()
+        self._seen: "OrderedDict[str, Tuple[str, bool]]" = OrderedDict()
+        self.max_entries = max(1, max_entries)
+        self.markers_dir = markers_dir
+        # Accepted but not yet saved: call_id -> (digest, complete), written to the marker by confirm().
+        self._pending: Dict[str, Tuple[str, bool]] = {}
+        self.counters = {ACCEPTED: 0, DUPLICATE: 0, SUPERSEDED: 0}
+
+    def check(self, call_id: str, payload: Dict[str, Any], transcript: Dict[str, Any]) -> str:
+        """
+        Classify one delivery (ACCEPTED / DUPLICATE / SUPERSEDED) and remember accepted ones.
+        Call confirm() once an accepted transcript is saved, or release() if saving failed.
+        Raises ValueError for a call id that fails valid_call_id().
+        """
+        if not valid_call_id(call_id):
+            raise ValueError(f"invalid call id {call_id!r}")
+        digest = payload_digest(payload)
+        complete = is_complete(transcript)
+        # The file lock makes the marker the source of truth across webhook worker processes.
+        with self._lock, file_lock(self._marker_path(call_id)):
+            prior = self._seen.get(call_id)
+            if prior is None or not prior[1]:
+                # A cached incomplete report may have been superseded by another worker.
+                prior = self._read_marker(call_id) or prior
+            if prior is None or (not prior[1] and complete and prior[0] != digest):
+                decision = ACCEPTED
+            elif prior[0] == digest:
+                decision = DUPLICATE
+            else:
+                decision = SUPERSEDED
+            if decision == ACCEPTED:
+                self._remember(call_id, digest, complete)
+                self._pending[call_id] = (digest, complete)
+            elif prior is not None:
+                self._remember(call_id, *prior)
+            self.counters[decision] += 1
+        return decision
+
+    def confirm(self, call_id: str) -> None:
+        """The accepted delivery for call_id is on disk: persist the marker."""
+        with self._lock:
+            accepted = self._pending.pop(call_id, None)
+            if accepted is not None:
+                with file_lock(self._marker_path(call_id)):
+                    self._write_marker(call_id, *accepted)
+
+    def release(self, call_id: str) -> None:
+        """Saving the accepted delivery failed: forget it so a retry is accepted again."""
+        with self._lock:
+            accepted = self._pending.pop(call_id, None)
+            if accepted is not None and self._seen.get(call_id) == accepted:
+                del self._seen[call_id]
+
+    def hit_rate(self) -> float:
+        """Share of deliveries that were duplicates or superseded."""
+        with self._lock:
+            total = sum(self.counters.values())
+            return (total - self.counters[ACCEPTED]) / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.counters.values())
+            hits = total - self.counters[ACCEPTED]
+            return {**self.counters, "deliveries": total, "hit_rate": round(hits / total, 4) if total else 0.0}
+
+    def _remember(self, call_id: str, digest: str, complete: bool) -> None:
+        self._seen[call_id] = (digest, complete)
+        self._seen.move_to_end(call_id)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+    def _marker_path(self, call_id: str) -> Path:
+        return marker_path(call_id, self.markers_dir)
+
+    def _read_marker(self, call_id: str) -> Optional[Tuple[str, bool]]:
+        try:
+            data = json_codec.load_file(self._marker_path(call_id))
+            return str(data["digest"]), bool(data.get("complete"))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_marker(self, call_id: str, digest: str, complete: bool) -> None:
+        try:
+            self.markers_dir.mkdir(parents=True, exist_ok=True)
+            json_codec.dump_file(
+                self._marker_path(call_id), {"call_id": call_id, "digest": digest, "complete": complete}
+            )
+        except OSError as e:
+            # The LRU still covers retries while this process lives.
+            print(f"[webhook] WARN: could not write delivery marker for call_id={call_id}: {e}")
@@ -5,12 +5,25 @@ Phase 3.2 focuses ONLY on taking the raw JSON payload from Vapi and
 normalizing it into a clean transcript object in Python. Writing the
 transcript to disk and wiring it into the Flask route are handled in later
 steps.
+
+While a call is in progress, LiveCallStore folds conversation-update,
+transcript and status-update events into an in-memory transcript per call.
+The webhook server serves it via GET /calls/<call_id>/live, and
+merge_live_into_transcript() flushes it into the final transcript when the
+end-of-call report arrives.
 """
 
 from __future__ import annotations
 
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+LIVE_EVENT_TYPES = ("conversation-update", "transcript", "status-update")
+# Live state of a call that sent nothing for this long is dropped (the end-of-call report never came).
+LIVE_CALL_TTL_SEC = 2 * 60 * 60
+
 
 def _map_role_to_speaker(role: str) -> str:
     """
@@ -29,6 +42,31 @@ def _map_role_to_speaker(role: str) -> str:
 
 
 
+def _turns_from_messages(messages: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Vapi message list -> our turns. System prompts and empty messages are
+    filtered out; they shouldn't appear in conversation turns.
+    """
+    turns: List[Dict[str, Any]] = []
+    for msg in messages:
+        if not isinstance(msg, dict):
+            continue
+        role = msg.get("role") or ""
+        if role.lower() == "system":
+            continue
+        text = msg.get("message") or msg.get("content") or ""
+        if not text or not isinstance(text, str):
+            continue
+        turns.append(
+            {
+                "speaker": _map_role_to_speaker(role),
+                "role": role,
+                "text": text,
+            }
+        )
+    return turns
+
+
 def extract_transcript_from_webhook(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Given a raw webhook payload from Vapi, return a normalized transcript
@@ -119,27 +157,7 @@ def extract_transcript_from_webhook(payload: Dict[str, Any]) -> Optional[Dict[st
         recording_url = rec
 
     # Structured turns from artifact.messages (if present)
-    # Filter out system prompts - they shouldn't appear in conversation turns
-    turns: List[Dict[str, Any]] = []
-    for msg in artifact.get("messages") or []:
-        role = msg.get("role") or ""
-        
-        # Skip system role messages - these are prompts, not conversation turns
-        if role.lower() == "system":
-            continue
-        
-        text = msg.get("message") or msg.get("content") or ""
-        if not text:
-            continue
-
-        speaker = _map_role_to_speaker(role)
-        turns.append(
-            {
-                "speaker": speaker,
-                "role": role,
-                "text": text,
-            }
-        )
+    turns = _turns_from_messages(artifact.get("messages") or [])
 
     normalized: Dict[str, Any] = {
         "call_id": call_id,
@@ -156,3 +174,117 @@ def extract_transcript_from_webhook(payload: Dict[str, Any]) -> Optional[Dict[st
 
     return normalized
 
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LiveCallStore:
+    """
+    Thread-safe, in-memory transcript per active call, built from live events:
+
+    - conversation-update: the full conversation so far -> replaces the turns.
+    - transcript: one utterance; "final" ones are appended as turns (until the next
+      conversation-update replaces them), the latest "partial" per role is kept.
+    - status-update: call status (queued, ringing, in-progress, ended, ...) with time.
+    """
+
+    def __init__(self, ttl_sec: float = LIVE_CALL_TTL_SEC) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._touched: Dict[str, float] = {}
+        self.ttl_sec = ttl_sec
+
+    def apply(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Fold one webhook payload into its call's live state. Returns the call_id if it was a live event."""
+        message = (payload or {}).get("message") or {}
+        event_type = message.get("type")
+        call_id = (message.get("call") or {}).get("id")
+        if event_type not in LIVE_EVENT_TYPES or not call_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            live = self._calls.get(call_id)
+            if live is None:
+                live = self._calls[call_id] = {
+                    "call_id": call_id,
+                    "status": None,
+                    "status_history": [],
+                    "turns": [],
+                    "partial": {},
+                    "events": 0,
+                }
+            live["events"] += 1
+            live["updated_at"] = _now_iso()
+            self._touched[call_id] = now
+            if event_type == "conversation-update":
+                messages = message.get("messages") or message.get("conversation") or []
+                live["turns"] = _turns_from_messages(messages)
+                live["partial"] = {}
+            elif event_type == "transcript":
+                role = message.get("role") or ""
+                text = message.get("transcript") or ""
+                if text and message.get("transcriptType") == "final":
+                    live["turns"].append({"speaker": _map_role_to_speaker(role), "role": role, "text": text})
+                    live["partial"].pop(role, None)
+                elif text:
+                    live["partial"][role] = text
+            else:
+                status = message.get("status")
+                if status and status != live["status"]:
+                    live["status"] = status
+                    live["status_history"].append({"status": status, "at": live["updated_at"]})
+                if message.get("endedReason"):
+                    live["ended_reason"] = message["endedReason"]
+        return call_id
+
+    def get(self, call_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of the live transcript for call_id, or None if nothing is known."""
+        with self._lock:
+            live = self._calls.get(call_id)
+            if live is None:
+                return None
+            return {
+                **live,
+                "turns": list(live["turns"]),
+                "partial": dict(live["partial"]),
+                "status_history": list(live["status_history"]),
+            }
+
+    def pop(self, call_id: str) -> Optional[Dict[str, Any]]:
+        """Remove and return the live state for call_id (at end of call)."""
+        snapshot = self.get(call_id)
+        with self._lock:
+            self._calls.pop(call_id, None)
+            self._touched.pop(call_id, None)
+        return snapshot
+
+    def active_calls(self) -> List[str]:
+        with self._lock:
+            return list(self._calls)
+
+    def _evict(self, now: float) -> None:
+        for call_id, touched in list(self._touched.items()):
+            if now - touched > self.ttl_sec:
+                self._calls.pop(call_id, None)
+                del self._touched[call_id]
+
+
+def merge_live_into_transcript(transcript: Dict[str, Any], live: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Flush a call's live state into its final normalized transcript: the end-of-call
+    report stays authoritative, live turns only fill in when it has none, and the
+    status history is kept under "live".
+    """
+    if not live:
+        return transcript
+    if not transcript.get("turns") and live.get("turns"):
+        transcript["turns"] = live["turns"]
+    if not transcript.get("ended_reason") and live.get("ended_reason"):
+        transcript["ended_reason"] = live["ended_reason"]
+    transcript["live"] = {
+        "events": live.get("events", 0),
+        "status_history": live.get("status_history", []),
+    }
+    return transcript
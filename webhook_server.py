@@ -4,22 +4,168 @@ Minimal Flask server exposing the Vapi webhook endpoint.
 Phase 3, step 3.1: just accept POSTs on /webhook/vapi and return 200.
 In later steps we will call into webhook_handler and storage to parse and
 persist transcripts.
+
+GET /calls/<call_id>/wait is a long-poll for the runner: it returns as soon
+as that call's transcript has been saved (or 408 after ?timeout= seconds).
+
+GET /calls/<call_id>/live returns the in-progress transcript built from
+conversation-update / transcript / status-update events (webhook_handler.LiveCallStore).
+
+Transcripts are persisted write-behind: the webhook route validates and
+normalizes the payload, queues it for the writer thread (transcript_writer.py)
+and acks immediately. GET /queue shows the write queue depth and counters.
+Retried end-of-call deliveries are filtered by webhook_dedup.DeliveryDeduper
+(first complete report wins).
+
+GET /metrics serves Prometheus text-format metrics (metrics.py): events by
+type, saves, errors, dedup decisions, histograms of request handling time,
+payload size, normalization time and save time, and gauges for active calls
+and write-queue depth. Under several worker processes each worker keeps its
+own metrics.
+
+GET /events/stream is a server-sent-events feed of call lifecycle events
+(call_events.py) plus a stats frame every second; GET /dashboard serves the
+page in static/ that renders it. The runner reports dialed / evaluated /
+failed through POST /events.
 """
 
+import atexit
 import os
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from pathlib import Path
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, send_from_directory
 
-from webhook_handler import extract_transcript_from_webhook
-from storage import save_transcript
+import json_codec
+import metrics
+from call_events import LIFECYCLE_EVENTS, REPORTED_FIELDS, STATS_INTERVAL_SEC, CallEventBus, format_sse
+
+from webhook_dedup import ACCEPTED, DeliveryDeduper, valid_call_id
+from webhook_handler import LiveCallStore, extract_transcript_from_webhook, merge_live_into_transcript
+from storage import is_bench_call, transcript_path
+from transcript_writer import TranscriptWriter
 
 load_dotenv()
 
 app = Flask(__name__)
 
+# Upper bound for one long-poll request; clients loop if they want to wait longer.
+MAX_WAIT_TIMEOUT_SEC = 300.0
+DEFAULT_WAIT_TIMEOUT_SEC = 60.0
+# How often a long-poll re-checks the disk for saves made by another worker process.
+DISK_RECHECK_SEC = 0.25
+
+
+class _SaveNotifier:
+    """Wakes long-poll waiters when a call's transcript has been saved."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: Dict[str, threading.Event] = {}
+
+    def subscribe(self, call_id: str) -> threading.Event:
+        """Return the event that notify(call_id) will set. Subscribe before checking disk."""
+        with self._lock:
+            event = self._events.get(call_id)
+            if event is None:
+                event = self._events[call_id] = threading.Event()
+            return event
+
+    def notify(self, call_id: str) -> None:
+        """Wake everyone waiting on call_id. Late waiters see the file on disk instead."""
+        with self._lock:
+            event = self._events.pop(call_id, None)
+        if event is not None:
+            event.set()
+
+    def wait(self, call_id: str, event: threading.Event, timeout: float) -> bool:
+        """Block until the subscribed event fires or timeout. Returns True if notified."""
+        notified = event.wait(timeout)
+        if not notified:
+            with self._lock:
+                # Drop the event only if nobody re-created it meanwhile.
+                if self._events.get(call_id) is event:
+                    del self._events[call_id]
+        return notified
+
+
+_save_notifier = _SaveNotifier()
+_live_calls = LiveCallStore()
+_deduper = DeliveryDeduper()
+_call_events = CallEventBus()
+
+_metrics = metrics.Registry()
+_events_total = _metrics.counter("webhook_events_total", "Webhook events received, by event type.", ["type"])
+_invalid_total = _metrics.counter("webhook_invalid_payloads_total", "Webhook bodies that were not a JSON object.")
+_errors_total = _metrics.counter(
+    "webhook_processing_errors_total", "Exceptions while handling a webhook, by stage.", ["stage"]
+)
+_dedup_total = _metrics.counter(
+    "webhook_dedup_decisions_total", "End-of-call deliveries by dedup decision.", ["decision"]
+)
+_saves_total = _metrics.counter("webhook_transcripts_saved_total", "Transcripts written to disk.")
+_save_errors_total = _metrics.counter("webhook_transcript_save_errors_total", "Failed transcript writes.")
+_request_seconds = _metrics.histogram("webhook_request_seconds", "Time to handle one POST /webhook/vapi.")
+_payload_bytes = _metrics.histogram(
+    "webhook_payload_bytes", "Size of webhook request bodies.", buckets=metrics.SIZE_BUCKETS
+)
+_normalize_seconds = _metrics.histogram(
+    "webhook_normalize_seconds", "Time in extract_transcript_from_webhook() for end-of-call reports."
+)
+_save_seconds = _metrics.histogram("webhook_save_seconds", "Time to write one transcript (writer thread).")
+_metrics.gauge("webhook_active_calls", "Calls with in-progress live state.", lambda: len(_live_calls.active_calls()))
+_metrics.gauge("webhook_write_queue_depth", "Transcripts waiting for the writer thread.",
+               lambda: _writer.stats()["queue_depth"])
+_metrics.gauge("webhook_event_stream_subscribers", "Open /events/stream connections.",
+               lambda: _call_events.subscriber_count())
+
+
+def _observe_save(seconds: float, ok: bool) -> None:
+    _save_seconds.observe(seconds)
+    (_saves_total if ok else _save_errors_total).inc()
+
+# Opt-in: save every raw payload for replay benchmarks (webhook_bench.py).
+_CAPTURE_DIR = Path(os.environ["WEBHOOK_CAPTURE_DIR"]) if os.getenv("WEBHOOK_CAPTURE_DIR") else None
+
+
+def _on_transcript_saved(call_id: str, path: Path) -> None:
+    """Writer-thread callback, run only once the transcript is on disk."""
+    # Only a transcript that reached the disk turns later deliveries into duplicates.
+    _deduper.confirm(call_id)
+    _save_notifier.notify(call_id)
+    if not is_bench_call(call_id):
+        _call_events.publish("saved", call_id, transcript=path.name)
+
+
+_writer = TranscriptWriter(
+    on_saved=_on_transcript_saved, on_save_timing=_observe_save, on_save_failed=_deduper.release
+).start()
+atexit.register(_writer.stop)
+
+
+def _capture_payload(raw: bytes, event_type: str, call_id: Optional[str]) -> None:
+    """Keep the raw payload in $WEBHOOK_CAPTURE_DIR so webhook_bench.py can replay it."""
+    try:
+        _CAPTURE_DIR.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        (_CAPTURE_DIR / f"{ts}_{event_type}_{call_id or 'none'}.json").write_bytes(raw)
+    except OSError as e:
+        print(f"[webhook] WARN: could not capture payload: {e}")
+
+
+def _publish_vapi_event(event_type: str, message: dict, call_id: Optional[str]) -> None:
+    """Turn status-update / end-of-call-report webhooks into dashboard lifecycle events."""
+    if not call_id or is_bench_call(call_id):
+        return
+    if event_type == "status-update" and message.get("status") in LIFECYCLE_EVENTS:
+        _call_events.publish(message["status"], call_id)
+    elif event_type == "end-of-call-report":
+        _call_events.publish("ended", call_id, ended_reason=message.get("endedReason"))
+
 
 def _log_webhook_event(event_type: str, call_id: Optional[str], extra: str = "") -> None:
     """Log every webhook with server time so we can see order and when events arrive."""
@@ -37,14 +183,28 @@ def vapi_webhook() -> tuple[dict, int]:
     Receive Vapi server events.
 
     - Logs every event with UTC timestamp and event type (and call_id when present).
-    - When the event is an end-of-call report, normalizes the transcript and
-      writes it to `transcripts/` using `storage.save_transcript`, and adds
-      webhook_received_at (server time) to the saved JSON.
-    - Always returns 200 quickly so we don't impact telephony timing.
+    - When the event is an end-of-call report, normalizes the transcript, adds
+      webhook_received_at (server time) and queues it for the writer thread,
+      which saves it to `transcripts/` (see transcript_writer.py).
+    - Always returns 200 quickly so we don't impact telephony timing; disk
+      writes happen after the response unless the write queue is full.
     """
+    started = time.perf_counter()
+    raw = request.get_data()
+    _payload_bytes.observe(len(raw))
+    try:
+        return _handle_webhook(raw)
+    finally:
+        _request_seconds.observe(time.perf_counter() - started)
+
+
+def _handle_webhook(raw: bytes) -> tuple[dict, int]:
     try:
-        payload = request.get_json(force=True, silent=False) or {}
+        payload = json_codec.loads(raw) or {}
+        if not isinstance(payload, dict):
+            raise ValueError("payload is not a JSON object")
     except Exception:
+        _invalid_total.inc()
         print("[webhook] Received invalid JSON payload")
         return {"status": "error", "reason": "invalid_json"}, 200
 
@@ -53,28 +213,188 @@ def vapi_webhook() -> tuple[dict, int]:
     call = message.get("call") or {}
     call_id = call.get("id")
 
+    _events_total.inc(type=str(event_type))
     _log_webhook_event(event_type, call_id)
+    if _CAPTURE_DIR:
+        _capture_payload(raw, event_type, call_id)
+
+    try:
+        _live_calls.apply(payload)
+    except Exception as e:
+        _errors_total.inc(stage="live")
+        print(f"[webhook] Error while updating live transcript: {e}")
+    _publish_vapi_event(event_type, message, call_id)
 
     # Only save transcript for end-of-call-report (sent by Vapi after call ends).
     try:
+        normalize_started = time.perf_counter()
         transcript = extract_transcript_from_webhook(payload)
+        if transcript is not None:
+            _normalize_seconds.observe(time.perf_counter() - normalize_started)
+        if transcript is not None and transcript.get("call_id") and not valid_call_id(transcript["call_id"]):
+            _invalid_total.inc()
+            print(f"[webhook] Rejected end-of-call report with invalid call id {transcript['call_id']!r}")
+            return {"status": "error", "reason": "invalid_call_id"}, 200
+        if transcript is not None and transcript.get("call_id"):
+            decision = _deduper.check(transcript["call_id"], payload, transcript)
+            _dedup_total.inc(decision=decision)
+            if decision != ACCEPTED:
+                # Retried delivery: the first complete report already won; don't touch the file.
+                _log_webhook_event(
+                    event_type,
+                    transcript["call_id"],
+                    extra=f"{decision.upper()} (dedup hit rate {_deduper.hit_rate():.0%})",
+                )
+                return {"status": "ok", "dedup": decision}, 200
         if transcript is not None:
             # Record when we received this webhook (server time) for debugging timing.
             transcript["webhook_received_at"] = datetime.now(timezone.utc).isoformat()
-            path = save_transcript(transcript)
+            if transcript.get("call_id"):
+                merge_live_into_transcript(transcript, _live_calls.pop(transcript["call_id"]))
+            queued = _writer.submit(transcript)
             _log_webhook_event(
                 event_type,
                 transcript.get("call_id"),
-                extra=f"SAVED -> {path}",
+                extra="QUEUED" if queued else "write queue full, saved inline",
             )
     except Exception as e:
+        _errors_total.inc(stage="transcript")
         print(f"[webhook] Error while processing transcript: {e}")
 
     return {"status": "ok"}, 200
 
 
+@app.get("/calls/<call_id>/wait")
+def wait_for_call(call_id: str) -> tuple[dict, int]:
+    """
+    Long-poll until transcripts/<call_id>.json has been saved.
+
+    Returns 200 {"status": "saved"} as soon as the file exists (immediately if it
+    already does), or 408 {"status": "timeout"} after ?timeout= seconds (default 60).
+    """
+    try:
+        timeout = float(request.args.get("timeout", DEFAULT_WAIT_TIMEOUT_SEC))
+    except ValueError:
+        timeout = DEFAULT_WAIT_TIMEOUT_SEC
+    timeout = max(0.0, min(timeout, MAX_WAIT_TIMEOUT_SEC))
+
+    path = transcript_path(call_id)
+    event = _save_notifier.subscribe(call_id)
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {"status": "timeout", "call_id": call_id}, 408
+        # With several worker processes the save may happen in another one; re-check the disk.
+        if _save_notifier.wait(call_id, event, min(DISK_RECHECK_SEC, remaining)):
+            break
+        event = _save_notifier.subscribe(call_id)
+    return {"status": "saved", "call_id": call_id, "path": str(path)}, 200
+
+
+@app.get("/calls/<call_id>/live")
+def live_call(call_id: str) -> tuple[dict, int]:
+    """
+    In-progress transcript for a call: status, turns so far and the latest partial
+    utterance per role. 404 once the call has ended (the final file is then on disk).
+    """
+    live = _live_calls.get(call_id)
+    if live is None:
+        saved = transcript_path(call_id).exists()
+        return {"status": "ended" if saved else "unknown", "call_id": call_id}, 404
+    return live, 200
+
+
+@app.get("/queue")
+def write_queue_stats() -> tuple[dict, int]:
+    """Write-behind queue depth (current and peak), capacity and counters, plus dedup counters."""
+    return {**_writer.stats(), "dedup": _deduper.stats()}, 200
+
+
+@app.post("/events")
+def post_call_event() -> tuple[dict, int]:
+    """Runner-side lifecycle event (dialed, evaluated, eval_failed, failed) for the dashboard."""
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return {"status": "error", "reason": "body must be a JSON object"}, 400
+    event, call_id = body.get("event"), body.get("call_id")
+    if event not in LIFECYCLE_EVENTS or not call_id or not isinstance(call_id, str):
+        return {"status": "error", "reason": "need a lifecycle event and call_id"}, 400
+    fields = {key: body[key] for key in REPORTED_FIELDS if key in body}
+    record = _call_events.publish(event, call_id, from_runner=True, **fields)
+    return {"status": "ok", "id": record["id"]}, 200
+
+
+def _stream_stats() -> dict:
+    calls = _call_events.active_calls()
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "active_calls": _call_events.live_count(),
+        "write_queue_depth": _writer.stats()["queue_depth"],
+        "calls": calls,
+    }
+
+
+@app.get("/events/stream")
+def event_stream() -> Response:
+    """
+    Server-sent events: `call` frames for each lifecycle event and a `stats` frame
+    (active calls with state and first-seen time, write-queue depth) every second.
+    Reconnecting clients get missed events replayed from Last-Event-ID.
+    """
+    subscriber = _call_events.subscribe(request.headers.get("Last-Event-ID"))
+
+    def _frames():
+        try:
+            yield "retry: 3000\n\n"
+            yield format_sse("stats", _stream_stats())
+            next_stats = time.monotonic() + STATS_INTERVAL_SEC
+            while True:
+                try:
+                    record = _call_events.next(subscriber, next_stats - time.monotonic())
+                except EOFError:
+                    return
+                if record is not None:
+                    yield format_sse("call", record, record["id"])
+                if time.monotonic() >= next_stats:
+                    yield format_sse("stats", _stream_stats())
+                    next_stats = time.monotonic() + STATS_INTERVAL_SEC
+        finally:
+            _call_events.unsubscribe(subscriber)
+
+    return Response(
+        _frames(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/dashboard")
+def dashboard() -> Response:
+    """Live run dashboard (static/dashboard.html, fed by /events/stream)."""
+    return send_from_directory(app.static_folder, "dashboard.html")
+
+
+@app.get("/metrics")
+def prometheus_metrics() -> Response:
+    """Prometheus text exposition of this process's webhook metrics."""
+    return Response(_metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
 def run() -> None:
-    """Run the Flask app on a configurable host/port."""
+    """
+    Run the Flask app on a configurable host/port.
+
+    For several worker processes run it under a WSGI server instead, e.g.
+    `gunicorn -w 4 -k gthread --threads 16 --timeout 0 -b 0.0.0.0:8765 webhook_server:app`;
+    file writes, dedup and /wait are safe across processes (live transcripts
+    are per process). Use threaded (or gevent) workers with the timeout off:
+    a /wait long-poll holds its request for up to MAX_WAIT_TIMEOUT_SEC and
+    /events never ends, so gunicorn's default sync workers (30 s timeout)
+    would kill them or be starved by them. Each open /events stream or /wait
+    occupies one worker thread, so size --threads for dashboards plus
+    concurrent runner calls, with spare threads for webhook deliveries.
+    """
     host = os.getenv("WEBHOOK_HOST", "0.0.0.0")
     port_str = os.getenv("WEBHOOK_PORT", "8765")
     try:
@@ -82,7 +402,8 @@ def run() -> None:
     except ValueError:
         port = 8765
 
-    app.run(host=host, port=port)
+    # threaded so long-poll waiters don't block webhook deliveries
+    app.run(host=host, port=port, threaded=True)
 
 
 if __name__ == "__main__":
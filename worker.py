@@ -0,0 +1,272 @@
+"""
+Queue workers: dial and evaluate jobs from the shared job queue (see job_queue.py).
+
+  python main.py --mode task --scenario refill --variant 0 --runs 20 --enqueue
+  python worker.py dial --concurrency 3        # on one or more hosts
+  python worker.py evaluate --workers 4        # on one or more hosts
+  python worker.py status
+
+A dial worker claims dial jobs, places the call and waits for its transcript
+exactly like main.py's call stage, then enqueues an evaluate job for the saved
+transcript. Only a call that never started is retried; a placed call whose
+transcript did not arrive goes straight to failed/ with its call_id. If the lease
+was lost during a placed call, the worker takes the job back (JobQueue.reclaim)
+to finish it rather than let it be dialed again. An evaluate worker claims the
+evaluate jobs and runs the post-call stage (recording URL + LLM judge). Dialing and judging therefore scale independently.
+All workers must see the same transcripts/, reports/ and JOB_QUEUE_DIR.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from call_events import configure_reporter
+from job_queue import DEFAULT_LEASE_SEC, JOB_KINDS, Job, JobQueue, LeaseKeeper, LeaseLost, new_owner_id
+from main import (
+    DEFAULT_MAX_WAIT_MINUTES,
+    DEFAULT_POLL_INTERVAL_SEC,
+    DEFAULT_START_RETRIES,
+    CallResult,
+    InFlightCalls,
+    post_process,
+    run_one,
+)
+from rate_limiter import AdaptiveRateLimiter
+from scenario_manager import get_scenario_by_id
+from storage import TRANSCRIPTS_DIR
+from transcript_wait import local_webhook_url
+
+# Seconds an idle worker sleeps before looking for new jobs again.
+IDLE_POLL_SEC = 2.0
+
+
+def _scenario_for(job: Job):
+    scenario_id = job.payload.get("scenario_id")
+    scenario = get_scenario_by_id(scenario_id) if scenario_id else None
+    if scenario is None:
+        raise ValueError(f"Unknown scenario '{scenario_id}'")
+    return scenario
+
+
+def _enqueue_evaluate(queue: JobQueue, payload: dict, scenario_id: str, result: CallResult) -> None:
+    # Keyed by call id, so a retried dial job never evaluates the same transcript twice.
+    queue.enqueue(
+        "evaluate",
+        {
+            "run_id": payload.get("run_id"),
+            "scenario_id": scenario_id,
+            "run_index": result.run_index,
+            "position": result.position,
+            "total": result.total,
+            "call_id": result.call_id,
+            "transcript": result.path.name,
+        },
+        job_id=result.call_id,
+    )
+
+
+def dial_job(
+    queue: JobQueue,
+    job: Job,
+    args: argparse.Namespace,
+    in_flight: InFlightCalls,
+    limiter: AdaptiveRateLimiter,
+    wait_url: Optional[str],
+) -> None:
+    """Place the call for one dial job and hand its transcript to the evaluate queue."""
+    scenario = _scenario_for(job)
+    payload = job.payload
+    with LeaseKeeper(queue, job) as keeper:
+        result = run_one(
+            scenario,
+            int(payload.get("run_index") or 1),
+            int(payload.get("position") or 0),
+            int(payload.get("total") or 0),
+            max_wait_minutes=args.max_wait,
+            poll_interval_sec=args.poll_interval,
+            dry_run=False,
+            in_flight=in_flight,
+            wait_url=wait_url,
+            limiter=limiter,
+            start_retries=args.start_retries,
+        )
+    if keeper.lost and not (result.call_id and queue.reclaim(job)):
+        # Requeued while we dialed. A call that was not placed is simply dialed again;
+        # a placed one could only be taken back while no other worker had claimed it.
+        if result.call_id:
+            print(f"[worker] dial job {job.job_id}: lease lost after placing call {result.call_id}; "
+                  "another worker already claimed the job")
+            if result.ok and result.path is not None:
+                _enqueue_evaluate(queue, payload, scenario.id, result)
+        return
+    if not result.call_id:
+        queue.fail(job, "call did not start")
+        return
+    if not result.ok or result.path is None:
+        # The call was placed (and billed); dialing again would pay for another one.
+        queue.fail(job, f"no transcript for call {result.call_id}", retry=False, result={"call_id": result.call_id})
+        return
+    _enqueue_evaluate(queue, payload, scenario.id, result)
+    queue.complete(job, {"call_id": result.call_id, "call_sec": round(result.call_sec, 1)})
+
+
+def evaluate_job(queue: JobQueue, job: Job) -> None:
+    """Run the post-call stage for one evaluate job."""
+    payload = job.payload
+    result = CallResult(
+        scenario=_scenario_for(job),
+        run_index=int(payload.get("run_index") or 1),
+        position=int(payload.get("position") or 0),
+        total=int(payload.get("total") or 0),
+        ok=True,
+        call_id=payload.get("call_id"),
+        path=TRANSCRIPTS_DIR / payload.get("transcript", f"{payload.get('call_id')}.json"),
+    )
+    with LeaseKeeper(queue, job) as keeper:
+        post_process(result)
+    if keeper.lost:
+        return
+    if result.evaluated:
+        queue.complete(job, {"scores": result.scores, "post_sec": round(result.post_sec, 1)})
+    else:
+        queue.fail(job, "evaluation failed")
+
+
+def _idle(queue: JobQueue, kinds: tuple) -> bool:
+    """Nothing pending or leased for any of these kinds (leased jobs may still be requeued)."""
+    for kind in kinds:
+        counts = queue.counts(kind)
+        if counts["pending"] or counts["leased"]:
+            return False
+    return True
+
+
+def work_loop(
+    queue: JobQueue,
+    kind: str,
+    owner: str,
+    handle: Callable[[Job], None],
+    exit_when_idle: bool,
+    idle_kinds: tuple,
+) -> None:
+    """Claim and handle jobs of one kind until stopped (or, with exit_when_idle, until the queue drains)."""
+    while True:
+        job = queue.claim(kind, owner)
+        if job is None:
+            if exit_when_idle and _idle(queue, idle_kinds):
+                return
+            time.sleep(IDLE_POLL_SEC)
+            continue
+        print(f"[worker] {kind} job {job.job_id} (attempt {job.attempts}/{job.max_attempts})")
+        try:
+            handle(job)
+        except LeaseLost as e:
+            print(f"[worker] {e}")
+        except Exception as e:
+            print(f"[worker] ERROR in {kind} job {job.job_id}: {e}")
+            try:
+                queue.fail(job, str(e))
+            except LeaseLost:
+                pass
+
+
+def _run_threads(count: int, target: Callable[[], None]) -> None:
+    threads = [threading.Thread(target=target, name=f"worker-{i + 1}", daemon=True) for i in range(count)]
+    for t in threads:
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            for t in threads:
+                t.join(timeout=1.0)
+    except KeyboardInterrupt:
+        # Leases of jobs in progress expire and other workers pick them up.
+        print("\n[worker] interrupted; in-progress jobs will be requeued after their lease expires")
+
+
+def print_status(queue: JobQueue) -> None:
+    print(f"Job queue: {queue.root}")
+    for kind in JOB_KINDS:
+        counts = queue.counts(kind)
+        print(f"  {kind:<9} " + "  ".join(f"{state} {n}" for state, n in counts.items()))
+        for job in queue.jobs(kind, "failed")[-5:]:
+            print(f"    failed {job.job_id}: {job.error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Dial / evaluate workers for the shared job queue.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("role", choices=["dial", "evaluate", "status"], help="What this process does")
+    parser.add_argument("--concurrency", type=int, default=1, metavar="N", help="dial: calls in flight at once")
+    parser.add_argument("--workers", type=int, default=2, metavar="N", help="evaluate: evaluations at once")
+    parser.add_argument(
+        "--calls-per-minute", type=float, default=0.0, metavar="N", help="dial: adaptive rate limit (0 = off)"
+    )
+    parser.add_argument("--start-retries", type=int, default=DEFAULT_START_RETRIES, metavar="N")
+    parser.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT_MINUTES, metavar="MIN")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_SEC, metavar="SEC")
+    parser.add_argument("--wait-via", choices=["server", "files"], default="server")
+    parser.add_argument(
+        "--lease", type=float, default=DEFAULT_LEASE_SEC, metavar="SEC", help="Lease length before a job is requeued"
+    )
+    parser.add_argument(
+        "--exit-when-idle", action="store_true", help="Exit once no jobs are pending or leased instead of waiting"
+    )
+    args = parser.parse_args()
+
+    queue = JobQueue(lease_sec=args.lease)
+    if args.role == "status":
+        print_status(queue)
+        return 0
+
+    owner = new_owner_id()
+    if args.role == "dial":
+        if args.concurrency < 1:
+            print("Error: --concurrency must be >= 1", file=sys.stderr)
+            return 1
+        in_flight = InFlightCalls()
+        limiter = AdaptiveRateLimiter(calls_per_minute=args.calls_per_minute, max_concurrent=args.concurrency)
+        wait_url = local_webhook_url() if args.wait_via == "server" else None
+        configure_reporter(wait_url)
+        print(f"[worker] dial worker {owner}: concurrency {args.concurrency}, queue {queue.root}")
+        _run_threads(
+            args.concurrency,
+            lambda: work_loop(
+                queue,
+                "dial",
+                owner,
+                lambda job: dial_job(queue, job, args, in_flight, limiter, wait_url),
+                args.exit_when_idle,
+                ("dial",),
+            ),
+        )
+        print(f"[worker] dialing: {limiter.describe()}")
+    else:
+        if args.workers < 1:
+            print("Error: --workers must be >= 1", file=sys.stderr)
+            return 1
+        configure_reporter(local_webhook_url() if args.wait_via == "server" else None)
+        print(f"[worker] evaluate worker {owner}: {args.workers} worker(s), queue {queue.root}")
+        _run_threads(
+            args.workers,
+            lambda: work_loop(
+                queue,
+                "evaluate",
+                owner,
+                lambda job: evaluate_job(queue, job),
+                args.exit_when_idle,
+                # Dial jobs still running will produce more evaluations.
+                ("dial", "evaluate"),
+            ),
+        )
+    print_status(queue)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())